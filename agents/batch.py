@@ -0,0 +1,334 @@
+"""
+Headless batch runner: profile every CSV in a directory without the UI.
+
+    python -m agents.batch data/extracts --out reports/batch --workers 4 --timeout 600
+
+Each dataset runs the same chain as the app (load, clean, profile, EDA,
+features, optionally PDF and notebook bundle) in its own worker process and
+writes into its own output directory. A summary.json for the whole run is
+written to the output root. Datasets whose raw content is unchanged since a
+complete previous run (content hash in result.json) and whose fingerprint is
+still in the agent memory are skipped without being parsed. Batch loads
+bypass the app's on-disk dataset cache.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from multiprocessing.connection import wait
+from pathlib import Path
+
+from agents.assumptions import eda_assumptions
+from agents.dataset_cache import content_hash
+from agents.memory import MemoryStore, eda_summary
+from agents.pipeline import analysis_pipeline
+from agents.visualization import build_chart_specs, render_charts
+from utils.config import BATCH_TIMEOUT_SECONDS, BATCH_WORKERS, STREAMING_MIN_BYTES
+
+RESULT_FILE = "result.json"
+SUMMARY_FILE = "summary.json"
+
+
+def _json_default(obj):
+    # numpy scalars, timestamps and dtypes inside the reports
+    return obj.item() if hasattr(obj, "item") else str(obj)
+
+
+def _write_json(path: Path, obj):
+    path.write_text(json.dumps(obj, indent=2, default=_json_default))
+
+
+def _read_result(out_dir: Path):
+    try:
+        return json.loads((out_dir / RESULT_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def output_dir_for(path: Path, data_dir: Path, out_root: Path) -> Path:
+    """
+    Per-dataset output directory mirroring the input layout
+    (data/a/b.csv -> out/a/b), so equal file names never collide.
+    """
+    return Path(out_root) / Path(path).relative_to(data_dir).with_suffix("")
+
+
+# ----------------------------- One dataset -----------------------------
+
+def process_dataset(
+    path,
+    out_dir,
+    target=None,
+    pdf=False,
+    notebook=False,
+    narrative=False,
+    force=False,
+    memory_path=None,
+) -> dict:
+    """
+    Run the analysis chain on one CSV and write its outputs to `out_dir`.
+    `narrative=True` also calls the LLM narrator (needs an API key); without
+    it the PDF lists the rule-based insights instead.
+    Returns the result record (also written as result.json).
+    """
+    path, out_dir = Path(path), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    # One streaming pass over the raw bytes decides the skip, before parsing
+    raw_hash = content_hash(path)
+    memory = MemoryStore(memory_path)
+
+    previous = _read_result(out_dir)
+    if (
+        not force
+        and previous is not None
+        and previous.get("status") == "ok"
+        and previous.get("content_hash") == raw_hash
+        and previous.get("fingerprint") in memory
+    ):
+        return {**previous, "status": "skipped", "seconds": round(time.perf_counter() - started, 3)}
+
+    streaming = path.stat().st_size >= STREAMING_MIN_BYTES
+    # Batch extracts would only churn the app's dataset cache: load directly
+    pipeline = analysis_pipeline(
+        str(path), source_key=raw_hash, cache={}, streaming=streaming, content_key=raw_hash, dataset_cache=False
+    )
+    fingerprint = pipeline.get("fingerprint")
+
+    df = pipeline.get("df")
+    if target is not None and target not in df.columns:
+        target = None
+
+    df_cleaned, cleaning_stats, cleaning_text = pipeline.get("cleaning")
+    profile = pipeline.get("profile")
+    eda_report, eda_tables = pipeline.get("eda")
+    df_features, feature_report = pipeline.get("features")
+    insights = pipeline.get("insights")
+
+    _write_json(out_dir / "profile.json", profile)
+    _write_json(out_dir / "eda_report.json", eda_report)
+    _write_json(out_dir / "cleaning.json", {"stats": cleaning_stats, "text": cleaning_text})
+    _write_json(out_dir / "features.json", feature_report)
+    tables_dir = out_dir / "eda_tables"
+    tables_dir.mkdir(exist_ok=True)
+    for name, table in eda_tables.items():
+        table.to_csv(tables_dir / f"{name}.csv")
+
+    artifacts = ["profile.json", "eda_report.json", "cleaning.json", "features.json", "eda_tables"]
+
+    llm_text = "\n".join(f"- {line}" for line in insights)
+    if narrative:
+        # Imported lazily: the narrator builds its API client at import time
+        from agents.llm_narrator import narrate_insights
+
+        llm_text = narrate_insights(pipeline.get("report_context"), cleaning_stats, feature_report)
+        (out_dir / "narrative.md").write_text(llm_text)
+        artifacts.append("narrative.md")
+
+    if pdf:
+        # Imported lazily: reportlab is only needed when a PDF is requested
+        from agents.report import generate_pdf
+
+        generate_pdf(
+            insights=cleaning_text + feature_report,
+            llm_text=llm_text,
+            assumptions=eda_assumptions(df_cleaned, target),
+            # Datasets already run in parallel: render this one's charts in-process
+            charts=render_charts(build_chart_specs(df_cleaned, stats=pipeline.get("clean_stats")), parallel=False),
+            eda_tables=eda_tables,
+            output_path=out_dir / "EDA_Report.pdf",
+        )
+        artifacts.append("EDA_Report.pdf")
+
+    if notebook:
+        from utils.notebook_exporter import export_bundle
+
+        bundle = export_bundle(
+            df_cleaned,
+            df_features,
+            eda_report,
+            eda_tables,
+            cleaning_text=cleaning_text,
+            feature_report=feature_report,
+            target=target,
+        )
+        (out_dir / "eda_to_modeling.zip").write_bytes(bundle)
+        artifacts.append("eda_to_modeling.zip")
+
+    memory[fingerprint] = {
+        "cleaning": cleaning_stats,
+        "features": feature_report,
+        "eda_summary": eda_summary(eda_report),
+    }
+
+    pipeline.trace.meta.update({"path": str(path), "fingerprint": fingerprint})
+    pipeline.trace.save(out_dir / "trace.json")
+    artifacts.append("trace.json")
+
+    result = {
+        "status": "ok",
+        "path": str(path),
+        "content_hash": raw_hash,
+        "fingerprint": fingerprint,
+        "rows": int(df.shape[0]),
+        "columns": int(df.shape[1]),
+        "memory_mb": {key: pipeline.get("memory_report")[key] for key in ("before_mb", "after_mb")},
+        "duplicates_removed": cleaning_stats["duplicates_removed"],
+        "dropped_columns": profile.get("recommended_drop_cols", []),
+        "artifacts": artifacts,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    _write_json(out_dir / RESULT_FILE, result)
+    return result
+
+
+def run_one(path, out_dir, options):
+    """
+    Child process entry point for one dataset (batch and service workers):
+    the outcome is read back with collect_result.
+    """
+    try:
+        result = process_dataset(path, out_dir, **options)
+        if result["status"] == "skipped":
+            _write_json(Path(out_dir) / "skipped.json", result)
+    except Exception as exc:
+        _write_json(Path(out_dir) / "error.json", {
+            "status": "error",
+            "path": str(path),
+            "error": f"{type(exc).__name__}: {exc}",
+            "traceback": traceback.format_exc(),
+        })
+        sys.exit(1)
+
+
+def collect_result(path, out_dir: Path, exitcode, seconds) -> dict:
+    """
+    Result record of a finished run_one process: error.json or
+    skipped.json if it left one, else result.json, else "crashed".
+    """
+    for name in ("error.json", "skipped.json"):
+        marker = out_dir / name
+        if marker.exists():
+            record = json.loads(marker.read_text())
+            marker.unlink()
+            record.pop("traceback", None)
+            return {**record, "seconds": round(seconds, 3)}
+
+    result = _read_result(out_dir)
+    if exitcode == 0 and result is not None:
+        return result
+    return {"status": "crashed", "path": str(path), "exitcode": exitcode, "seconds": round(seconds, 3)}
+
+
+# ----------------------------- Batch -----------------------------
+
+def run_batch(
+    data_dir,
+    out_root,
+    pattern: str = "*.csv",
+    workers: int = BATCH_WORKERS,
+    timeout: float | None = BATCH_TIMEOUT_SECONDS,
+    **options,
+) -> dict:
+    """
+    Process every file matching `pattern` under `data_dir`, at most
+    `workers` at a time, one process per dataset. A dataset still running
+    after `timeout` seconds is terminated and reported as "timeout".
+    `options` are passed to process_dataset. Writes and returns the summary.
+    """
+    data_dir, out_root = Path(data_dir), Path(out_root)
+    out_root.mkdir(parents=True, exist_ok=True)
+    paths = sorted(p for p in data_dir.rglob(pattern) if p.is_file())
+
+    # Spawned children: no inherited locks or threads from the parent
+    ctx = multiprocessing.get_context("spawn")
+    pending = list(paths)
+    running = {}
+    results = {}
+    started = time.perf_counter()
+
+    while pending or running:
+        while pending and len(running) < max(1, workers):
+            path = pending.pop(0)
+            out_dir = output_dir_for(path, data_dir, out_root)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            proc = ctx.Process(target=run_one, args=(str(path), str(out_dir), options), daemon=True)
+            proc.start()
+            running[proc.sentinel] = (proc, path, out_dir, time.monotonic())
+
+        now = time.monotonic()
+        deadlines = [t0 + timeout - now for _, _, _, t0 in running.values()] if timeout else []
+        ready = wait(list(running), timeout=max(0.0, min(deadlines)) if deadlines else None)
+
+        now = time.monotonic()
+        for sentinel in list(running):
+            proc, path, out_dir, t0 = running[sentinel]
+            if sentinel in ready:
+                proc.join()
+                results[str(path)] = collect_result(path, out_dir, proc.exitcode, now - t0)
+            elif timeout and now - t0 >= timeout:
+                proc.terminate()
+                proc.join()
+                results[str(path)] = {"status": "timeout", "path": str(path), "seconds": round(now - t0, 3)}
+            else:
+                continue
+            del running[sentinel]
+
+    datasets = [results[str(p)] for p in paths]
+    counts = {}
+    for record in datasets:
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+
+    summary = {
+        "data_dir": str(data_dir),
+        "output_dir": str(out_root),
+        "total": len(datasets),
+        "counts": counts,
+        "seconds": round(time.perf_counter() - started, 3),
+        "datasets": datasets,
+    }
+    _write_json(out_root / SUMMARY_FILE, summary)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile every CSV in a directory (headless AI Data Agent).")
+    parser.add_argument("data_dir", help="directory searched recursively for datasets")
+    parser.add_argument("--out", default="reports/batch", help="output root (one sub-directory per dataset)")
+    parser.add_argument("--pattern", default="*.csv", help="file name glob (default: *.csv)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="datasets processed at once")
+    parser.add_argument("--timeout", type=float, default=BATCH_TIMEOUT_SECONDS, help="seconds per dataset (0: none)")
+    parser.add_argument("--target", default=None, help="target column, where present")
+    parser.add_argument("--pdf", action="store_true", help="also write EDA_Report.pdf")
+    parser.add_argument("--notebook", action="store_true", help="also write the notebook bundle")
+    parser.add_argument("--narrative", action="store_true", help="also write the LLM narrative (needs an API key)")
+    parser.add_argument("--force", action="store_true", help="reprocess unchanged datasets")
+    args = parser.parse_args(argv)
+
+    summary = run_batch(
+        args.data_dir,
+        args.out,
+        pattern=args.pattern,
+        workers=args.workers,
+        timeout=args.timeout or None,
+        target=args.target,
+        pdf=args.pdf,
+        notebook=args.notebook,
+        narrative=args.narrative,
+        force=args.force,
+    )
+
+    counts = ", ".join(f"{n} {status}" for status, n in sorted(summary["counts"].items()))
+    print(f"{summary['total']} datasets in {summary['seconds']:.1f}s: {counts or 'none found'}")
+    print(f"Summary: {os.path.join(summary['output_dir'], SUMMARY_FILE)}")
+
+    failed = sum(n for status, n in summary["counts"].items() if status not in ("ok", "skipped"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
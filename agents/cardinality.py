@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.config import CARDINALITY_FALLBACK_SIGMAS, CARDINALITY_RELATIVE_ERROR
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch over 64-bit value hashes.
+
+    `relative_error` sets the register count m so that the standard error
+    1.04 / sqrt(m) is at most that value. Sketches with the same precision
+    can be merged.
+    """
+
+    def __init__(self, relative_error: float = CARDINALITY_RELATIVE_ERROR):
+        m = (1.04 / relative_error) ** 2
+        self.p = min(18, max(4, math.ceil(math.log2(m))))
+        self.m = 1 << self.p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def add_hashes(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        tail_bits = 64 - self.p
+
+        idx = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+
+        # rank = position of the leftmost 1-bit in the tail (tail_bits + 1 if none)
+        _, exponent = np.frexp(tail.astype(np.float64))
+        rank = np.where(tail == 0, tail_bits + 1, tail_bits - exponent + 1).astype(np.uint8)
+
+        best = pd.Series(rank).groupby(idx).max()
+        current = self.registers[best.index]
+        self.registers[best.index] = np.maximum(current, best.to_numpy())
+
+    def add_series(self, series: pd.Series):
+        self.add_hashes(pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy())
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        # Small-range correction (linear counting)
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return float(raw)
+
+
+class CardinalitySketches:
+    """
+    One sketch per column, built once per frame and shared by every
+    cardinality decision. `count()` falls back to an exact nunique when the
+    estimate is too close to a decision threshold to trust.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        relative_error: float = CARDINALITY_RELATIVE_ERROR,
+        sigmas: float = CARDINALITY_FALLBACK_SIGMAS,
+    ):
+        self.df = df
+        self.sigmas = sigmas
+        self.sketches = {}
+        self._exact = {}
+        for col in df.columns:
+            sketch = HyperLogLog(relative_error)
+            sketch.add_series(df[col])
+            self.sketches[col] = sketch
+
+    def estimate(self, col) -> int:
+        return int(round(self.sketches[col].estimate()))
+
+    def exact(self, col) -> int:
+        if col not in self._exact:
+            self._exact[col] = int(self.df[col].nunique(dropna=True))
+        return self._exact[col]
+
+    def set_exact(self, col, n_unique: int):
+        self._exact[col] = int(n_unique)
+
+    def count(self, col, near=()) -> int:
+        if col in self._exact:
+            return self._exact[col]
+        estimate = self.estimate(col)
+        band = self.sigmas * self.sketches[col].relative_error
+        for threshold in near:
+            if abs(estimate - threshold) <= band * max(estimate, threshold) + 1:
+                return self.exact(col)
+        return estimate
+
+
+def distinct_count(stats: dict, col, near=()) -> int:
+    """
+    Distinct (non-null) count for a cardinality decision against the
+    thresholds in `near`: exact from the column stats when they were
+    computed exactly, otherwise from the shared sketch with exact fallback.
+    """
+    sketches = stats.get("sketches")
+    if sketches is None:
+        return int(stats["columns"].loc[col, "n_unique"])
+    return sketches.count(col, near)
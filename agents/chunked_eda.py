@@ -0,0 +1,460 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from agents.cardinality import HyperLogLog
+from agents.eda import assemble_eda
+from agents.correlation import top_k_pairs
+from utils.config import (
+    CARDINALITY_TOP_VALUES_MAX_UNIQUE,
+    CORR_DENSE_MAX_COLS,
+    CORR_SPARSE_MAX_PAIRS,
+    CORR_SPARSE_THRESHOLD,
+    TDIGEST_COMPRESSION,
+)
+
+
+# ----------------------------- Quantiles -----------------------------
+
+class TDigest:
+    """
+    Mergeable quantile sketch (merging t-digest, k1 scale function).
+
+    Centroids start as (distinct value, count) pairs and are only merged
+    once there are more than a few times `compression` of them, so small or
+    low-cardinality inputs give exact pandas-style (linear interpolation)
+    quantiles; beyond that, accuracy is best in the tails.
+    """
+
+    def __init__(self, compression: float = TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        # True while a centroid holds a single distinct value
+        self.exact = np.empty(0, dtype=bool)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        means, weights = np.unique(values, return_counts=True)
+        self._absorb(means, weights.astype("float64"), np.ones(len(means), dtype=bool))
+
+    def merge(self, other: "TDigest"):
+        if not len(other.weights):
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._absorb(other.means, other.weights, other.exact)
+
+    def _absorb(self, means, weights, exact):
+        self.means = np.concatenate([self.means, means])
+        self.weights = np.concatenate([self.weights, weights])
+        self.exact = np.concatenate([self.exact, exact])
+        if len(self.means) > 5 * self.compression:
+            self._compress()
+
+    def _compress(self):
+        order = np.argsort(self.means, kind="stable")
+        means, weights, exact = self.means[order], self.weights[order], self.exact[order]
+        total = weights.sum()
+
+        # Centroids whose centers share an integer k-value are merged, so no
+        # merged centroid spans more than one unit of the scale function
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+
+        merged_w = np.add.reduceat(weights, starts)
+        self.exact = (
+            np.logical_and.reduceat(exact, starts)
+            & (np.minimum.reduceat(means, starts) == np.maximum.reduceat(means, starts))
+        )
+        self.means = np.add.reduceat(means * weights, starts) / merged_w
+        self.weights = merged_w
+
+    def quantile(self, q: float) -> float:
+        if not len(self.weights):
+            return np.nan
+        order = np.argsort(self.means, kind="stable")
+        means, weights, exact = self.means[order], self.weights[order], self.exact[order]
+
+        # Centroid i covers ranks [cum - w, cum - 1]: a single-value centroid
+        # is flat over that range, a merged one is represented by its center.
+        # Interpolating between these points is what Series.quantile() does
+        # between sorted values.
+        last = np.cumsum(weights) - 1
+        first = last - weights + 1
+        center = (first + last) / 2
+        xp = np.column_stack([np.where(exact, first, center), np.where(exact, last, center)]).ravel()
+        fp = np.repeat(means, 2)
+
+        total = weights.sum()
+        xp = np.r_[0.0, xp, total - 1]
+        fp = np.r_[self.min, fp, self.max]
+        return float(np.interp(q * (total - 1), xp, fp))
+
+
+# ----------------------------- Co-moments -----------------------------
+
+class CoMoments:
+    """
+    Running pairwise-complete moments for p numeric columns.
+
+    For every pair (i, j) over the rows where both are present: count n,
+    mean of i, centered sum of squares of i and the co-moment of (i, j).
+    Chunks are combined with the pairwise (Chan / Welford) update, so the
+    diagonal gives per-column mean/variance and the whole gives the same
+    Pearson matrix as DataFrame.corr(). With pairwise=False only the
+    per-column moments are kept (O(p) instead of O(p^2) state).
+    """
+
+    def __init__(self, p: int, pairwise: bool = True):
+        shape = (p, p) if pairwise else (p,)
+        self.n = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.c = np.zeros(shape) if pairwise else None
+
+    def update(self, values: np.ndarray):
+        valid = ~np.isnan(values)
+        w = valid.astype("float64")
+
+        # Center on the chunk mean first to keep the sums well conditioned
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            shift = np.nan_to_num(np.nanmean(values, axis=0))
+        x = np.where(valid, values - shift, 0.0)
+
+        if self.c is None:
+            n = w.sum(axis=0)
+            sx = x.sum(axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(n > 0, sx / n, 0.0)
+            self._combine(n, mean + shift, (x * x).sum(axis=0) - sx * mean, None)
+            return
+
+        n = w.T @ w
+        sx = x.T @ w
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, sx / n, 0.0)
+        m2 = (x * x).T @ w - sx * mean
+        c = x.T @ x - sx * mean.T
+
+        self._combine(n, mean + shift[:, None], m2, c)
+
+    def merge(self, other: "CoMoments"):
+        self._combine(other.n, other.mean, other.m2, other.c)
+
+    def _combine(self, n_b, mean_b, m2_b, c_b):
+        n = self.n + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(n > 0, self.n * n_b / n, 0.0)
+            weight_b = np.where(n > 0, n_b / n, 0.0)
+
+        delta = mean_b - self.mean
+        self.m2 = self.m2 + m2_b + delta * delta * frac
+        if self.c is not None:
+            self.c = self.c + c_b + delta * delta.T * frac
+        self.mean = self.mean + delta * weight_b
+        self.n = n
+
+    def subset(self, indices) -> "CoMoments":
+        """
+        Moments of the columns at `indices` only, in that order.
+        """
+        pairwise = self.c is not None
+        ix = np.ix_(indices, indices) if pairwise else np.asarray(indices, dtype=np.intp)
+        part = CoMoments(0, pairwise=pairwise)
+        part.n, part.mean, part.m2 = self.n[ix], self.mean[ix], self.m2[ix]
+        if pairwise:
+            part.c = self.c[ix]
+        return part
+
+    def _diag(self, a: np.ndarray) -> np.ndarray:
+        return np.diag(a) if self.c is not None else a
+
+    def count(self) -> np.ndarray:
+        return self._diag(self.n).copy()
+
+    def column_mean(self) -> np.ndarray:
+        return np.where(self._diag(self.n) > 0, self._diag(self.mean), np.nan)
+
+    def variance(self) -> np.ndarray:
+        n = self._diag(self.n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(n > 1, self._diag(self.m2) / (n - 1), np.nan)
+
+    def corr(self) -> np.ndarray:
+        if self.c is None:
+            raise ValueError("Correlation needs pairwise moments")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = self.c / np.sqrt(self.m2 * self.m2.T)
+        r[(self.n < 2) | (self.m2 <= 0) | (self.m2.T <= 0)] = np.nan
+        return np.clip(r, -1.0, 1.0)
+
+
+# ----------------------------- Summary -----------------------------
+
+def _common_dtype(a, b):
+    if a == b:
+        return a
+    if isinstance(a, pd.CategoricalDtype) and isinstance(b, pd.CategoricalDtype):
+        return a
+    return pd.concat([pd.Series([], dtype=a), pd.Series([], dtype=b)]).dtype
+
+
+def _value_counts(series: pd.Series) -> pd.Series:
+    counts = series.value_counts(dropna=True, sort=False)
+    counts = counts[counts > 0]
+    if isinstance(counts.index, pd.CategoricalIndex):
+        counts.index = counts.index.astype(counts.index.categories.dtype)
+    return counts
+
+
+class EdaSummary:
+    """
+    Mergeable per-dataset EDA summary built chunk by chunk: row and null
+    counts, co-moments and t-digests for numeric columns, and distinct
+    counts (exact while small, HyperLogLog beyond
+    CARDINALITY_TOP_VALUES_MAX_UNIQUE). Columns start out numeric if they
+    are in the first chunk and stay numeric while most of their values
+    parse as numbers: the rest are summarized as missing and counted in
+    `non_numeric`. A column that turns out to be mostly text (e.g. one that
+    was all-NaN in the first chunk) is demoted and summarized as text.
+
+    Distinct counts of a date column demoted to text mid-stream count the
+    text that still parses with the column's format (from `chunk.attrs
+    ["datetime_formats"]`, see ingestion.iter_csv_chunks) as the dates it
+    stands for, so a value is never counted once per representation.
+
+    Co-moments are only paired for the first CORR_DENSE_MAX_COLS numeric
+    columns (`pair_cols`), so very wide files never hold p x p matrices.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.dtypes = None
+        self.null_count = None
+        self.numeric_cols = None
+        self.moments = None
+        self.pair_cols = None
+        self.pair_moments = None
+        self.digests = {}
+        self.sketches = {}
+        self.counts = {}
+        self.non_numeric = {}
+        self.parsed_dates = set()
+
+    def update(self, chunk: pd.DataFrame):
+        if self.dtypes is None:
+            self.dtypes = chunk.dtypes.copy()
+            self.null_count = pd.Series(0, index=chunk.columns, dtype="int64")
+            self.numeric_cols = chunk.select_dtypes(include="number").columns.tolist()
+            self.moments = CoMoments(len(self.numeric_cols), pairwise=False)
+            self.pair_cols = self.numeric_cols[:CORR_DENSE_MAX_COLS]
+            self.pair_moments = CoMoments(len(self.pair_cols))
+            self.digests = {col: TDigest() for col in self.numeric_cols}
+            self.sketches = {col: HyperLogLog() for col in chunk.columns}
+            self.counts = {col: pd.Series(dtype="int64") for col in chunk.columns}
+        else:
+            for col in chunk.columns:
+                self.dtypes[col] = _common_dtype(self.dtypes[col], chunk[col].dtype)
+
+        self.n_rows += len(chunk)
+        self.null_count += chunk.isna().sum()
+
+        if self.numeric_cols:
+            values = self._numeric_values(chunk)
+            self.moments.update(values)
+            # pair_cols is always a prefix of numeric_cols
+            self.pair_moments.update(values[:, :len(self.pair_cols)])
+            for i, col in enumerate(self.numeric_cols):
+                self.digests[col].update(values[:, i])
+
+        formats = chunk.attrs.get("datetime_formats", {})
+        for col in chunk.columns:
+            for values in self._distinct_values(chunk[col], formats.get(col)):
+                self.sketches[col].add_series(values)
+                if self.counts[col] is not None:
+                    self._add_counts(col, _value_counts(values))
+
+    def _distinct_values(self, series: pd.Series, fmt: str | None) -> list:
+        """
+        `series` as fed to the distinct counters: text in a column that
+        earlier chunks delivered as dates is split into the dates it parses
+        to and the text that does not parse.
+        """
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            self.parsed_dates.add(series.name)
+            return [series]
+        if series.name not in self.parsed_dates or fmt is None:
+            return [series]
+        parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+        return [parsed, series[parsed.isna()]]
+
+    def _numeric_values(self, chunk: pd.DataFrame) -> np.ndarray:
+        numeric = chunk[self.numeric_cols]
+        dirty = [col for col, dtype in numeric.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)]
+        if dirty:
+            # A column that turns textual in a later chunk (an "n/a" or a
+            # typo deep in a large extract): coerce instead of failing
+            numeric = numeric.copy(deep=False)
+            parsed_so_far = dict(zip(self.numeric_cols, self.moments.count()))
+            demoted = []
+            for col in dirty:
+                parsed = pd.to_numeric(numeric[col], errors="coerce")
+                failed = self.non_numeric.get(col, 0) + int((parsed.isna() & numeric[col].notna()).sum())
+                if failed > parsed_so_far[col] + parsed.notna().sum():
+                    demoted.append(col)
+                elif failed:
+                    self.non_numeric[col] = failed
+                numeric[col] = parsed
+            if demoted:
+                self._demote(demoted)
+                numeric = numeric[self.numeric_cols]
+        return numeric.to_numpy(dtype="float64", na_value=np.nan)
+
+    def _demote(self, cols):
+        """
+        Stop summarizing `cols` as numeric; their distinct counts and nulls
+        are kept like for any text column.
+        """
+        keep = [i for i, col in enumerate(self.numeric_cols) if col not in cols]
+        self.moments = self.moments.subset(keep)
+        self.numeric_cols = [self.numeric_cols[i] for i in keep]
+        keep = [i for i, col in enumerate(self.pair_cols) if col not in cols]
+        self.pair_moments = self.pair_moments.subset(keep)
+        self.pair_cols = [self.pair_cols[i] for i in keep]
+        for col in cols:
+            del self.digests[col]
+            self.non_numeric.pop(col, None)
+
+    def _add_counts(self, col, counts: pd.Series):
+        merged = self.counts[col].add(counts, fill_value=0) if len(self.counts[col]) else counts
+        # Past the limit, exact counts cost more than they are worth: sketch only
+        self.counts[col] = merged if len(merged) <= CARDINALITY_TOP_VALUES_MAX_UNIQUE else None
+
+    def merge(self, other: "EdaSummary"):
+        if other.dtypes is None:
+            return
+        if self.dtypes is None:
+            self.__dict__.update(other.__dict__)
+            return
+
+        for col in self.dtypes.index:
+            self.dtypes[col] = _common_dtype(self.dtypes[col], other.dtypes[col])
+        self.n_rows += other.n_rows
+        self.null_count += other.null_count
+
+        # A column demoted on either side is text in the merged summary
+        demoted = [col for col in self.numeric_cols if col not in other.numeric_cols]
+        if demoted:
+            self._demote(demoted)
+        position = {col: i for i, col in enumerate(other.numeric_cols)}
+        self.moments.merge(other.moments.subset([position[col] for col in self.numeric_cols]))
+        position = {col: i for i, col in enumerate(other.pair_cols)}
+        self.pair_moments.merge(other.pair_moments.subset([position[col] for col in self.pair_cols]))
+        for col, n in other.non_numeric.items():
+            if col in self.numeric_cols:
+                self.non_numeric[col] = self.non_numeric.get(col, 0) + n
+        for col in self.numeric_cols:
+            self.digests[col].merge(other.digests[col])
+        for col in self.sketches:
+            self.sketches[col].merge(other.sketches[col])
+            if self.counts[col] is not None:
+                if other.counts[col] is None:
+                    self.counts[col] = None
+                else:
+                    self._add_counts(col, other.counts[col])
+        self.parsed_dates |= other.parsed_dates
+
+    def n_unique(self, col) -> int:
+        if self.counts[col] is not None:
+            return len(self.counts[col])
+        return int(round(self.sketches[col].estimate()))
+
+    def column_stats(self) -> pd.DataFrame:
+        """
+        Summary in the compute_column_stats table layout.
+        """
+        columns = pd.DataFrame({
+            "dtype": self.dtypes.astype(str),
+            "null_count": self.null_count,
+            "null_ratio": self.null_count / max(1, self.n_rows),
+            "n_unique": pd.Series({col: self.n_unique(col) for col in self.dtypes.index}),
+        }, index=self.dtypes.index)
+
+        var = self.moments.variance()
+        moments = pd.DataFrame({
+            "count": self.moments.count(),
+            "mean": self.moments.column_mean(),
+            "std": np.sqrt(var),
+            "min": [self.digests[c].min if self.digests[c].count else np.nan for c in self.numeric_cols],
+            "25%": [self.digests[c].quantile(0.25) for c in self.numeric_cols],
+            "50%": [self.digests[c].quantile(0.50) for c in self.numeric_cols],
+            "75%": [self.digests[c].quantile(0.75) for c in self.numeric_cols],
+            "max": [self.digests[c].max if self.digests[c].count else np.nan for c in self.numeric_cols],
+            "var": var,
+        }, index=self.numeric_cols)
+
+        return columns.join(moments)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Pearson matrix of `pair_cols`.
+        """
+        return pd.DataFrame(self.pair_moments.corr(), index=self.pair_cols, columns=self.pair_cols)
+
+
+def generate_eda_chunked(chunks):
+    """
+    Out-of-core EDA: summarize an iterable of DataFrame chunks (e.g.
+    ingestion.iter_csv_chunks) without holding the data. Returns the same
+    (eda_report, eda_tables) as generate_eda; quantiles and very high
+    distinct counts are approximate.
+    """
+    summary = EdaSummary()
+    for chunk in chunks:
+        summary.update(chunk)
+
+    if summary.dtypes is None:
+        raise ValueError("No data to summarize")
+
+    corr = corr_pairs = None
+    capped = len(summary.pair_cols) < len(summary.numeric_cols)
+    if summary.numeric_cols:
+        corr = summary.correlation()
+    if capped:
+        # Very wide: like generate_eda, report only the strong pairs
+        pairs = top_k_pairs(corr, k=CORR_SPARSE_MAX_PAIRS)
+        corr_pairs = pairs[pairs["corr"].abs() >= CORR_SPARSE_THRESHOLD].reset_index(drop=True)
+        corr = None
+
+    eda_report, eda_tables = assemble_eda(
+        (summary.n_rows, len(summary.dtypes)),
+        summary.dtypes.astype(str),
+        summary.column_stats(),
+        summary.numeric_cols,
+        corr,
+        corr_pairs,
+    )
+    if capped:
+        # Correlations only cover the first CORR_DENSE_MAX_COLS numeric columns
+        eda_report["correlation_columns"] = {
+            "paired": len(summary.pair_cols),
+            "numeric": len(summary.numeric_cols),
+        }
+    if summary.non_numeric:
+        # Numeric summaries of these columns leave the unparseable values out
+        eda_report["non_numeric_values"] = dict(summary.non_numeric)
+    return eda_report, eda_tables
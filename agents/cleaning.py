@@ -1,7 +1,82 @@
+import numpy as np
 import pandas as pd
 
+from agents.column_stats import compute_column_stats
+from agents.dtype_optimizer import is_categorical
 
-def clean_data(df: pd.DataFrame, profile: dict | None = None):
+
+def _row_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    64-bit hash per row. Floats get +0.0 so -0.0 and 0.0 hash alike, as
+    they compare equal in DataFrame.duplicated().
+    """
+    columns = {
+        i: df.iloc[:, i] + 0.0 if pd.api.types.is_float_dtype(df.dtypes.iloc[i]) else df.iloc[:, i]
+        for i in range(df.shape[1])
+    }
+    return pd.util.hash_pandas_object(pd.DataFrame(columns, copy=False), index=False)
+
+
+def _duplicate_mask(df: pd.DataFrame) -> np.ndarray:
+    """
+    Same result as df.duplicated(): rows are hashed once, and only rows
+    whose hash repeats are compared exactly, so a hash collision never
+    drops a distinct row.
+    """
+    candidates = _row_hashes(df).duplicated(keep=False).to_numpy()
+    mask = np.zeros(len(df), dtype=bool)
+    if candidates.any():
+        mask[candidates] = df[candidates].duplicated().to_numpy()
+    return mask
+
+
+def _fill_values(df: pd.DataFrame, null_cols: list, stats: dict | None):
+    """
+    Mode for categorical columns (from the shared frequency tables) and
+    median for the rest (numeric medians in a single call).
+    """
+    cat_cols = [c for c in null_cols if is_categorical(df[c].dtype)]
+    num_cols = [c for c in null_cols if c not in cat_cols and pd.api.types.is_numeric_dtype(df[c])]
+    other_cols = [c for c in null_cols if c not in cat_cols and c not in num_cols]
+
+    # Frequency tables may be missing (no stats, or skipped on a large frame)
+    if cat_cols and (stats is None or any(c not in stats["top_values"] for c in cat_cols)):
+        stats = compute_column_stats(df[cat_cols], sketch_min_rows=len(df) + 1)
+
+    fills = {}
+    methods = {}
+
+    for col in cat_cols:
+        mode = stats["columns"].loc[col, "mode"]
+        fills[col] = "Unknown" if pd.isna(mode) else mode
+        methods[col] = "mode"
+
+    if num_cols:
+        medians = df[num_cols].median()
+        for col in num_cols:
+            fills[col] = medians[col]
+            methods[col] = "median"
+
+    # e.g. datetimes: Series.median handles them, DataFrame.median may not
+    for col in other_cols:
+        fills[col] = df[col].median()
+        methods[col] = "median"
+
+    return fills, methods
+
+
+def clean_data(
+    df: pd.DataFrame,
+    profile: dict | None = None,
+    stats: dict | None = None,
+    inplace: bool = False,
+):
+    """
+    Drop profiled columns, remove duplicate rows and impute missing values.
+    The input frame is never modified unless inplace=True (for callers that
+    own it); always use the returned frame, which shares unchanged columns
+    with the input under copy-on-write.
+    """
     report_stats = {
         "duplicates_removed": 0,
         "missing_values_filled": {},
@@ -9,38 +84,59 @@ def clean_data(df: pd.DataFrame, profile: dict | None = None):
     }
 
     report_text = []
-    df = df.copy()
+    if not inplace:
+        # New frame object over the same data: the steps below only copy
+        # the columns they actually change
+        df = df.copy(deep=False)
 
     # Drop recommended columns from profiling
     if profile and profile.get("recommended_drop_cols"):
         drop_cols = [c for c in profile["recommended_drop_cols"] if c in df.columns]
         if drop_cols:
-            df = df.drop(columns=drop_cols)
+            df.drop(columns=drop_cols, inplace=True)
             report_stats["dropped_columns"] = drop_cols
             report_text.append(f"Dropped columns based on profiling: {drop_cols}")
 
-    # Duplicates
-    dup_count = df.duplicated().sum()
+    # Duplicates: the count and the mask both come from one pass
+    dup_mask = _duplicate_mask(df)
+    dup_count = int(dup_mask.sum())
     if dup_count > 0:
-        df = df.drop_duplicates()
-        report_stats["duplicates_removed"] = int(dup_count)
-        report_text.append(f"Removed {int(dup_count)} duplicate rows.")
+        if inplace and df.index.is_unique:
+            df.drop(index=df.index[dup_mask], inplace=True)
+        else:
+            df = df[~dup_mask]
+        report_stats["duplicates_removed"] = dup_count
+        report_text.append(f"Removed {dup_count} duplicate rows.")
+
+    # Shared stats are only valid while no rows were dropped
+    if stats is not None and len(df) != stats["n_rows"]:
+        stats = None
 
     # Missing values
-    for col in df.columns:
-        missing_count = int(df[col].isna().sum())
-        if missing_count == 0:
-            continue
-
-        if df[col].dtype == "object":
-            mode = df[col].mode()
-            fill_value = mode.iloc[0] if not mode.empty else "Unknown"
-            df[col] = df[col].fillna(fill_value)
-            report_text.append(f"Filled {missing_count} missing values in '{col}' using mode.")
-        else:
-            df[col] = df[col].fillna(df[col].median())
-            report_text.append(f"Filled {missing_count} missing values in '{col}' using median.")
+    if stats is not None:
+        missing_counts = stats["columns"]["null_count"].reindex(df.columns)
+    else:
+        missing_counts = df.isna().sum()
+
+    null_cols = [c for c in df.columns if missing_counts[c] > 0]
+    fills, methods = _fill_values(df, null_cols, stats)
 
+    for col in null_cols:
+        missing_count = int(missing_counts[col])
+        report_text.append(f"Filled {missing_count} missing values in '{col}' using {methods[col]}.")
         report_stats["missing_values_filled"][col] = missing_count
 
+    # Category columns only accept known values: add new ones ("Unknown") first
+    for col, value in fills.items():
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and value not in dtype.categories:
+            df[col] = df[col].cat.add_categories([value])
+
+    # One batched fill instead of reassigning column by column
+    if fills:
+        if inplace:
+            df.fillna(fills, inplace=True)
+        else:
+            df = df.fillna(fills)
+
     return df, report_stats, report_text
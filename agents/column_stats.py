@@ -0,0 +1,136 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from agents.cardinality import CardinalitySketches
+from utils.config import (
+    CARDINALITY_RELATIVE_ERROR,
+    CARDINALITY_SKETCH_MIN_ROWS,
+    CARDINALITY_TOP_VALUES_MAX_UNIQUE,
+)
+
+SUMMARY_COLS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+def _numeric_moments(df: pd.DataFrame, numeric_cols: list) -> pd.DataFrame:
+    """
+    describe()-style moments and quantiles for all numeric columns at once,
+    computed on a single float64 block.
+    """
+    if not numeric_cols:
+        return pd.DataFrame(columns=SUMMARY_COLS + ["var"], dtype="float64")
+
+    values = df[numeric_cols].to_numpy(dtype="float64", na_value=np.nan)
+    count = (~np.isnan(values)).sum(axis=0)
+
+    # All-NaN and single-value columns legitimately produce NaN here
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(values, axis=0)
+        var = np.nanvar(values, axis=0, ddof=1)
+        q25, q50, q75 = np.nanpercentile(values, [25, 50, 75], axis=0)
+        lo = np.nanmin(values, axis=0)
+        hi = np.nanmax(values, axis=0)
+
+    var = np.where(count > 1, var, np.nan)
+
+    return pd.DataFrame({
+        "count": count.astype("float64"),
+        "mean": mean,
+        "std": np.sqrt(var),
+        "min": lo,
+        "25%": q25,
+        "50%": q50,
+        "75%": q75,
+        "max": hi,
+        "var": var,
+    }, index=numeric_cols)
+
+
+def _mode_of(counts: pd.Series):
+    """
+    Same pick as Series.mode().iloc[0]: the smallest of the most frequent values.
+    """
+    if counts.empty:
+        return np.nan, 0
+    freq = counts.max()
+    tied = counts.index[counts == freq].tolist()
+    try:
+        return min(tied), int(freq)
+    except TypeError:
+        return tied[0], int(freq)
+
+
+def compute_column_stats(
+    df: pd.DataFrame,
+    top_k: int = 10,
+    sketch_min_rows: int = CARDINALITY_SKETCH_MIN_ROWS,
+    relative_error: float = CARDINALITY_RELATIVE_ERROR,
+) -> dict:
+    """
+    One pass of per-column statistics shared by profiling, cleaning, EDA and
+    visualization.
+
+    From `sketch_min_rows` rows on, distinct counts come from HyperLogLog
+    sketches (see agents.cardinality) and frequency tables are only built
+    for non-numeric columns of moderate cardinality.
+
+    Returns:
+    - n_rows: int
+    - columns: DataFrame indexed by column (null counts, distinct counts,
+      describe()-style moments for numeric columns, mode)
+    - top_values: dict of column -> top_k value counts (non-null); columns
+      skipped on large frames are absent
+    - sketches: CardinalitySketches, or None when counts are exact
+    """
+    n_rows = len(df)
+    null_count = df.isna().sum()
+
+    numeric_cols = df.select_dtypes(include="number").columns.tolist()
+    moments = _numeric_moments(df, numeric_cols)
+
+    sketches = None
+    if n_rows >= sketch_min_rows:
+        sketches = CardinalitySketches(df, relative_error=relative_error)
+
+    n_unique = {}
+    modes = {}
+    mode_freq = {}
+    top_values = {}
+
+    for col in df.columns:
+        if sketches is not None:
+            n_unique[col] = sketches.estimate(col)
+            if col in numeric_cols or n_unique[col] > CARDINALITY_TOP_VALUES_MAX_UNIQUE:
+                modes[col], mode_freq[col] = np.nan, np.nan
+                continue
+
+        counts = df[col].value_counts(dropna=True, sort=False)
+        # Categoricals report unobserved categories with a zero count
+        counts = counts[counts > 0]
+
+        n_unique[col] = len(counts)
+        if sketches is not None:
+            sketches.set_exact(col, len(counts))
+        modes[col], mode_freq[col] = _mode_of(counts)
+        top_values[col] = counts.nlargest(top_k)
+
+    columns = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "null_count": null_count,
+        "null_ratio": null_count / max(1, n_rows),
+        "n_unique": pd.Series(n_unique),
+        "n_unique_with_na": pd.Series(n_unique) + (null_count > 0).astype(int),
+        "mode": pd.Series(modes, dtype=object),
+        "mode_freq": pd.Series(mode_freq),
+    }, index=df.columns)
+
+    columns = columns.join(moments)
+
+    return {
+        "n_rows": n_rows,
+        "columns": columns,
+        "top_values": top_values,
+        "sketches": sketches,
+    }
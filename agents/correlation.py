@@ -0,0 +1,322 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.config import CORR_BLOCK_COLS, CORR_CACHE_MAX_BYTES
+
+PAIR_COLS = ["feature_1", "feature_2", "corr"]
+
+
+# ----------------------------- Blocked Pearson -----------------------------
+
+class _Prepared:
+    """
+    float64 values centered on the column means with NaN replaced by 0, the
+    validity mask and the column norms. Centering does not change r but
+    keeps the sums small. When nothing is missing, the values are scaled to
+    unit norm in place, as only the NaN-free fast path needs them.
+
+    Per-block weights and unit-norm values are built once and kept while
+    they fit in one more copy of the data; blocks past that budget are
+    rebuilt when used, except for the current row block, which is kept
+    across its row of block pairs.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list):
+        # Our own float64 block: centered (and scaled) in place, no temporaries
+        x = df[columns].to_numpy(dtype="float64", na_value=np.nan, copy=True)
+        valid = ~np.isnan(x)
+        x[~valid] = 0.0
+        count = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x -= np.where(count > 0, x.sum(axis=0) / count, 0.0)
+            x[~valid] = 0.0
+            self.norm = np.sqrt(np.einsum("ij,ij->j", x, x))
+
+        self.complete = valid.all(axis=0)
+        self.x = x
+        self.valid = None
+        if self.complete.all():
+            with np.errstate(invalid="ignore", divide="ignore"):
+                x /= np.where(self.norm > 0, self.norm, np.nan)
+        else:
+            self.valid = valid
+
+        self._derived = {}
+        self._budget = x.nbytes
+        self._row_block = {}
+
+    def _derive(self, kind, start, stop, row_block=False) -> np.ndarray:
+        key = (kind, start, stop)
+        value = self._derived.get(key)
+        if value is None:
+            value = self._row_block.get(key)
+        if value is not None:
+            return value
+
+        if kind == "unit":
+            norm = self.norm[start:stop]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                value = self.x[:, start:stop] / np.where(norm > 0, norm, np.nan)
+        else:
+            value = self.valid[:, start:stop].astype("float64")
+
+        if value.nbytes <= self._budget:
+            self._budget -= value.nbytes
+            self._derived[key] = value
+        elif row_block:
+            if any(k[1:] != (start, stop) for k in self._row_block):
+                self._row_block.clear()
+            self._row_block[key] = value
+        return value
+
+    def _unit(self, start, stop, row_block=False) -> np.ndarray:
+        if self.valid is None:
+            return self.x[:, start:stop]
+        return self._derive("unit", start, stop, row_block)
+
+    def _weights(self, start, stop, row_block=False) -> np.ndarray:
+        return self._derive("weights", start, stop, row_block)
+
+    def block(self, a0, a1, b0, b1) -> np.ndarray:
+        """
+        Pearson r between column blocks [a0, a1) and [b0, b1). Callers
+        iterate b within a, so [a0, a1) is the row block.
+        """
+        if self.complete[a0:a1].all() and self.complete[b0:b1].all():
+            # No missing values: r is a single product of unit-norm columns
+            r = self._unit(a0, a1, row_block=True).T @ self._unit(b0, b1)
+            return np.clip(r, -1.0, 1.0)
+        return _block_corr(
+            self.x[:, a0:a1], self._weights(a0, a1, row_block=True), self.x[:, b0:b1], self._weights(b0, b1)
+        )
+
+
+def _block_corr(xa, wa, xb, wb) -> np.ndarray:
+    """
+    Pairwise-complete Pearson r between two column blocks (same as
+    DataFrame.corr(): each pair uses the rows where both are present).
+    """
+    n = wa.T @ wb
+    sa = xa.T @ wb
+    sb = wa.T @ xb
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = xa.T @ xb - sa * sb / n
+        var_a = (xa * xa).T @ wb - sa * sa / n
+        var_b = wa.T @ (xb * xb) - sb * sb / n
+        r = cov / np.sqrt(var_a * var_b)
+    r[(n < 2) | (var_a <= 0) | (var_b <= 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def _blocks(p: int, block_size: int):
+    return [(start, min(p, start + block_size)) for start in range(0, p, block_size)]
+
+
+def correlation_matrix(df: pd.DataFrame, columns=None, block_size: int = CORR_BLOCK_COLS) -> pd.DataFrame:
+    """
+    Dense Pearson matrix of `columns` (default: all numeric), computed one
+    pair of column blocks at a time as BLAS matrix products. Agents should
+    go through shared_correlation_matrix() instead, which caches it.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include="number").columns.tolist()
+    data = _Prepared(df, columns)
+    p = len(columns)
+
+    out = np.empty((p, p))
+    for a0, a1 in _blocks(p, block_size):
+        for b0, b1 in _blocks(p, block_size):
+            if b0 < a0:
+                continue
+            r = data.block(a0, a1, b0, b1)
+            out[a0:a1, b0:b1] = r
+            out[b0:b1, a0:a1] = r.T
+
+    # A column with any variance correlates perfectly with itself
+    diag = np.diag(out).copy()
+    np.fill_diagonal(out, np.where(np.isnan(diag), np.nan, 1.0))
+    return pd.DataFrame(out, index=columns, columns=columns)
+
+
+# ----------------------------- Pair selection -----------------------------
+
+def _select_top(rows, cols, values, k: int | None, max_abs: float | None):
+    """
+    Indices of the k largest |values| (ties keep input order), ignoring NaN
+    and anything at or above `max_abs`. argpartition keeps this O(n).
+    """
+    strength = np.abs(values)
+    keep = ~np.isnan(strength)
+    if max_abs is not None:
+        keep &= strength < max_abs
+    rows, cols, values, strength = rows[keep], cols[keep], values[keep], strength[keep]
+
+    if k is not None and len(strength) > k:
+        part = np.argpartition(-strength, k - 1)[:k]
+        # argpartition does not keep ties in order: restore it before sorting
+        part = np.sort(part)
+        rows, cols, values, strength = rows[part], cols[part], values[part], strength[part]
+
+    order = np.argsort(-strength, kind="stable")
+    return rows[order], cols[order], values[order]
+
+
+def _pairs_frame(columns, rows, cols, values) -> pd.DataFrame:
+    columns = np.asarray(columns, dtype=object)
+    return pd.DataFrame({
+        "feature_1": columns[rows],
+        "feature_2": columns[cols],
+        "corr": values,
+    }, columns=PAIR_COLS)
+
+
+def top_k_pairs(corr: pd.DataFrame, k: int = 10, max_abs: float | None = None) -> pd.DataFrame:
+    """
+    Strongest k pairs of a dense correlation matrix by |r|, each unordered
+    pair once (upper triangle only, no diagonal).
+    """
+    rows, cols = np.triu_indices(len(corr.columns), k=1)
+    values = corr.to_numpy()[rows, cols]
+    rows, cols, values = _select_top(rows, cols, values, k, max_abs)
+    return _pairs_frame(corr.columns, rows, cols, values)
+
+
+def top_pairs(pairs: pd.DataFrame, k: int = 10, max_abs: float | None = None) -> pd.DataFrame:
+    """
+    Strongest k rows of a pair list (as returned by correlation_pairs) by |r|.
+    """
+    positions = np.arange(len(pairs))
+    rows, _, _ = _select_top(positions, positions, pairs["corr"].to_numpy(dtype="float64"), k, max_abs)
+    return pairs.iloc[rows].reset_index(drop=True)
+
+
+def correlation_pairs(
+    df: pd.DataFrame,
+    columns=None,
+    threshold: float | None = None,
+    k: int | None = None,
+    max_abs: float | None = None,
+    block_size: int = CORR_BLOCK_COLS,
+) -> pd.DataFrame:
+    """
+    Sparse alternative to correlation_matrix for very wide tables: only pairs
+    with |r| >= `threshold` (and/or the k strongest) are kept, block by
+    block, so the dense p x p matrix never exists.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include="number").columns.tolist()
+    data = _Prepared(df, columns)
+    p = len(columns)
+
+    found_rows, found_cols, found_values = [], [], []
+    for a0, a1 in _blocks(p, block_size):
+        for b0, b1 in _blocks(p, block_size):
+            if b0 < a0:
+                continue
+            r = data.block(a0, a1, b0, b1)
+
+            # Upper triangle of the full matrix only
+            rows, cols = np.nonzero(np.arange(a0, a1)[:, None] < np.arange(b0, b1)[None, :])
+            values = r[rows, cols]
+            if threshold is not None:
+                strong = np.abs(values) >= threshold
+                rows, cols, values = rows[strong], cols[strong], values[strong]
+
+            rows, cols, values = _select_top(rows + a0, cols + b0, values, k, max_abs)
+            found_rows.append(rows)
+            found_cols.append(cols)
+            found_values.append(values)
+
+    if not found_rows:
+        return pd.DataFrame(columns=PAIR_COLS)
+
+    rows, cols, values = (np.concatenate(found) for found in (found_rows, found_cols, found_values))
+    # Row-major order, so ties rank the same as in top_k_pairs
+    order = np.lexsort((cols, rows))
+    rows, cols, values = _select_top(rows[order], cols[order], values[order], k, max_abs)
+    return _pairs_frame(columns, rows, cols, values)
+
+
+# ----------------------------- Shared matrix -----------------------------
+
+def _column_key(series: pd.Series) -> str:
+    """
+    Content key of one column as correlated (float64 values), so the same
+    data under another name or in another frame maps to the same entry.
+    """
+    values = np.ascontiguousarray(series.to_numpy(dtype="float64", na_value=np.nan))
+    return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+
+class CorrelationService:
+    """
+    Computes each Pearson matrix once and serves any subset of its columns
+    by slicing. Columns are identified by content, so a later request whose
+    columns all appear in a cached matrix (cleaned frame, feature frame,
+    heatmap subset, ...) is answered without touching the rows again.
+    Least recently used matrices are evicted beyond `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = CORR_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def matrix(self, df: pd.DataFrame, columns=None) -> pd.DataFrame:
+        if columns is None:
+            columns = df.select_dtypes(include="number").columns.tolist()
+        columns = list(columns)
+        keys = [_column_key(df[col]) for col in columns]
+
+        with self._lock:
+            for entry_key, (values, positions) in reversed(self.entries.items()):
+                if all(k in positions for k in keys):
+                    self.entries.move_to_end(entry_key)
+                    self.hits += 1
+                    idx = [positions[k] for k in keys]
+                    return pd.DataFrame(values[np.ix_(idx, idx)], index=columns, columns=columns)
+            self.misses += 1
+
+        corr = correlation_matrix(df, columns)
+
+        with self._lock:
+            positions = {k: i for i, k in enumerate(keys)}
+            self.entries[tuple(keys)] = (corr.to_numpy(), positions)
+            self._evict()
+        return corr
+
+    def _evict(self):
+        total = sum(values.nbytes for values, _ in self.entries.values())
+        while len(self.entries) > 1 and total > self.max_bytes:
+            _, (values, _) = self.entries.popitem(last=False)
+            total -= values.nbytes
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+correlation_service = CorrelationService()
+
+
+def shared_correlation_matrix(df: pd.DataFrame, columns=None) -> pd.DataFrame:
+    """
+    Pearson matrix of `columns` (default: all numeric) from the
+    process-wide correlation service.
+    """
+    return correlation_service.matrix(df, columns)
+
+
+def correlation_with(df: pd.DataFrame, target, columns) -> pd.Series:
+    """
+    r of each of `columns` with `target`, sliced from the shared matrix.
+    """
+    corr = shared_correlation_matrix(df, list(columns) + [target])
+    return corr[target].drop(target)
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from utils.config import DATASET_CACHE_DIR, DATASET_CACHE_MAX_BYTES
+
+CACHE_DIR = Path(DATASET_CACHE_DIR)
+STATS_PATH = CACHE_DIR / "stats.json"
+
+_HASH_BLOCK = 8 * 1024 * 1024
+
+
+def content_hash(file) -> str:
+    """
+    SHA-256 of the raw upload, read in blocks. File-like objects are
+    rewound so they can still be parsed afterwards.
+    """
+    hasher = hashlib.sha256()
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    file.seek(0)
+    while True:
+        block = file.read(_HASH_BLOCK)
+        if not block:
+            break
+        hasher.update(block if isinstance(block, bytes) else block.encode())
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.arrow"
+
+
+# ----------------------------- Stats -----------------------------
+
+def _read_counts() -> dict:
+    counts = {"hits": 0, "misses": 0}
+    if STATS_PATH.exists():
+        try:
+            counts.update(json.loads(STATS_PATH.read_text()))
+        except (OSError, ValueError):
+            pass
+    return counts
+
+
+def cache_stats() -> dict:
+    stats = _read_counts()
+    lookups = stats["hits"] + stats["misses"]
+    entries = list(CACHE_DIR.glob("*.arrow")) if CACHE_DIR.exists() else []
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["entries"] = len(entries)
+    stats["bytes"] = sum(p.stat().st_size for p in entries)
+    return stats
+
+
+def _record(hit: bool):
+    counts = _read_counts()
+    counts["hits" if hit else "misses"] += 1
+
+    tmp = STATS_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(counts))
+    tmp.replace(STATS_PATH)
+
+
+# ----------------------------- Get / Put -----------------------------
+
+def cache_get(key: str):
+    """
+    Return the cached frame for `key` (memory-mapped Arrow IPC), or None.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _entry_path(key)
+
+    if not path.exists():
+        _record(hit=False)
+        return None
+
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        path.unlink(missing_ok=True)
+        _record(hit=False)
+        return None
+
+    # Touch for LRU ordering
+    os.utime(path)
+    _record(hit=True)
+    return table.to_pandas()
+
+
+def cache_put(key: str, df, max_bytes: int = DATASET_CACHE_MAX_BYTES):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _entry_path(key)
+    tmp = path.with_suffix(".tmp")
+
+    try:
+        # Uncompressed so later reads can be memory-mapped
+        feather.write_feather(df, tmp, compression="uncompressed")
+    except (pa.ArrowException, ValueError, TypeError):
+        # Frames Arrow cannot represent are simply not cached
+        tmp.unlink(missing_ok=True)
+        return
+
+    tmp.replace(path)
+    _evict(max_bytes)
+
+
+def _evict(max_bytes: int):
+    """
+    Drop least-recently-used entries until the cache fits in `max_bytes`.
+    """
+    entries = sorted(CACHE_DIR.glob("*.arrow"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in entries)
+
+    for path in entries:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
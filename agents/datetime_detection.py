@@ -0,0 +1,88 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.config import DATETIME_SAMPLE_SIZE
+
+_FORMAT_CACHE = OrderedDict()
+_FORMAT_CACHE_SIZE = 1024
+
+
+def _is_text(series: pd.Series) -> bool:
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Compacted text columns: look at what the categories hold
+        dtype = dtype.categories.dtype
+    return dtype == "object" or pd.api.types.is_string_dtype(dtype)
+
+
+def _sample_values(series: pd.Series, sample_size: int) -> pd.Series:
+    """
+    Up to `sample_size` non-null values spread evenly over the column.
+    """
+    if len(series) > sample_size:
+        idx = np.linspace(0, len(series) - 1, sample_size).astype(int)
+        series = series.iloc[idx]
+    return series.dropna().astype(str)
+
+
+def infer_datetime_format(series: pd.Series, sample_size: int = DATETIME_SAMPLE_SIZE):
+    """
+    Return an explicit datetime format if every sampled value parses with it,
+    otherwise None. Verdicts are cached on the column name and sample values,
+    so profiling and feature engineering share them across reruns.
+    """
+    sample = _sample_values(series, sample_size)
+    if sample.empty:
+        return None
+
+    key = (series.name, tuple(sample))
+    if key in _FORMAT_CACHE:
+        _FORMAT_CACHE.move_to_end(key)
+        return _FORMAT_CACHE[key]
+
+    fmt = pd.tseries.api.guess_datetime_format(sample.iloc[0])
+    if fmt is not None:
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce")
+        if not parsed.notna().all():
+            fmt = None
+
+    _FORMAT_CACHE[key] = fmt
+    if len(_FORMAT_CACHE) > _FORMAT_CACHE_SIZE:
+        _FORMAT_CACHE.popitem(last=False)
+    return fmt
+
+
+def clear_format_cache():
+    _FORMAT_CACHE.clear()
+
+
+def detect_datetime_formats(df: pd.DataFrame, sample_size: int = DATETIME_SAMPLE_SIZE) -> dict:
+    """
+    Map each text column that looks like dates to its inferred format.
+    """
+    formats = {}
+    for col in df.columns:
+        if _is_text(df[col]):
+            fmt = infer_datetime_format(df[col], sample_size)
+            if fmt is not None:
+                formats[col] = fmt
+    return formats
+
+
+def parse_datetime(series: pd.Series, fmt: str):
+    """
+    Parse the full column once with a known format. Returns None if any
+    non-null value fails to parse (the sample was not representative).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Parse each category once and expand by code
+        categories = pd.to_datetime(series.cat.categories, format=fmt, errors="coerce")
+        codes = series.cat.codes.to_numpy()
+        parsed = pd.Series(categories.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index, name=series.name)
+    else:
+        parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+    if parsed.notna().sum() != series.notna().sum():
+        return None
+    return parsed
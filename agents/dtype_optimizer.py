@@ -0,0 +1,151 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+from utils.config import (
+    DTYPE_ARROW_STRINGS,
+    INGEST_CATEGORY_MAX_RATIO,
+    INGEST_CATEGORY_MAX_UNIQUE,
+    INGEST_SAMPLE_ROWS,
+)
+
+INT_WIDTHS = ["int8", "int16", "int32", "int64"]
+
+
+# ----------------------------- Shared rules -----------------------------
+
+def smallest_int(lo, hi) -> str:
+    for dtype in INT_WIDTHS:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return "int64"
+
+
+def int_fits(dtype: str, lo: int, hi: int) -> bool:
+    info = np.iinfo(dtype)
+    return info.min <= lo and hi <= info.max
+
+
+def float32_lossless(series: pd.Series) -> bool:
+    values = series.to_numpy(dtype="float64")
+    return bool(np.array_equal(values.astype("float32").astype("float64"), values, equal_nan=True))
+
+
+def is_low_cardinality(n_unique: int, n_rows: int) -> bool:
+    """
+    Whether a text column with `n_unique` values over `n_rows` is worth a
+    category dtype (few levels, each repeated).
+    """
+    return n_unique <= INGEST_CATEGORY_MAX_UNIQUE and n_unique / max(1, n_rows) <= INGEST_CATEGORY_MAX_RATIO
+
+
+def is_categorical(dtype) -> bool:
+    """
+    Text-like column in any representation: object, str / string (Python or
+    Arrow storage) or category.
+    """
+    return (
+        dtype == "object"
+        or isinstance(dtype, pd.CategoricalDtype)
+        or pd.api.types.is_string_dtype(dtype)
+    )
+
+
+def categorical_columns(df: pd.DataFrame) -> list:
+    """
+    Columns the agents treat as categorical, whatever their compact dtype.
+    """
+    return [col for col, dtype in df.dtypes.items() if is_categorical(dtype)]
+
+
+# ----------------------------- Compaction -----------------------------
+
+def _arrow_string_dtype():
+    if importlib.util.find_spec("pyarrow") is None:
+        return None
+    try:
+        # NaN as the missing value, like object and default str columns
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:  # pandas < 2.3
+        return pd.StringDtype("pyarrow")
+
+
+def _compact_text(s: pd.Series, arrow_strings: bool):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return None
+
+    # Cheap sample check first: most high-cardinality columns stop here
+    sample = s.iloc[:INGEST_SAMPLE_ROWS]
+    if is_low_cardinality(sample.nunique(dropna=True), len(sample)):
+        as_category = s.astype("category")
+        if is_low_cardinality(len(as_category.cat.categories), len(s)):
+            return as_category
+
+    if arrow_strings and s.dtype == "object" and pd.api.types.infer_dtype(s, skipna=True) == "string":
+        dtype = _arrow_string_dtype()
+        if dtype is not None:
+            return s.astype(dtype)
+    return None
+
+
+def _compact_column(s: pd.Series, arrow_strings: bool):
+    """
+    Compact version of one column, or None to keep it as is.
+    """
+    dtype = s.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+        return None
+
+    # Plain numpy ints only: nullable (Int64) columns keep their width
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        if not len(s):
+            return None
+        target = smallest_int(int(s.min()), int(s.max()))
+        return s.astype(target) if np.dtype(target).itemsize < dtype.itemsize else None
+
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        if dtype.itemsize > 4 and float32_lossless(s):
+            return s.astype("float32")
+        return None
+
+    if is_categorical(dtype):
+        return _compact_text(s, arrow_strings)
+    return None
+
+
+def compact_dtypes(df: pd.DataFrame, arrow_strings: bool = DTYPE_ARROW_STRINGS):
+    """
+    Shrink a freshly read frame: integers to the smallest width that holds
+    their range, floats to float32 where that is lossless, low-cardinality
+    text to category and, with `arrow_strings`, other text to Arrow-backed
+    strings. Values are unchanged.
+
+    Returns (df, report) where report has the memory footprint before and
+    after (MB, deep) and the {column: [old, new]} dtype changes.
+    """
+    before = df.memory_usage(deep=True).sum()
+
+    compacted = {}
+    for col in df.columns:
+        new = _compact_column(df[col], arrow_strings)
+        if new is not None:
+            compacted[col] = new
+
+    changes = {col: [str(df[col].dtype), str(s.dtype)] for col, s in compacted.items()}
+    if compacted:
+        # Shallow copy: the caller's frame keeps its dtypes, no data is copied
+        df = df.copy(deep=False)
+        for col, s in compacted.items():
+            df[col] = s
+
+    after = df.memory_usage(deep=True).sum()
+    report = {
+        "before_mb": round(before / 1024 ** 2, 2),
+        "after_mb": round(after / 1024 ** 2, 2),
+        "saved_pct": round(100 * (1 - after / before), 1) if before else 0.0,
+        "changes": changes,
+    }
+    return df, report
+
@@ -1,22 +1,62 @@
 import pandas as pd
 
+from agents.column_stats import SUMMARY_COLS, compute_column_stats
+from agents.correlation import correlation_pairs, shared_correlation_matrix, top_k_pairs, top_pairs
+from utils.config import CORR_DENSE_MAX_COLS, CORR_SPARSE_MAX_PAIRS, CORR_SPARSE_THRESHOLD
 
-def generate_eda(df: pd.DataFrame):
+
+def generate_eda(df: pd.DataFrame, stats: dict | None = None):
     """
     Returns:
     - eda_report: dict (safe for memory + llm)
     - eda_tables: dict of DataFrames (for Streamlit UI)
     """
 
+    if stats is None:
+        stats = compute_column_stats(df)
+
+    numeric_cols = df.select_dtypes(include="number").columns.tolist()
+    corr = corr_pairs = None
+    if len(numeric_cols) <= CORR_DENSE_MAX_COLS:
+        corr = shared_correlation_matrix(df, numeric_cols)
+    else:
+        # Very wide: keep only the strong pairs, never the dense matrix
+        corr_pairs = correlation_pairs(
+            df, numeric_cols, threshold=CORR_SPARSE_THRESHOLD, k=CORR_SPARSE_MAX_PAIRS
+        )
+
+    return assemble_eda(
+        df.shape, df.dtypes.astype(str), stats["columns"], numeric_cols, corr, corr_pairs
+    )
+
+
+def assemble_eda(
+    shape,
+    dtypes: pd.Series,
+    col_stats: pd.DataFrame,
+    numeric_cols: list,
+    corr: pd.DataFrame | None,
+    corr_pairs: pd.DataFrame | None = None,
+):
+    """
+    Build eda_report / eda_tables from precomputed summaries, so in-memory
+    and out-of-core (agents.chunked_eda) EDA produce identical shapes.
+
+    `dtypes` maps column -> dtype string, `col_stats` follows the
+    compute_column_stats table layout and `corr` is the Pearson matrix of
+    `numeric_cols`. For very wide tables pass `corr_pairs` (a sparse
+    correlation_pairs list) instead of `corr`.
+    """
     eda_report = {}
     eda_tables = {}
 
     # ---------------- BASIC ----------------
-    eda_report["shape"] = df.shape
+    eda_report["shape"] = tuple(shape)
 
     # ---------------- MISSING ----------------
-    missing = df.isna().sum().sort_values(ascending=False)
-    missing_pct = (df.isna().mean() * 100).round(2).sort_values(ascending=False)
+    null_count = col_stats["null_count"]
+    missing = null_count.sort_values(ascending=False)
+    missing_pct = (col_stats["null_ratio"] * 100).round(2).sort_values(ascending=False)
 
     missing_table = pd.DataFrame({
         "missing_count": missing,
@@ -26,26 +66,25 @@ def generate_eda(df: pd.DataFrame):
 
     eda_tables["missing_table"] = missing_table
 
-    eda_report["missing"] = df.isna().sum().to_dict()
+    eda_report["missing"] = null_count.to_dict()
 
     # ---------------- DTYPES ----------------
     dtypes_table = pd.DataFrame({
-        "column": df.columns,
-        "dtype": df.dtypes.astype(str).values,
-        "unique_values": [df[c].nunique(dropna=True) for c in df.columns]
+        "column": dtypes.index,
+        "dtype": dtypes.values,
+        "unique_values": col_stats["n_unique"].tolist()
     })
 
     eda_tables["dtypes_table"] = dtypes_table
 
-    eda_report["dtypes"] = df.dtypes.astype(str).to_dict()
+    eda_report["dtypes"] = dtypes.to_dict()
 
     # ---------------- NUMERIC SUMMARY ----------------
-    numeric_df = df.select_dtypes(include="number")
-
-    if not numeric_df.empty:
-        numeric_summary = numeric_df.describe().T.round(2)
-        numeric_summary["missing_count"] = numeric_df.isna().sum()
-        numeric_summary["missing_%"] = (numeric_df.isna().mean() * 100).round(2)
+    if numeric_cols:
+        num_stats = col_stats.loc[numeric_cols]
+        numeric_summary = num_stats[SUMMARY_COLS].astype("float64").round(2)
+        numeric_summary["missing_count"] = num_stats["null_count"]
+        numeric_summary["missing_%"] = (num_stats["null_ratio"] * 100).round(2)
 
         eda_tables["numeric_summary_table"] = numeric_summary
 
@@ -53,29 +92,24 @@ def generate_eda(df: pd.DataFrame):
         eda_report["numeric_summary"] = numeric_summary.to_dict()
 
         # ---------------- CORRELATION MATRIX ----------------
-        corr = numeric_df.corr().round(2)
-        eda_tables["correlation_table"] = corr
-        eda_report["correlation_matrix"] = corr.to_dict()
+        # Pairs that round to |r| = 1.00 (self / duplicate columns) are not
+        # reported as top correlations
+        if corr is not None:
+            corr = corr.round(2)
+            eda_tables["correlation_table"] = corr
+            eda_report["correlation_matrix"] = corr.to_dict()
+            strongest = top_k_pairs(corr, k=10, max_abs=1.0)
+        else:
+            corr_pairs = corr_pairs.round({"corr": 2})
+            eda_tables["correlation_pairs_table"] = corr_pairs
+            strongest = top_pairs(corr_pairs, k=10, max_abs=1.0)
 
         # ---------------- TOP CORRELATIONS ----------------
-        corr_abs = corr.abs()
-        stacked = corr_abs.unstack().sort_values(ascending=False)
-
-        # remove self-correlation
-        stacked = stacked[stacked < 1]
-
-        top_pairs = []
-        used = set()
-
-        for (a, b), value in stacked.items():
-            if (b, a) in used:
-                continue
-            used.add((a, b))
-            top_pairs.append((a, b, float(value)))
-            if len(top_pairs) == 10:
-                break
-
-        top_corr_table = pd.DataFrame(top_pairs, columns=["feature_1", "feature_2", "abs_corr"])
+        top_corr_table = pd.DataFrame({
+            "feature_1": strongest["feature_1"],
+            "feature_2": strongest["feature_2"],
+            "abs_corr": strongest["corr"].abs().astype("float64"),
+        })
         eda_tables["top_correlations_table"] = top_corr_table
 
         eda_report["top_correlations"] = [
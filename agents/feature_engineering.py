@@ -1,19 +1,28 @@
 import pandas as pd
 
+from agents.cardinality import distinct_count
+from agents.datetime_detection import detect_datetime_formats, parse_datetime
+from agents.dtype_optimizer import categorical_columns
 
-def engineer_features(df: pd.DataFrame):
-    df = df.copy()
+
+def engineer_features(df: pd.DataFrame, profile: dict | None = None, stats: dict | None = None):
+    # Columns are added and replaced on a shallow copy; the input is untouched
+    df = df.copy(deep=False)
     report = []
 
+    # Reuse the formats profiling already inferred; parse each column once
+    formats = profile.get("datetime_formats") if profile else None
+    if formats is None:
+        formats = detect_datetime_formats(df)
+
     # --- Detect datetime columns & extract features ---
     for col in df.columns:
-        if df[col].dtype == "object":
-            try:
-                parsed = pd.to_datetime(df[col], errors="raise")
-                df[col] = parsed
-                report.append(f"Parsed '{col}' as datetime.")
-            except Exception:
+        if col in formats and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            parsed = parse_datetime(df[col], formats[col])
+            if parsed is None:
                 continue
+            df[col] = parsed
+            report.append(f"Parsed '{col}' as datetime.")
 
         if pd.api.types.is_datetime64_any_dtype(df[col]):
             df[f"{col}_year"] = df[col].dt.year
@@ -23,9 +32,12 @@ def engineer_features(df: pd.DataFrame):
             report.append(f"Extracted year/month/day features from datetime column '{col}'.")
 
     # --- Encode binary categoricals safely ---
-    cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    cat_cols = categorical_columns(df)
     for col in cat_cols:
-        nunique = df[col].nunique()
+        if stats is not None and col in stats["columns"].index:
+            nunique = distinct_count(stats, col, near=(2, 50))
+        else:
+            nunique = df[col].nunique()
 
         if nunique == 2:
             df[col] = df[col].astype("category").cat.codes
@@ -1,9 +1,11 @@
 import pandas as pd
 
+from agents.correlation import correlation_with
+
 def feature_importance(df, target):
     importance = []
 
-    if target not in df.columns:
+    if target not in df.columns or not pd.api.types.is_numeric_dtype(df[target]):
         return importance
 
     numeric_cols = df.select_dtypes(include="number").columns
@@ -13,9 +15,7 @@ def feature_importance(df, target):
         return importance
 
     correlations = (
-        df[numeric_cols + [target]]
-        .corr()[target]
-        .drop(target)
+        correlation_with(df, target, numeric_cols)
         .abs()
         .sort_values(ascending=False)
     )
@@ -1,5 +1,247 @@
 import pandas as pd
+from pandas.api.types import union_categoricals
 
-def load_data(file):
-    df = pd.read_csv(file)
+from agents.dataset_cache import cache_get, cache_put, content_hash
+from agents.datetime_detection import infer_datetime_format
+from agents.dtype_optimizer import compact_dtypes, float32_lossless, int_fits, is_low_cardinality, smallest_int
+from utils.config import INGEST_CHUNK_ROWS, INGEST_SAMPLE_ROWS
+
+
+# ----------------------------- Dtype plan -----------------------------
+
+def infer_dtype_plan(sample: pd.DataFrame) -> dict:
+    """
+    Infer a compact dtype per column from a leading sample.
+
+    Plan entries look like {"kind": "int", "dtype": "int16"} and are only a
+    starting point: chunks that do not fit the plan are widened on read.
+    """
+    plan = {}
+
+    for col in sample.columns:
+        s = sample[col]
+
+        if pd.api.types.is_bool_dtype(s):
+            plan[col] = {"kind": "bool", "dtype": "bool"}
+
+        elif pd.api.types.is_integer_dtype(s):
+            lo, hi = (int(s.min()), int(s.max())) if len(s) else (0, 0)
+            plan[col] = {"kind": "int", "dtype": smallest_int(lo, hi)}
+
+        elif pd.api.types.is_float_dtype(s):
+            dtype = "float32" if float32_lossless(s) else "float64"
+            plan[col] = {"kind": "float", "dtype": dtype}
+
+        else:
+            fmt = infer_datetime_format(s)
+            if fmt is not None:
+                plan[col] = {"kind": "datetime", "format": fmt}
+                continue
+
+            if is_low_cardinality(s.nunique(dropna=True), len(s)):
+                plan[col] = {"kind": "category"}
+            else:
+                plan[col] = {"kind": "text"}
+
+    return plan
+
+
+def _apply_plan(chunk: pd.DataFrame, plan: dict) -> pd.DataFrame:
+    """
+    Cast one chunk to the planned dtypes, widening any column whose values
+    do not fit (e.g. an int8 column that sees 300, or NaNs in an int column).
+    """
+    for col, spec in plan.items():
+        if col not in chunk.columns:
+            continue
+        s = chunk[col]
+        kind = spec["kind"]
+
+        if kind == "int" and pd.api.types.is_integer_dtype(s):
+            lo, hi = (int(s.min()), int(s.max())) if len(s) else (0, 0)
+            dtype = spec["dtype"] if int_fits(spec["dtype"], lo, hi) else smallest_int(lo, hi)
+            chunk[col] = s.astype(dtype)
+
+        elif kind == "float" and pd.api.types.is_float_dtype(s):
+            if spec["dtype"] == "float32" and float32_lossless(s):
+                chunk[col] = s.astype("float32")
+
+        elif kind == "datetime":
+            parsed = pd.to_datetime(s, format=spec["format"], errors="coerce")
+            if parsed.notna().sum() == s.notna().sum():
+                chunk[col] = parsed
+            else:
+                # This chunk stopped looking like dates: keep the column as text
+                spec["kind"] = "text"
+
+        elif kind == "category":
+            chunk[col] = s.astype("category")
+
+    return chunk
+
+
+def _concat_chunks(chunks: list) -> pd.DataFrame:
+    if len(chunks) == 1:
+        return chunks[0]
+
+    # Categoricals with different categories would fall back to object
+    for col in chunks[0].columns:
+        if all(isinstance(c[col].dtype, pd.CategoricalDtype) for c in chunks):
+            merged = union_categoricals([c[col] for c in chunks]).categories
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(merged)
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+# ----------------------------- Loaders -----------------------------
+
+def _progress_fraction(file):
+    size = getattr(file, "size", None)
+    if size and hasattr(file, "tell"):
+        try:
+            return min(1.0, file.tell() / size)
+        except (OSError, ValueError):
+            pass
+    return None
+
+
+def _planned_reader(file, chunk_rows: int, sample_rows: int):
+    """
+    Infer the dtype plan from a leading sample and open a chunked reader
+    that parses low-cardinality text straight into categoricals.
+    """
+    sample = pd.read_csv(file, nrows=sample_rows)
+    plan = infer_dtype_plan(sample)
+
+    if hasattr(file, "seek"):
+        file.seek(0)
+
+    read_dtypes = {col: "category" for col, spec in plan.items() if spec["kind"] == "category"}
+    return sample, plan, pd.read_csv(file, chunksize=chunk_rows, dtype=read_dtypes)
+
+
+def iter_csv_chunks(
+    file,
+    chunk_rows: int = INGEST_CHUNK_ROWS,
+    sample_rows: int = INGEST_SAMPLE_ROWS,
+    progress=None,
+):
+    """
+    Yield planned chunks one at a time without keeping them, for
+    out-of-core consumers. A column demoted from datetime to text keeps its
+    parsed values in the chunks already yielded; `chunk.attrs
+    ["datetime_formats"]` maps every planned date column to its format so
+    consumers can line both representations up.
+    """
+    _, plan, reader = _planned_reader(file, chunk_rows, sample_rows)
+    formats = {col: spec["format"] for col, spec in plan.items() if spec["kind"] == "datetime"}
+
+    rows_read = 0
+    for chunk in reader:
+        chunk = _apply_plan(chunk, plan)
+        chunk.attrs["datetime_formats"] = formats
+        rows_read += len(chunk)
+        if progress is not None:
+            progress(rows_read, _progress_fraction(file))
+        yield chunk
+
+
+def load_data_streaming(
+    file,
+    chunk_rows: int = INGEST_CHUNK_ROWS,
+    sample_rows: int = INGEST_SAMPLE_ROWS,
+    progress=None,
+    fingerprint=None,
+):
+    """
+    Read a CSV in bounded chunks using a dtype plan inferred from a leading
+    sample. `progress(rows_read, fraction)` is called after every chunk;
+    fraction is None when the source size is unknown. A DatasetFingerprint
+    passed as `fingerprint` is updated chunk by chunk.
+    """
+    sample, plan, reader = _planned_reader(file, chunk_rows, sample_rows)
+
+    chunks = []
+    rows_read = 0
+    rehash = False
+    for chunk in reader:
+        date_cols = [c for c, spec in plan.items() if spec["kind"] == "datetime"]
+        chunk = _apply_plan(chunk, plan)
+
+        # Columns demoted to text mid-stream: restore earlier chunks as text too
+        for col in date_cols:
+            if plan[col]["kind"] == "text":
+                for prev in chunks:
+                    prev[col] = prev[col].dt.strftime(plan[col]["format"])
+                rehash = True
+
+        if fingerprint is not None and not rehash:
+            fingerprint.update(chunk)
+
+        chunks.append(chunk)
+        rows_read += len(chunk)
+        if progress is not None:
+            progress(rows_read, _progress_fraction(file))
+
+    df = _concat_chunks(chunks) if chunks else sample
+
+    # Earlier chunks changed after being hashed: hash the final frame instead
+    if fingerprint is not None and (rehash or not chunks):
+        fingerprint.reset()
+        fingerprint.update_frame(df)
+
+    return df
+
+
+def load_data(
+    file,
+    streaming: bool = False,
+    progress=None,
+    use_cache: bool = False,
+    fingerprint=None,
+    content_key: str | None = None,
+    memory_report: dict | None = None,
+):
+    """
+    Load a CSV. Optional DatasetFingerprint `fingerprint` is filled with the
+    loaded content (incrementally when streaming). `content_key` is the
+    file's content_hash when the caller already has it (the upload is then
+    not read a second time to key the dataset cache).
+
+    When a `memory_report` dict is passed, the frame is shrunk with
+    compact_dtypes before it is returned (and cached, so warm loads do not
+    compact again) and the dict is filled with the compaction report.
+    """
+    compact = memory_report is not None
+    if use_cache:
+        # Streaming and plain reads produce different dtypes, so key on both
+        key = f"{content_key or content_hash(file)}-{'stream' if streaming else 'plain'}"
+        if compact:
+            key += "-compact"
+        df = cache_get(key)
+        if df is not None:
+            if fingerprint is not None:
+                fingerprint.update_frame(df)
+            if compact:
+                memory_report.update(df.attrs.pop("memory_report"))
+            return df
+
+    if streaming:
+        df = load_data_streaming(file, progress=progress, fingerprint=fingerprint)
+    else:
+        df = pd.read_csv(file)
+        if fingerprint is not None:
+            fingerprint.update_frame(df)
+
+    if compact:
+        df, report = compact_dtypes(df)
+        memory_report.update(report)
+
+    if use_cache:
+        # The report travels with the cached frame (Arrow keeps df.attrs)
+        if compact:
+            df.attrs["memory_report"] = memory_report
+        cache_put(key, df)
+        df.attrs.pop("memory_report", None)
     return df
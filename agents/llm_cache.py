@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from utils.config import LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL_SECONDS
+
+CACHE_DIR = Path(LLM_CACHE_DIR)
+
+
+def cache_disabled() -> bool:
+    """
+    Global bypass switch: set LLM_CACHE_DISABLED=1 to always call the API.
+    """
+    return os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+def response_key(model: str, messages: list, temperature: float) -> str:
+    """
+    Key on everything that changes the completion: model, the full prompt
+    messages (which embed the brief) and temperature.
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_response(key: str, ttl: float = LLM_CACHE_TTL_SECONDS):
+    path = CACHE_DIR / f"{key}.json"
+    if not path.exists():
+        return None
+
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        path.unlink(missing_ok=True)
+        return None
+
+    if time.time() - entry.get("created", 0) > ttl:
+        path.unlink(missing_ok=True)
+        return None
+
+    # Touch for LRU ordering
+    os.utime(path)
+    return entry["content"]
+
+
+def put_response(key: str, content: str, max_bytes: int = LLM_CACHE_MAX_BYTES):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{key}.json"
+    tmp = path.with_suffix(".tmp")
+
+    tmp.write_text(json.dumps({"created": time.time(), "content": content}), encoding="utf-8")
+    tmp.replace(path)
+    _evict(max_bytes)
+
+
+def _evict(max_bytes: int):
+    entries = sorted(CACHE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in entries)
+
+    for path in entries:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
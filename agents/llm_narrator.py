@@ -1,7 +1,10 @@
+import threading
+
 from openai import OpenAI
 from utils.config import OPENAI_API_KEY
 from agents.report_schema import REPORT_SECTIONS
 from agents.narrative_builder import build_llm_brief
+from agents.llm_cache import cache_disabled, get_response, put_response, response_key
 
 
 client = OpenAI(
@@ -9,6 +12,9 @@ client = OpenAI(
     base_url="https://openrouter.ai/api/v1"
 )
 
+MODEL = "meta-llama/llama-3.1-8b-instruct"
+REPORT_TITLE = "Exploratory Data Analysis (EDA) Report"
+
 
 SYSTEM_PROMPT = """
 You are a senior data analyst writing a professional Exploratory Data Analysis (EDA) report.
@@ -111,35 +117,70 @@ def _remove_empty_sections(text: str) -> str:
     return "\n".join(cleaned).strip()
 
 
-def narrate_insights(eda, cleaning, features):
+def _complete(messages, temperature, use_cache=True, on_token=None):
+    """
+    One chat completion, served from the local response cache when possible.
+    With `on_token`, the response is streamed and each delta passed to it.
+    """
+    use_cache = use_cache and not cache_disabled()
+    key = response_key(MODEL, messages, temperature)
+
+    if use_cache:
+        cached = get_response(key)
+        if cached is not None:
+            if on_token is not None:
+                on_token(cached)
+            return cached
+
+    if on_token is None:
+        content = client.chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            temperature=temperature
+        ).choices[0].message.content
+    else:
+        stream = client.chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            temperature=temperature,
+            stream=True
+        )
+        parts = []
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                on_token(delta)
+        content = "".join(parts)
+
+    if use_cache:
+        put_response(key, content)
+    return content
+
+
+def narrate_insights(eda, cleaning, features, use_cache=True, on_token=None):
     """
     Keep signature unchanged for your app.
     Here eda = context dict (not raw eda_report)
     cleaning = cleaning_stats
     features = feature_report
+    use_cache = False forces fresh completions
+    on_token = optional callback receiving the final report as it streams
     """
 
     # The app will now pass report_context in "eda"
     context = eda
     brief = build_llm_brief(context)
 
-    draft = client.chat.completions.create(
-        model="meta-llama/llama-3.1-8b-instruct",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT.strip()},
-            {"role": "user", "content": REPORT_WRITER_PROMPT.format(brief=brief)}
-        ],
-        temperature=0.35
-    ).choices[0].message.content
-
-    refined = client.chat.completions.create(
-        model="meta-llama/llama-3.1-8b-instruct",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT.strip()},
-            {"role": "user", "content": CRITIQUE_PROMPT.format(draft=draft)}
-        ],
-        temperature=0.2
-    ).choices[0].message.content
+    draft = _complete([
+        {"role": "system", "content": SYSTEM_PROMPT.strip()},
+        {"role": "user", "content": REPORT_WRITER_PROMPT.format(brief=brief)}
+    ], temperature=0.35, use_cache=use_cache)
+
+    refined = _complete([
+        {"role": "system", "content": SYSTEM_PROMPT.strip()},
+        {"role": "user", "content": CRITIQUE_PROMPT.format(draft=draft)}
+    ], temperature=0.2, use_cache=use_cache, on_token=on_token)
 
     refined = _remove_empty_sections(refined)
 
@@ -147,3 +188,49 @@ def narrate_insights(eda, cleaning, features):
         refined = f"# {REPORT_TITLE}\n\n" + refined
 
     return refined
+
+
+class NarrationJob:
+    """
+    Runs narrate_insights on a background thread so the rest of the page
+    can render meanwhile. `text` holds the streamed report so far; `wait()`
+    blocks for the final, post-processed narrative.
+    """
+
+    def __init__(self, eda, cleaning, features, use_cache=True):
+        self.text = ""
+        self.error = None
+        self._result = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(eda, cleaning, features, use_cache),
+            daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def _on_token(self, token):
+        with self._lock:
+            self.text += token
+
+    def _run(self, eda, cleaning, features, use_cache):
+        try:
+            self._result = narrate_insights(
+                eda, cleaning, features, use_cache=use_cache, on_token=self._on_token
+            )
+        except Exception as e:
+            self.error = e
+
+    def wait(self, timeout=None) -> str:
+        self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self._result
+
+
+def start_narration(eda, cleaning, features, use_cache=True) -> NarrationJob:
+    return NarrationJob(eda, cleaning, features, use_cache=use_cache)
@@ -1,56 +1,287 @@
 import json
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
 import numpy as np
 import pandas as pd
 import hashlib
 from pathlib import Path
 
-MEMORY_PATH = Path("memory/agent_memory.json")
+from utils.config import FINGERPRINT_CHUNK_ROWS, MEMORY_MAX_AGE_DAYS, MEMORY_MAX_ENTRIES
 
+MEMORY_DB_PATH = Path("memory/agent_memory.db")
 
-def dataset_fingerprint(df: pd.DataFrame) -> str:
+
+def _kind(dtype) -> str:
     """
-    Create a stable fingerprint for a dataset
-    based on structure + light content sampling.
+    Coarse column kind for the schema part of the fingerprint, so compact
+    dtypes (int8, float32, category) match their default-read equivalents.
     """
-    hasher = hashlib.sha256()
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return "text"
 
-    # Columns and dtypes
-    schema_repr = "|".join(
-        f"{col}:{str(dtype)}" for col, dtype in zip(df.columns, df.dtypes)
-    )
-    hasher.update(schema_repr.encode())
 
-    # Shape
-    hasher.update(str(df.shape).encode())
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Vectorized 64-bit hash per row. Numbers are hashed as float64 and
+    datetimes at ns resolution, so a column widened mid-stream (int8 -> int16
+    -> float) hashes the same as it does after the final concat.
+    """
+    normalized = {}
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i]
+        if pd.api.types.is_bool_dtype(s.dtype):
+            normalized[i] = s
+        elif pd.api.types.is_numeric_dtype(s.dtype):
+            normalized[i] = s.astype("float64")
+        elif pd.api.types.is_datetime64_any_dtype(s.dtype):
+            normalized[i] = s.dt.as_unit("ns")
+        else:
+            normalized[i] = s
+    return pd.util.hash_pandas_object(pd.DataFrame(normalized, copy=False), index=False).to_numpy()
+
+
+class DatasetFingerprint:
+    """
+    Incremental full-content fingerprint: feed row chunks in order with
+    update(), read the result with hexdigest(). Chunking does not change
+    the result, so ingestion can update it while it streams.
+    """
+
+    def __init__(self):
+        self._hasher = hashlib.sha256()
+        self._schema = None
+        self._rows = 0
+
+    def reset(self):
+        self.__init__()
+
+    def update(self, chunk: pd.DataFrame):
+        if self._schema is None:
+            self._schema = "|".join(f"{col}:{_kind(dtype)}" for col, dtype in chunk.dtypes.items())
+        self._hasher.update(_row_hashes(chunk).tobytes())
+        self._rows += len(chunk)
+
+    def update_frame(self, df: pd.DataFrame):
+        """
+        Hash a whole frame in bounded row chunks.
+        """
+        for start in range(0, max(1, len(df)), FINGERPRINT_CHUNK_ROWS):
+            self.update(df.iloc[start:start + FINGERPRINT_CHUNK_ROWS])
+
+    def hexdigest(self) -> str:
+        hasher = hashlib.sha256()
+        hasher.update((self._schema or "").encode())
+        hasher.update(str(self._rows).encode())
+        hasher.update(self._hasher.digest())
+        return hasher.hexdigest()
+
 
-    # Sample values (first 5 rows, safe cast)
-    sample = df.head(5).astype(str).values.flatten()
-    hasher.update("".join(sample).encode())
+def dataset_fingerprint(df: pd.DataFrame, sample_rows: int | None = None) -> str:
+    """
+    Create a stable fingerprint for a dataset.
+
+    By default every row is hashed (vectorized, in bounded row chunks).
+    With `sample_rows`, only that many evenly spaced rows are hashed plus
+    the shape: much cheaper, but only sensitive to the sampled rows.
+    """
+    fingerprint = DatasetFingerprint()
+
+    if sample_rows is not None and len(df) > sample_rows:
+        idx = np.linspace(0, len(df) - 1, sample_rows).astype(int)
+        fingerprint.update(df.iloc[idx])
+        return f"sampled-{len(df)}-{fingerprint.hexdigest()}"
 
-    return hasher.hexdigest()
+    fingerprint.update_frame(df)
+    return fingerprint.hexdigest()
 
 
 def _make_json_safe(obj):
     if isinstance(obj, dict):
-        return {k: _make_json_safe(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
+        return {str(k): _make_json_safe(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
         return [_make_json_safe(v) for v in obj]
+    elif isinstance(obj, np.ndarray):
+        return [_make_json_safe(v) for v in obj.tolist()]
     elif isinstance(obj, np.integer):
         return int(obj)
     elif isinstance(obj, np.floating):
         return float(obj)
     elif isinstance(obj, np.bool_):
         return bool(obj)
+    elif isinstance(obj, (pd.Timestamp, pd.Timedelta)):
+        return str(obj)
     else:
         return obj
 
 
-def save_memory(memory: dict):
-    safe_memory = _make_json_safe(memory)
-    MEMORY_PATH.write_text(json.dumps(safe_memory, indent=2))
+def _encode(entry: dict) -> bytes:
+    text = json.dumps(_make_json_safe(entry), separators=(",", ":"))
+    return zlib.compress(text.encode())
+
+
+def _decode(payload: bytes) -> dict:
+    return json.loads(zlib.decompress(payload).decode())
+
+
+def eda_summary(eda_report: dict) -> dict:
+    """
+    Bounded subset of the EDA report worth remembering between runs.
+    """
+    return {
+        "shape": eda_report.get("shape"),
+        "missing": {k: v for k, v in eda_report.get("missing", {}).items() if v},
+        "top_correlations": eda_report.get("top_correlations", [])[:10],
+    }
+
+
+# ----------------------------- Store -----------------------------
+
+def _connect(path: Path = None) -> sqlite3.Connection:
+    path = Path(path or MEMORY_DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30)
+    # WAL lets concurrent Streamlit sessions read while one writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS analyses ("
+        " fingerprint TEXT PRIMARY KEY,"
+        " payload BLOB NOT NULL,"
+        " created_at REAL NOT NULL,"
+        " accessed_at REAL NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_accessed ON analyses(accessed_at)")
+    return conn
+
+
+@contextmanager
+def _session(path: Path):
+    """
+    One transaction on a short-lived connection (committed on success).
+    """
+    conn = _connect(path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _upsert(conn, fingerprint, payload: bytes):
+    now = time.time()
+    conn.execute(
+        "INSERT INTO analyses (fingerprint, payload, created_at, accessed_at)"
+        " VALUES (?, ?, ?, ?)"
+        " ON CONFLICT(fingerprint) DO UPDATE SET"
+        " payload = excluded.payload, accessed_at = excluded.accessed_at",
+        (fingerprint, payload, now, now),
+    )
+
+
+class MemoryStore:
+    """
+    Dict-like view over the analysis history in SQLite. Lookups hit the
+    primary-key index and each assignment is an atomic upsert, so nothing
+    loads or rewrites the whole history.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or MEMORY_DB_PATH)
+
+    def __contains__(self, fingerprint) -> bool:
+        with _session(self.path) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM analyses WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+        return row is not None
+
+    def __getitem__(self, fingerprint) -> dict:
+        entry = self.get(fingerprint)
+        if entry is None:
+            raise KeyError(fingerprint)
+        return entry
+
+    def get(self, fingerprint, default=None):
+        with _session(self.path) as conn:
+            row = conn.execute(
+                "SELECT payload FROM analyses WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is None:
+                return default
+            conn.execute(
+                "UPDATE analyses SET accessed_at = ? WHERE fingerprint = ?",
+                (time.time(), fingerprint),
+            )
+        return _decode(row[0])
+
+    def __setitem__(self, fingerprint, entry: dict):
+        with _session(self.path) as conn:
+            _upsert(conn, fingerprint, _encode(entry))
+
+    def put_if_changed(self, fingerprint, entry: dict) -> bool:
+        """
+        Upsert `entry` unless the stored one is identical (e.g. on a UI
+        rerun). Returns whether anything was written.
+        """
+        payload = _encode(entry)
+        with _session(self.path) as conn:
+            row = conn.execute(
+                "SELECT payload FROM analyses WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is not None and row[0] == payload:
+                return False
+            _upsert(conn, fingerprint, payload)
+        return True
+
+    def __delitem__(self, fingerprint):
+        with _session(self.path) as conn:
+            conn.execute("DELETE FROM analyses WHERE fingerprint = ?", (fingerprint,))
+
+    def __len__(self) -> int:
+        with _session(self.path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def prune(self, max_entries: int = MEMORY_MAX_ENTRIES, max_age_days: float = MEMORY_MAX_AGE_DAYS):
+        """
+        Retention: drop entries unused for `max_age_days`, then the least
+        recently used ones beyond `max_entries`.
+        """
+        cutoff = time.time() - max_age_days * 86400
+        with _session(self.path) as conn:
+            conn.execute("DELETE FROM analyses WHERE accessed_at < ?", (cutoff,))
+            conn.execute(
+                "DELETE FROM analyses WHERE fingerprint NOT IN ("
+                " SELECT fingerprint FROM analyses ORDER BY accessed_at DESC LIMIT ?)",
+                (max_entries,),
+            )
+
+
+def save_memory(memory):
+    """
+    Persist history. Entries assigned on a MemoryStore are already written,
+    so this only applies retention; a plain dict is upserted entry by entry.
+    """
+    if isinstance(memory, MemoryStore):
+        memory.prune()
+        return
+
+    store = MemoryStore()
+    for fingerprint, entry in memory.items():
+        store[fingerprint] = entry
+    store.prune()
 
 
 def load_memory():
-    if MEMORY_PATH.exists():
-        return json.loads(MEMORY_PATH.read_text())
-    return {}
+    """
+    The SQLite history. A legacy memory/agent_memory.json is not imported:
+    its keys come from the old fingerprint scheme, which no current
+    dataset can match, so that history is discarded.
+    """
+    return MemoryStore()
@@ -0,0 +1,246 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from agents.chunked_eda import generate_eda_chunked
+from agents.cleaning import clean_data
+from agents.column_stats import compute_column_stats
+from agents.eda import generate_eda, target_eda
+from agents.feature_engineering import engineer_features
+from agents.feature_importance import feature_importance
+from agents.ingestion import iter_csv_chunks, load_data
+from agents.insights import generate_insights
+from agents.memory import DatasetFingerprint
+from agents.narrative_builder import build_report_context
+from agents.profiling import profile_dataset
+from agents.visualization import auto_visualize
+from utils.instrumentation import RunTrace
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One pipeline step. `inputs` name upstream stages (or pipeline sources),
+    `params` name the run parameters the step itself reads.
+    """
+    name: str
+    func: Callable
+    inputs: tuple = ()
+    params: tuple = ()
+
+
+class Pipeline:
+    """
+    Memoized stage graph for one dataset.
+
+    Results are keyed on the source key (content hash of the upload) plus the
+    values of every parameter a stage depends on, directly or through its
+    inputs. Only stages whose key changed are recomputed; everything else is
+    served from `cache`, which the caller keeps across reruns
+    (e.g. st.session_state). Every stage call (or cache hit) is recorded
+    in `trace`.
+    """
+
+    def __init__(self, stages, source_key: str, sources: dict, cache: dict, trace: RunTrace | None = None):
+        self.stages = {s.name: s for s in stages}
+        self.source_key = source_key
+        self.sources = sources
+        self.cache = cache
+        self.trace = trace if trace is not None else RunTrace()
+        self.computed = []
+
+        # Results for a different dataset are never reused
+        for key in [k for k in cache if k[0] != source_key]:
+            del cache[key]
+
+    def _param_deps(self, name: str) -> set:
+        if name in self.sources:
+            return set()
+        stage = self.stages[name]
+        deps = set(stage.params)
+        for inp in stage.inputs:
+            deps |= self._param_deps(inp)
+        return deps
+
+    def key(self, name: str, params: dict) -> tuple:
+        deps = sorted(self._param_deps(name))
+        return (self.source_key, name, tuple((p, params.get(p)) for p in deps))
+
+    def get(self, name: str, **params):
+        if name in self.sources:
+            return self.sources[name]
+
+        key = self.key(name, params)
+        if key in self.cache:
+            self.trace.cached(name, self.cache[key])
+            return self.cache[key]
+
+        stage = self.stages[name]
+        kwargs = {inp: self.get(inp, **params) for inp in stage.inputs}
+        kwargs.update({p: params.get(p) for p in stage.params})
+
+        # Inputs are resolved first, so spans never overlap
+        with self.trace.span(name, inputs=kwargs) as span:
+            result = stage.func(**kwargs)
+            span["output"] = result
+        self.cache[key] = result
+        self.computed.append(name)
+        return result
+
+    def invalidate(self, name: str, **params):
+        """
+        Forget one stage result (e.g. a failed LLM call) so the next get() retries.
+        """
+        self.cache.pop(self.key(name, params), None)
+
+
+# ----------------------------- Analysis stages -----------------------------
+
+def _load(file, content_key, streaming, progress, dataset_cache):
+    # The fingerprint is hashed while the data streams in, not in a second pass
+    fingerprint = DatasetFingerprint()
+    # Plain reads come back as int64 / float64 / object: load_data shrinks
+    # the frame before caching it, so no cache ever holds the uncompacted one
+    memory_report = {}
+    df = load_data(
+        file,
+        streaming=streaming,
+        progress=progress,
+        use_cache=dataset_cache,
+        fingerprint=fingerprint,
+        content_key=content_key,
+        memory_report=memory_report,
+    )
+    return df, fingerprint.hexdigest(), memory_report
+
+
+def _df(loaded):
+    return loaded[0]
+
+
+def _fingerprint(loaded):
+    return loaded[1]
+
+
+def _memory_report(loaded):
+    return loaded[2]
+
+
+def _raw_stats(df):
+    return compute_column_stats(df)
+
+
+def _cleaning(df, raw_stats):
+    return clean_data(df, stats=raw_stats)
+
+
+def _profile(df, raw_stats):
+    return profile_dataset(df, stats=raw_stats)
+
+
+def _clean_stats(cleaning):
+    return compute_column_stats(cleaning[0])
+
+
+def _chunked_eda(file, progress):
+    # Out-of-core: summaries only, the frame is never materialized
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return generate_eda_chunked(iter_csv_chunks(file, progress=progress))
+
+
+def _eda(cleaning, clean_stats):
+    return generate_eda(cleaning[0], stats=clean_stats)
+
+
+def _features(cleaning, profile, clean_stats):
+    return engineer_features(cleaning[0], profile=profile, stats=clean_stats)
+
+
+def _target_eda(cleaning, target):
+    return target_eda(cleaning[0], target) if target else []
+
+
+def _feature_importance(features, target):
+    return feature_importance(features[0], target) if target else []
+
+
+def _report_context(eda, cleaning, features):
+    # The LLM brief does not use the target, so the narrative stays cached
+    # when only the target changes.
+    eda_report, eda_tables = eda
+    _, cleaning_stats, cleaning_text = cleaning
+    return build_report_context(
+        eda=eda_report,
+        eda_tables=eda_tables,
+        cleaning_stats=cleaning_stats,
+        cleaning_text=cleaning_text,
+        feature_report=features[1],
+    )
+
+
+def _insights(eda, cleaning):
+    return generate_insights(eda[0], cleaning[1])
+
+
+def _narration(report_context, cleaning, features):
+    # Imported lazily: the narrator builds its API client at import time
+    from agents.llm_narrator import start_narration
+
+    # Returns immediately; the job keeps running across reruns
+    return start_narration(report_context, cleaning[1], features[1])
+
+
+def _plots(cleaning, clean_stats):
+    # PNG bytes rendered in worker processes: nothing stays on the script thread
+    return auto_visualize(cleaning[0], stats=clean_stats, output="png")
+
+
+ANALYSIS_STAGES = [
+    Stage("loaded", _load, inputs=("file", "content_key", "streaming", "progress", "dataset_cache")),
+    Stage("df", _df, inputs=("loaded",)),
+    Stage("fingerprint", _fingerprint, inputs=("loaded",)),
+    Stage("memory_report", _memory_report, inputs=("loaded",)),
+    Stage("raw_stats", _raw_stats, inputs=("df",)),
+    Stage("cleaning", _cleaning, inputs=("df", "raw_stats")),
+    Stage("profile", _profile, inputs=("df", "raw_stats")),
+    Stage("clean_stats", _clean_stats, inputs=("cleaning",)),
+    Stage("eda", _eda, inputs=("cleaning", "clean_stats")),
+    Stage("chunked_eda", _chunked_eda, inputs=("file", "progress")),
+    Stage("features", _features, inputs=("cleaning", "profile", "clean_stats")),
+    Stage("target_eda", _target_eda, inputs=("cleaning",), params=("target",)),
+    Stage("feature_importance", _feature_importance, inputs=("features",), params=("target",)),
+    Stage("report_context", _report_context, inputs=("eda", "cleaning", "features")),
+    Stage("insights", _insights, inputs=("eda", "cleaning")),
+    Stage("narration", _narration, inputs=("report_context", "cleaning", "features")),
+    Stage("plots", _plots, inputs=("cleaning", "clean_stats")),
+]
+
+
+def analysis_pipeline(
+    file,
+    source_key: str,
+    cache: dict,
+    streaming: bool = False,
+    progress=None,
+    trace=None,
+    content_key: str | None = None,
+    dataset_cache: bool = True,
+):
+    """
+    Analysis stages for one dataset. Pass `content_key` when `source_key`
+    already is the file's content_hash, so loading does not hash it again.
+    `dataset_cache=False` loads without the on-disk Arrow dataset cache.
+    """
+    return Pipeline(
+        ANALYSIS_STAGES,
+        source_key=source_key,
+        sources={
+            "file": file,
+            "content_key": content_key,
+            "streaming": streaming,
+            "progress": progress,
+            "dataset_cache": dataset_cache,
+        },
+        cache=cache,
+        trace=trace,
+    )
@@ -1,7 +1,15 @@
 import pandas as pd
 
-def profile_dataset(df: pd.DataFrame):
-    df = df.copy()
+from agents.cardinality import distinct_count
+from agents.column_stats import compute_column_stats
+from agents.datetime_detection import detect_datetime_formats
+from agents.dtype_optimizer import categorical_columns
+
+
+def profile_dataset(df: pd.DataFrame, stats: dict | None = None):
+    if stats is None:
+        stats = compute_column_stats(df)
+    col_stats = stats["columns"]
 
     profile = {
         "n_rows": df.shape[0],
@@ -12,40 +20,40 @@ def profile_dataset(df: pd.DataFrame):
         "id_like_cols": [],
         "constant_cols": [],
         "high_null_cols": [],
-        "recommended_drop_cols": []
+        "recommended_drop_cols": [],
+        "datetime_formats": {}
     }
 
-    # Identify datetimes
+    # Identify datetimes (sampled format inference, shared with feature engineering)
+    profile["datetime_formats"] = detect_datetime_formats(df)
     for col in df.columns:
-        if df[col].dtype == "object":
-            try:
-                parsed = pd.to_datetime(df[col], errors="raise")
-                # datetime if at least 70% values parse
-                if parsed.notna().mean() > 0.7:
-                    profile["datetime_cols"].append(col)
-            except Exception:
-                pass
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            # already parsed during ingestion
+            profile["datetime_cols"].append(col)
+        elif col in profile["datetime_formats"]:
+            # datetime if at least 70% values are present
+            if col_stats.loc[col, "null_ratio"] < 0.3:
+                profile["datetime_cols"].append(col)
 
     numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    cat_cols = df.select_dtypes(include="object").columns.tolist()
+    cat_cols = categorical_columns(df)
 
     profile["numeric_cols"] = [c for c in numeric_cols if c not in profile["datetime_cols"]]
     profile["categorical_cols"] = [c for c in cat_cols if c not in profile["datetime_cols"]]
 
     # Identify constant columns
     for col in df.columns:
-        if df[col].nunique(dropna=False) <= 1:
+        has_null = col_stats.loc[col, "null_count"] > 0
+        if distinct_count(stats, col, near=(1,)) + has_null <= 1:
             profile["constant_cols"].append(col)
 
     # High null columns (>40% missing)
-    for col in df.columns:
-        null_ratio = df[col].isna().mean()
-        if null_ratio > 0.40:
-            profile["high_null_cols"].append(col)
+    profile["high_null_cols"] = col_stats.index[col_stats["null_ratio"] > 0.40].tolist()
 
     # ID-like columns (unique ratio > 0.9)
+    id_threshold = 0.90 * max(1, len(df))
     for col in df.columns:
-        if df[col].nunique(dropna=True) / max(1, len(df)) > 0.90:
+        if distinct_count(stats, col, near=(id_threshold,)) > id_threshold:
             profile["id_like_cols"].append(col)
 
     # Recommended columns to drop
@@ -1,4 +1,8 @@
+import io
 import os
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
@@ -12,12 +16,16 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle
 
+from utils.config import PDF_CACHE_MAX_ENTRIES
+from utils.hashing import content_digest
+
 
 def _clean_table_headers(df: pd.DataFrame) -> pd.DataFrame:
     """
     Fixes empty/None column names and unnamed index issues before PDF export.
     """
-    df = df.copy()
+    # Index name and labels change on a shallow copy, never on the caller's table
+    df = df.copy(deep=False)
 
     # Make index name safe before reset
     if df.index.name is None:
@@ -62,17 +70,22 @@ def _render_markdown_like_text(text: str, styles):
     return story
 
 
-def _save_figures(figures, output_dir="reports/charts"):
-    os.makedirs(output_dir, exist_ok=True)
-    paths = []
+def _chart_buffers(charts, dpi=150):
+    """
+    PNG buffers for ReportLab, straight from memory: PNG bytes are used
+    as-is, Figures are rasterized into a BytesIO and closed.
+    """
+    buffers = []
 
-    for i, fig in enumerate(figures):
-        path = f"{output_dir}/chart_{i}.png"
-        fig.savefig(path, dpi=150, bbox_inches="tight")
-        plt.close(fig)
-        paths.append(path)
+    for chart in charts:
+        if not isinstance(chart, bytes):
+            buf = io.BytesIO()
+            chart.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+            plt.close(chart)
+            chart = buf.getvalue()
+        buffers.append(io.BytesIO(chart))
 
-    return paths
+    return buffers
 
 
 from reportlab.platypus import Table, TableStyle
@@ -84,11 +97,7 @@ def _df_to_reportlab_table(df, max_rows=25, font_size=8, page_width=None):
     Convert DataFrame to ReportLab Table fitted inside page margins.
     """
 
-    df = df.copy()
-    df.reset_index(drop=True, inplace=True)
-
-    if len(df) > max_rows:
-        df = df.head(max_rows)
+    df = df.head(max_rows).reset_index(drop=True)
 
     df = df.fillna("").astype(str)
 
@@ -132,12 +141,24 @@ def generate_pdf(
     assumptions=None,
     charts=None,
     eda_tables=None,
-    output_path="reports/EDA_Report.pdf"
+    output_path=None,
+    progress=None
 ):
-    os.makedirs("reports", exist_ok=True)
+    """
+    Build the EDA report in memory and return the PDF bytes (ready for
+    st.download_button). Nothing touches disk unless `output_path` is
+    given, in which case the PDF is also written there and the path returned.
+    `progress(fraction, message)` is called as sections are assembled and
+    pages laid out.
+    """
+    def _report(fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+    buffer = io.BytesIO()
 
     doc = SimpleDocTemplate(
-        output_path,
+        buffer,
         pagesize=A4,
         rightMargin=40,
         leftMargin=40,
@@ -168,6 +189,7 @@ def generate_pdf(
         story.append(Spacer(1, 0.25 * inch))
 
     # ---------------- EDA TABLES ----------------
+    _report(0.1, "Building tables")
     if eda_tables:
         story.append(Paragraph("<b>Data Summary and Descriptive Statistics</b>", styles["Heading2"]))
         story.append(Spacer(1, 0.15 * inch))
@@ -229,14 +251,13 @@ def generate_pdf(
 
 
     # ---------------- VISUALS ----------------
+    _report(0.3, "Adding charts")
     if charts:
         story.append(Paragraph("<b>Visual Analysis</b>", styles["Heading2"]))
         story.append(Spacer(1, 0.15 * inch))
 
-        chart_paths = _save_figures(charts)
-
-        for path in chart_paths:
-            story.append(Image(path, width=5.5 * inch, height=3.5 * inch))
+        for image in _chart_buffers(charts):
+            story.append(Image(image, width=5.5 * inch, height=3.5 * inch))
             story.append(Spacer(1, 0.25 * inch))
 
     # ---------------- AI REPORT TEXT ----------------
@@ -248,5 +269,105 @@ def generate_pdf(
         story.extend(_render_markdown_like_text(llm_text, styles))
 
 
-    doc.build(story)
-    return output_path
+    def _on_page(canvas, _doc):
+        _report(0.5, f"Laying out page {canvas.getPageNumber()}")
+
+    doc.build(story, onFirstPage=_on_page, onLaterPages=_on_page)
+    pdf = buffer.getvalue()
+    _report(1.0, "Done")
+
+    if output_path is not None:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(pdf)
+        return output_path
+    return pdf
+
+
+# ----------------------------- Background export -----------------------------
+
+_PDF_CACHE = OrderedDict()
+_PDF_CACHE_LOCK = threading.Lock()
+
+
+def clear_pdf_cache():
+    with _PDF_CACHE_LOCK:
+        _PDF_CACHE.clear()
+
+
+def pdf_key(insights, llm_text, assumptions=None, charts=None, eda_tables=None) -> str | None:
+    """
+    Digest of everything that ends up in the report, charts hashed as PNG
+    bytes. None (not cacheable) when a chart is a Figure: Figures cannot
+    be compared cheaply, and ids are reused once they are collected.
+    """
+    charts = list(charts or [])
+    if not all(isinstance(c, bytes) for c in charts):
+        return None
+    return content_digest(insights, llm_text, assumptions, charts, eda_tables)
+
+
+class PdfJob:
+    """
+    Builds the PDF on a background thread. `progress` / `message` follow
+    the build; `wait()` returns the PDF bytes. A job for a report that was
+    already built finishes immediately from the in-process PDF cache
+    (reports with Figure charts are always rebuilt).
+    """
+
+    def __init__(self, key, **report):
+        self.key = key
+        self.progress = 0.0
+        self.message = "Queued"
+        self.error = None
+        self._result = None
+        self._thread = threading.Thread(target=self._run, args=(report,), daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def _on_progress(self, fraction, message):
+        self.progress = fraction
+        self.message = message
+
+    def _run(self, report):
+        with _PDF_CACHE_LOCK:
+            cached = _PDF_CACHE.get(self.key) if self.key is not None else None
+            if cached is not None:
+                _PDF_CACHE.move_to_end(self.key)
+        if cached is not None:
+            self._result = cached
+            self._on_progress(1.0, "Done (cached)")
+            return
+
+        try:
+            pdf = generate_pdf(**report, progress=self._on_progress)
+        except Exception as e:
+            self.error = e
+            return
+
+        if self.key is not None:
+            with _PDF_CACHE_LOCK:
+                _PDF_CACHE[self.key] = pdf
+                while len(_PDF_CACHE) > PDF_CACHE_MAX_ENTRIES:
+                    _PDF_CACHE.popitem(last=False)
+        self._result = pdf
+
+    def wait(self, timeout=None) -> bytes:
+        self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self._result
+
+
+def start_pdf_export(insights, llm_text, assumptions=None, charts=None, eda_tables=None) -> PdfJob:
+    report = {
+        "insights": insights,
+        "llm_text": llm_text,
+        "assumptions": assumptions,
+        "charts": charts,
+        "eda_tables": eda_tables,
+    }
+    return PdfJob(pdf_key(**report), **report)
@@ -1,15 +1,54 @@
-import matplotlib.pyplot as plt
+import atexit
+import io
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import seaborn as sns
 import numpy as np
 import pandas as pd
 import textwrap
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+
+from agents.cardinality import distinct_count
+from agents.column_stats import compute_column_stats
+from agents.correlation import correlation_pairs, shared_correlation_matrix, top_k_pairs
+from agents.dtype_optimizer import categorical_columns
+from utils.config import (
+    CHART_CACHE_MAX_BYTES,
+    CHART_DPI,
+    CHART_RENDER_WORKERS,
+    CORR_DENSE_MAX_COLS,
+    PLOT_AGGREGATE_MIN_ROWS,
+    PLOT_DENSITY_BINS,
+    PLOT_KDE_GRID,
+    PLOT_KDE_SAMPLE,
+    PLOT_MAX_BINS,
+)
+from utils.hashing import content_digest
 
 FIG_SIZE = (5, 3.5)
+_FIG_SIZES = {"heatmap": (5.5, 4), "box": (5, 3.8), "box_stats": (5, 3.8)}
 
 
 # ----------------------------- Helpers -----------------------------
 
-def _has_outliers(series: pd.Series) -> bool:
+def _has_outliers(series: pd.Series, col_stats: pd.Series | None = None) -> bool:
+    """
+    Any value beyond 1.5·IQR. With the column's precomputed stats row
+    (quartiles, min, max) no pass over the data is needed.
+    """
+    if col_stats is not None:
+        q1, q3, lo, hi = (col_stats[k] for k in ("25%", "75%", "min", "max"))
+        if pd.isna(q1):
+            return False
+        iqr = q3 - q1
+        return bool(iqr != 0 and (lo < q1 - 1.5 * iqr or hi > q3 + 1.5 * iqr))
+
     series = series.dropna()
     if series.empty:
         return False
@@ -26,10 +65,9 @@ def _has_outliers(series: pd.Series) -> bool:
 
 def _winsorize_series(series: pd.Series, lower_q=0.01, upper_q=0.99):
     """Cap extreme values just for visualization (not for model)."""
-    s = series.copy()
-    lo = s.quantile(lower_q)
-    hi = s.quantile(upper_q)
-    return s.clip(lower=lo, upper=hi)
+    lo = series.quantile(lower_q)
+    hi = series.quantile(upper_q)
+    return series.clip(lower=lo, upper=hi)
 
 
 def _shorten_labels(values, max_len=12):
@@ -46,34 +84,50 @@ def _shorten_labels(values, max_len=12):
     return out
 
 
-def _group_rare_categories(df: pd.DataFrame, col: str, top_n=8):
+def _group_rare_categories(df: pd.DataFrame, col: str, top_n=8, counts=None):
     """
     Keep only top_n categories by frequency, rest -> 'Other'
     This avoids axis clutter.
     """
-    df = df.copy()
-    counts = df[col].value_counts(dropna=False)
+    # Only `col` is replaced: the other columns stay shared with the input
+    df = df.copy(deep=False)
+    if counts is None:
+        counts = df[col].value_counts(dropna=False)
     keep = counts.head(top_n).index
-    df[col] = df[col].where(df[col].isin(keep), "Other")
+    values = df[col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Categories are fixed: make room for "Other" and drop the merged ones
+        if "Other" not in values.cat.categories:
+            values = values.cat.add_categories(["Other"])
+        df[col] = values.where(values.isin(keep), "Other").cat.remove_unused_categories()
+    else:
+        df[col] = values.where(values.isin(keep), "Other")
     return df
 
 
-def _pick_top_numeric(df: pd.DataFrame, k: int = 3):
+def _pick_top_numeric(df: pd.DataFrame, k: int = 3, stats: dict | None = None):
     numeric_cols = df.select_dtypes(include="number").columns.tolist()
     if not numeric_cols:
         return []
-    variances = df[numeric_cols].var().sort_values(ascending=False)
-    return variances.head(k).index.tolist()
+    if stats is None:
+        variances = df[numeric_cols].var()
+    else:
+        variances = stats["columns"].loc[numeric_cols, "var"].astype("float64")
+    return variances.sort_values(ascending=False).head(k).index.tolist()
 
 
-def _pick_top_categorical(df: pd.DataFrame, k: int = 2):
-    cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+def _pick_top_categorical(df: pd.DataFrame, k: int = 2, stats: dict | None = None):
+    cat_cols = categorical_columns(df)
+    if stats is None:
+        n_unique = {c: df[c].nunique() for c in cat_cols}
+    else:
+        n_unique = {c: distinct_count(stats, c, near=(2, 25)) for c in cat_cols}
 
     # remove crazy cardinality categoricals
-    cat_cols = [c for c in cat_cols if 2 <= df[c].nunique() <= 25]
+    cat_cols = [c for c in cat_cols if 2 <= n_unique[c] <= 25]
 
     # prioritize medium-cardinality (most informative)
-    cat_cols = sorted(cat_cols, key=lambda c: df[c].nunique(), reverse=True)
+    cat_cols = sorted(cat_cols, key=lambda c: n_unique[c], reverse=True)
     return cat_cols[:k]
 
 
@@ -82,85 +136,214 @@ def _pick_top_corr_pair(df: pd.DataFrame):
     if len(numeric_cols) < 2:
         return None
 
-    corr = df[numeric_cols].corr().abs()
-    np.fill_diagonal(corr.values, 0)
-    pair = np.unravel_index(np.argmax(corr.values), corr.shape)
-    col1 = corr.columns[pair[0]]
-    col2 = corr.columns[pair[1]]
+    if len(numeric_cols) <= CORR_DENSE_MAX_COLS:
+        top = top_k_pairs(shared_correlation_matrix(df, numeric_cols), k=1)
+    else:
+        top = correlation_pairs(df, numeric_cols, k=1)
+    if top.empty:
+        return None
+    col1, col2, r = top.iloc[0]
 
     # if correlation is meaningless, skip
-    if corr.loc[col1, col2] < 0.25:
+    if abs(r) < 0.25:
         return None
 
     return col1, col2
 
 
-# ----------------------------- Main -----------------------------
+# ----------------------------- Large-data aggregation -----------------------------
+# Above PLOT_AGGREGATE_MIN_ROWS, specs carry pre-aggregated arrays instead of
+# raw columns: rendering cost and PNG size no longer grow with the row count.
+
+def _sample(values: np.ndarray, n: int, seed: int = 0) -> np.ndarray:
+    if len(values) <= n:
+        return values
+    rng = np.random.default_rng(seed)
+    return values[rng.choice(len(values), size=n, replace=False)]
+
+
+def _binned_histogram(values: np.ndarray):
+    """
+    Counts on bin edges chosen from a sample (numpy "auto" rule), plus a
+    Gaussian KDE evaluated on a fixed grid from the same sample and scaled
+    to counts, as histplot(kde=True) draws it.
+    """
+    sample = _sample(values, PLOT_KDE_SAMPLE)
+    # Bin count from the sample, equal-width bins over the full range
+    n_bins = min(PLOT_MAX_BINS, len(np.histogram_bin_edges(sample, bins="auto")) - 1)
+    counts, edges = np.histogram(values, bins=max(1, n_bins), range=(values.min(), values.max()))
+
+    grid = np.linspace(edges[0], edges[-1], PLOT_KDE_GRID)
+    density = np.zeros_like(grid)
+    std = sample.std(ddof=1) if len(sample) > 1 else 0.0
+    if std > 0:
+        # Scott's rule, as in scipy.stats.gaussian_kde / seaborn
+        bw = std * len(sample) ** (-1 / 5)
+        for chunk in np.array_split(sample, max(1, len(sample) // 1000)):
+            density += np.exp(-0.5 * ((grid[:, None] - chunk[None, :]) / bw) ** 2).sum(axis=1)
+        density /= len(sample) * bw * np.sqrt(2 * np.pi)
+
+    bin_width = (edges[-1] - edges[0]) / max(1, len(counts))
+    return counts, edges, grid, density * len(values) * bin_width
+
+
+def _bin_index(values: np.ndarray, bins: int):
+    lo, hi = values.min(), values.max()
+    if hi <= lo:
+        hi = lo + 1.0
+    idx = ((values - lo) * (bins / (hi - lo))).astype(np.intp)
+    # the maximum belongs to the last bin, as in np.histogram
+    np.minimum(idx, bins - 1, out=idx)
+    return idx, np.linspace(lo, hi, bins + 1)
+
+
+def _density_2d(x: np.ndarray, y: np.ndarray, bins: int = PLOT_DENSITY_BINS):
+    """
+    2D histogram on a regular grid via integer binning + bincount
+    (a single pass, cheaper than np.histogram2d's searchsorted).
+    """
+    mask = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[mask], y[mask]
+    if not len(x):
+        return np.zeros((bins, bins)), np.linspace(0, 1, bins + 1), np.linspace(0, 1, bins + 1)
+    ix, x_edges = _bin_index(x, bins)
+    iy, y_edges = _bin_index(y, bins)
+    counts = np.bincount(iy * bins + ix, minlength=bins * bins).reshape(bins, bins)
+    return counts, x_edges, y_edges
+
 
-def auto_visualize(df, profile=None):
-    plots = []
-    df = df.copy()
+def _box_stats(cat: pd.Series, values: pd.Series) -> list:
+    """
+    Per-category box statistics for Axes.bxp: quartiles and 1.5·IQR
+    whiskers clipped to the data, in order of first appearance.
+    """
+    y = values.to_numpy(dtype="float64", na_value=np.nan)
+    codes, labels = pd.factorize(cat, sort=False)
+    keep = (codes >= 0) & ~np.isnan(y)
+    codes, y = codes[keep], y[keep]
+
+    # Group rows by category once (integer sort), then slice per group
+    order = np.argsort(codes, kind="stable")
+    y = y[order]
+    bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+
+    stats = []
+    for i, label in enumerate(labels):
+        group = y[bounds[i]:bounds[i + 1]]
+        if not len(group):
+            continue
+        q1, med, q3 = np.quantile(group, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = group[(group >= q1 - 1.5 * iqr) & (group <= q3 + 1.5 * iqr)]
+        stats.append({
+            "label": str(label),
+            "q1": q1,
+            "med": med,
+            "q3": q3,
+            "whislo": inside.min(),
+            "whishi": inside.max(),
+            "fliers": [],
+        })
+    return stats
+
+
+# ----------------------------- Specs -----------------------------
+# A chart spec is a plain dict holding only the data that chart needs, so it
+# can be pickled to a worker process and rendered independently.
+
+def build_chart_specs(df, profile=None, stats=None):
+    specs = []
 
     numeric_cols = df.select_dtypes(include="number").columns.tolist()
     if len(numeric_cols) == 0:
-        return plots
+        return specs
+
+    if stats is None:
+        stats = compute_column_stats(df)
+
+    aggregate = len(df) >= PLOT_AGGREGATE_MIN_ROWS
 
     # -------- 1) Numeric Distributions (Top 2 by variance) --------
-    top_num = _pick_top_numeric(df, k=2)
+    top_num = _pick_top_numeric(df, k=2, stats=stats)
 
     for col in top_num:
-        fig, ax = plt.subplots(figsize=FIG_SIZE)
-        sns.histplot(df[col].dropna(), kde=True, ax=ax)
-        ax.set_title(f"Distribution: {col}")
-        ax.grid(alpha=0.2)
-        plt.tight_layout()
-        plots.append(fig)
+        values = df[col].dropna()
+        if aggregate and len(values):
+            counts, edges, grid, kde = _binned_histogram(values.to_numpy(dtype="float64"))
+            specs.append({
+                "kind": "hist_binned",
+                "title": f"Distribution: {col}",
+                "xlabel": col,
+                "counts": counts,
+                "edges": edges,
+                "kde_x": grid,
+                "kde_y": kde,
+            })
+        else:
+            specs.append({
+                "kind": "hist",
+                "title": f"Distribution: {col}",
+                "values": values,
+            })
 
     # -------- 2) Correlation heatmap (Top 10 numeric max) --------
     if len(numeric_cols) >= 2:
         # limit heatmap size (else unreadable)
         heat_cols = numeric_cols[:10]
-        fig, ax = plt.subplots(figsize=(5.5, 4))
-        corr = df[heat_cols].corr()
-        sns.heatmap(corr, annot=False, cmap="coolwarm", ax=ax)
-        ax.set_title("Correlation Heatmap (Top Numeric Features)")
-        plt.tight_layout()
-        plots.append(fig)
+        specs.append({
+            "kind": "heatmap",
+            "title": "Correlation Heatmap (Top Numeric Features)",
+            "corr": shared_correlation_matrix(df, heat_cols),
+        })
 
     # -------- 3) Scatter plot (Top correlated pair) --------
     pair = _pick_top_corr_pair(df)
     if pair:
         x_col, y_col = pair
-        fig, ax = plt.subplots(figsize=FIG_SIZE)
-        sns.scatterplot(x=df[x_col], y=df[y_col], alpha=0.6, ax=ax)
-        ax.set_title(f"Relationship: {x_col} vs {y_col}")
-        ax.grid(alpha=0.2)
-        plt.tight_layout()
-        plots.append(fig)
+        if aggregate:
+            # Density instead of millions of overplotted points
+            counts, x_edges, y_edges = _density_2d(
+                df[x_col].to_numpy(dtype="float64", na_value=np.nan),
+                df[y_col].to_numpy(dtype="float64", na_value=np.nan),
+            )
+            specs.append({
+                "kind": "density",
+                "title": f"Relationship: {x_col} vs {y_col}",
+                "xlabel": x_col,
+                "ylabel": y_col,
+                "counts": counts,
+                "x_edges": x_edges,
+                "y_edges": y_edges,
+            })
+        else:
+            specs.append({
+                "kind": "scatter",
+                "title": f"Relationship: {x_col} vs {y_col}",
+                "x": df[x_col],
+                "y": df[y_col],
+            })
 
     # -------- 4) Categorical vs Numeric (Smart readability) --------
-    top_cat = _pick_top_categorical(df, k=2)
+    top_cat = _pick_top_categorical(df, k=2, stats=stats)
 
     if top_cat and top_num:
         comparisons = 0
 
         for cat in top_cat:
             # Reduce clutter
-            df_plot = _group_rare_categories(df, cat, top_n=8)
+            df_plot = _group_rare_categories(df[[cat] + top_num], cat, top_n=8, counts=stats["top_values"].get(cat))
 
             # decide orientation based on max label length
-            label_lengths = df_plot[cat].astype(str).map(len)
+            label_lengths = pd.Series(df_plot[cat].unique()).astype(str).map(len)
             long_labels = label_lengths.max() > 12
 
             for num in top_num:
                 if comparisons >= 2:
                     break
 
-                fig, ax = plt.subplots(figsize=(5, 3.8))
-
                 # make values visible
                 y_series = df_plot[num]
-                if _has_outliers(y_series):
+                if _has_outliers(y_series, stats["columns"].loc[num]):
                     # hide fliers + winsorize for visibility
                     y_plot = _winsorize_series(y_series)
                     plot_title_suffix = " (Outliers handled)"
@@ -168,30 +351,213 @@ def auto_visualize(df, profile=None):
                     y_plot = y_series
                     plot_title_suffix = ""
 
-                tmp = df_plot.copy()
-                tmp[num] = y_plot
-
-                # chart type decision
-                if long_labels:
-                    # Horizontal = readable
-                    sns.boxplot(y=tmp[cat], x=tmp[num], showfliers=False, ax=ax)
-                    ax.set_title(f"{num} by {cat}{plot_title_suffix}")
-                    ax.set_xlabel(num)
-                    ax.set_ylabel(cat)
+                spec = {
+                    "title": f"{num} by {cat}{plot_title_suffix}",
+                    "cat": cat,
+                    "num": num,
+                    "horizontal": long_labels,
+                }
+                if aggregate:
+                    spec.update(kind="box_stats", stats=_box_stats(df_plot[cat], y_plot))
                 else:
-                    # Vertical plot with rotated labels
-                    sns.boxplot(x=tmp[cat], y=tmp[num], showfliers=False, ax=ax)
-                    ax.set_title(f"{num} by {cat}{plot_title_suffix}")
-                    ax.set_xlabel(cat)
-                    ax.set_ylabel(num)
-
-                    # rotate + shorten tick labels
-                    tick_labels = _shorten_labels(ax.get_xticklabels(), max_len=12)
-                    ax.set_xticklabels(tick_labels, rotation=30, ha="right")
-
-                ax.grid(alpha=0.15)
-                plt.tight_layout()
-                plots.append(fig)
+                    spec.update(kind="box", data=pd.DataFrame({cat: df_plot[cat], num: y_plot}, copy=False))
+                specs.append(spec)
                 comparisons += 1
 
-    return plots
+    return specs
+
+
+# ----------------------------- Rendering -----------------------------
+
+def render_chart(spec) -> Figure:
+    """
+    Draw one spec on a standalone Figure. No pyplot state is involved, so
+    figures are freed with their last reference and rendering is safe off
+    the main thread.
+    """
+    kind = spec["kind"]
+    fig = Figure(figsize=_FIG_SIZES.get(kind, FIG_SIZE))
+    ax = fig.subplots()
+
+    if kind == "hist":
+        sns.histplot(spec["values"], kde=True, ax=ax)
+        ax.grid(alpha=0.2)
+
+    elif kind == "hist_binned":
+        color = sns.color_palette()[0]
+        ax.stairs(spec["counts"], spec["edges"], fill=True, color=color, alpha=0.5)
+        ax.stairs(spec["counts"], spec["edges"], color="white", linewidth=0.5)
+        ax.plot(spec["kde_x"], spec["kde_y"], color=color)
+        ax.set_xlabel(spec["xlabel"])
+        ax.set_ylabel("Count")
+        ax.grid(alpha=0.2)
+
+    elif kind == "heatmap":
+        sns.heatmap(spec["corr"], annot=False, cmap="coolwarm", ax=ax)
+
+    elif kind == "scatter":
+        sns.scatterplot(x=spec["x"], y=spec["y"], alpha=0.6, ax=ax)
+        ax.grid(alpha=0.2)
+
+    elif kind == "density":
+        counts = np.ma.masked_equal(spec["counts"], 0)
+        mesh = ax.pcolormesh(spec["x_edges"], spec["y_edges"], counts, cmap="viridis", norm=LogNorm())
+        fig.colorbar(mesh, ax=ax, label="rows")
+        ax.set_xlabel(spec["xlabel"])
+        ax.set_ylabel(spec["ylabel"])
+        ax.grid(alpha=0.2)
+
+    elif kind == "box_stats":
+        stats, cat, num = spec["stats"], spec["cat"], spec["num"]
+        box_style = {"facecolor": sns.color_palette()[0]}
+        if spec["horizontal"]:
+            ax.bxp(stats, showfliers=False, orientation="horizontal", patch_artist=True, boxprops=box_style)
+            ax.set_xlabel(num)
+            ax.set_ylabel(cat)
+        else:
+            ax.bxp(stats, showfliers=False, patch_artist=True, boxprops=box_style)
+            ax.set_xlabel(cat)
+            ax.set_ylabel(num)
+            ax.set_xticks(ax.get_xticks())
+            tick_labels = _shorten_labels([s["label"] for s in stats], max_len=12)
+            ax.set_xticklabels(tick_labels, rotation=30, ha="right")
+        ax.grid(alpha=0.15)
+
+    elif kind == "box":
+        data, cat, num = spec["data"], spec["cat"], spec["num"]
+        # chart type decision
+        if spec["horizontal"]:
+            # Horizontal = readable
+            sns.boxplot(y=data[cat], x=data[num], showfliers=False, ax=ax)
+            ax.set_xlabel(num)
+            ax.set_ylabel(cat)
+        else:
+            # Vertical plot with rotated labels
+            sns.boxplot(x=data[cat], y=data[num], showfliers=False, ax=ax)
+            ax.set_xlabel(cat)
+            ax.set_ylabel(num)
+
+            # rotate + shorten tick labels
+            ax.set_xticks(ax.get_xticks())
+            tick_labels = _shorten_labels([t.get_text() for t in ax.get_xticklabels()], max_len=12)
+            ax.set_xticklabels(tick_labels, rotation=30, ha="right")
+        ax.grid(alpha=0.15)
+
+    else:
+        raise ValueError(f"Unknown chart kind: {kind}")
+
+    ax.set_title(spec["title"])
+    fig.tight_layout()
+    return fig
+
+
+def figure_to_png(fig, dpi: int = CHART_DPI) -> bytes:
+    buf = io.BytesIO()
+    FigureCanvasAgg(fig)
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def render_png(spec, dpi: int = CHART_DPI) -> bytes:
+    return figure_to_png(render_chart(spec), dpi=dpi)
+
+
+_POOL = None
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_pool():
+    global _POOL
+    if _POOL is None:
+        # spawn: forking a multi-threaded server process is unsafe
+        _POOL = ProcessPoolExecutor(
+            max_workers=CHART_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        atexit.register(_POOL.shutdown, cancel_futures=True)
+    return _POOL
+
+
+# Rasterized charts keyed by spec + data digest, shared by the UI and the
+# PDF export so nothing already drawn is rendered twice
+_IMAGE_CACHE = OrderedDict()
+_IMAGE_CACHE_LOCK = threading.Lock()
+
+
+def chart_key(spec, dpi: int = CHART_DPI) -> str:
+    return content_digest(spec, dpi)
+
+
+def _cache_images(keys, images):
+    with _IMAGE_CACHE_LOCK:
+        for key, png in zip(keys, images):
+            _IMAGE_CACHE[key] = png
+            _IMAGE_CACHE.move_to_end(key)
+        total = sum(len(png) for png in _IMAGE_CACHE.values())
+        while len(_IMAGE_CACHE) > 1 and total > CHART_CACHE_MAX_BYTES:
+            _, png = _IMAGE_CACHE.popitem(last=False)
+            total -= len(png)
+
+
+def clear_image_cache():
+    with _IMAGE_CACHE_LOCK:
+        _IMAGE_CACHE.clear()
+
+
+def cached_chart(key):
+    with _IMAGE_CACHE_LOCK:
+        png = _IMAGE_CACHE.get(key)
+        if png is not None:
+            _IMAGE_CACHE.move_to_end(key)
+        return png
+
+
+def render_charts(specs, parallel: bool = True, dpi: int = CHART_DPI) -> list:
+    """
+    Render specs to PNG bytes, in a shared process pool when `parallel`
+    (total latency ~ the slowest chart). Falls back to rendering in this
+    process if the pool cannot be used. Charts whose spec and data were
+    rendered before come from the image cache.
+    """
+    global _POOL
+    keys = [chart_key(spec, dpi) for spec in specs]
+    images = [cached_chart(key) for key in keys]
+    missing = [i for i, png in enumerate(images) if png is None]
+    todo = [specs[i] for i in missing]
+
+    rendered = None
+    if parallel and len(todo) > 1:
+        try:
+            rendered = list(_render_pool().map(render_png, todo, [dpi] * len(todo)))
+        except (BrokenProcessPool, OSError, PermissionError):
+            # Stop whatever workers are left before dropping the pool
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+    if rendered is None:
+        rendered = [render_png(spec, dpi=dpi) for spec in todo]
+
+    _cache_images([keys[i] for i in missing], rendered)
+    for i, png in zip(missing, rendered):
+        images[i] = png
+    return images
+
+
+# ----------------------------- Main -----------------------------
+
+def auto_visualize(df, profile=None, stats=None, output: str = "figure"):
+    """
+    Build the chart set for a cleaned frame.
+
+    output="figure" returns matplotlib Figures rendered here;
+    output="png" renders the specs in worker processes and returns PNG bytes.
+    """
+    specs = build_chart_specs(df, profile=profile, stats=stats)
+    if output == "png":
+        return render_charts(specs)
+    return [render_chart(spec) for spec in specs]
@@ -1,33 +1,29 @@
-import streamlit as st
+import time
 
-# ------------------ CORE AGENTS ------------------
-from agents.ingestion import load_data
-from agents.cleaning import clean_data
-from agents.eda import generate_eda, target_eda
-from agents.visualization import auto_visualize
-from agents.insights import generate_insights
+import streamlit as st
 
-# ------------------ ADVANCED AGENTS ------------------
-from agents.feature_engineering import engineer_features
-from agents.feature_importance import feature_importance
+# ------------------ AGENTS ------------------
 from agents.assumptions import eda_assumptions
-from agents.explanations import explain_eda
-from agents.llm_narrator import narrate_insights
-from agents.report import generate_pdf
-from agents.profiling import profile_dataset
-from agents.narrative_builder import build_report_context
-
-
+from agents.report import start_pdf_export
+from agents.pipeline import analysis_pipeline
 
-# ------------------ MEMORY ------------------
+# ------------------ MEMORY / CACHE ------------------
 from agents.memory import (
-    dataset_fingerprint,
+    eda_summary,
     load_memory,
     save_memory
 )
+from agents.dataset_cache import cache_stats, content_hash
 
 # ------------------ EXPORT ------------------
-from utils.notebook_exporter import export_notebook
+from utils.notebook_exporter import export_bundle
+from utils.instrumentation import RunTrace
+from utils.config import (
+    NOTEBOOK_SAMPLE_MIN_ROWS,
+    NOTEBOOK_SAMPLE_ROWS,
+    OUT_OF_CORE_MIN_BYTES,
+    STREAMING_MIN_BYTES,
+)
 
 
 # ------------------ PAGE CONFIG ------------------
@@ -42,6 +38,90 @@ st.caption(
 )
 
 
+# ------------------ EDA SECTION ------------------
+def _render_eda(eda_report, eda_tables):
+    st.subheader("📊 Exploratory Data Analysis")
+
+    # 1) Shape
+    st.markdown("### ✅ Dataset Overview")
+    st.write(f"Rows: **{eda_report['shape'][0]}** | Columns: **{eda_report['shape'][1]}**")
+
+    # 2) Missing table
+    st.markdown("### 🕳️ Missing Values")
+    if not eda_tables["missing_table"].empty:
+        st.dataframe(eda_tables["missing_table"], width="stretch")
+    else:
+        st.success("No missing values found ✅")
+
+    # 3) Dtypes table
+    st.markdown("### 🧾 Column Types & Unique Values")
+    st.dataframe(eda_tables["dtypes_table"], width="stretch")
+
+    # 4) Numeric summary
+    if "numeric_summary_table" in eda_tables:
+        st.markdown("### 📈 Numeric Summary")
+        st.dataframe(eda_tables["numeric_summary_table"], width="stretch")
+
+    # 5) Correlation matrix
+    if "correlation_table" in eda_tables:
+        st.markdown("### 🔗 Correlation Matrix")
+        st.dataframe(eda_tables["correlation_table"], width="stretch")
+
+    # Very wide tables only carry the sparse list of strong pairs
+    if "correlation_pairs_table" in eda_tables:
+        st.markdown("### 🔗 Strong Correlations")
+        st.dataframe(eda_tables["correlation_pairs_table"], width="stretch")
+        if "correlation_columns" in eda_report:
+            covered = eda_report["correlation_columns"]
+            st.caption(f"Correlations cover the first {covered['paired']} of {covered['numeric']} numeric columns.")
+
+    # 6) Top correlations
+    if "top_correlations_table" in eda_tables:
+        st.markdown("### ⭐ Top Correlations")
+        st.dataframe(eda_tables["top_correlations_table"], width="stretch")
+
+    with st.expander("🧩 View raw EDA JSON (optional)", expanded=False):
+        st.json(eda_report)
+
+
+# ------------------ UPLOAD KEY ------------------
+def _upload_key(file) -> str:
+    """
+    Content hash of the upload, computed once per upload: reruns reuse it
+    instead of reading the whole file again.
+    """
+    upload_id = getattr(file, "file_id", None) or (file.name, file.size)
+    known = st.session_state.get("upload_key")
+    if known is None or known[0] != upload_id:
+        known = (upload_id, content_hash(file))
+        st.session_state["upload_key"] = known
+    return known[1]
+
+
+# ------------------ RUN TRACE ------------------
+def _render_trace(pipeline):
+    """
+    Sidebar breakdown of this run. The trace is saved when a pipeline stage
+    was computed (not on reruns served entirely from cache).
+    """
+    trace = pipeline.trace
+    with st.sidebar.expander("⏱️ Run profile", expanded=False):
+        spans = trace.to_frame()
+        if spans.empty:
+            st.caption("Nothing recorded yet.")
+            return
+        computed = spans[~spans["cached"]]
+        st.caption(
+            f"{len(computed)} stages computed in {computed['seconds'].sum():.2f}s, "
+            f"{len(spans) - len(computed)} served from cache"
+        )
+        st.dataframe(spans, width="stretch", hide_index=True)
+        st.caption("Memory columns are process-wide: concurrent sessions are included.")
+
+    if pipeline.computed:
+        trace.save()
+
+
 # ------------------ FILE UPLOAD ------------------
 file = st.file_uploader("📂 Upload CSV file", type=["csv"])
 
@@ -49,12 +129,56 @@ file = st.file_uploader("📂 Upload CSV file", type=["csv"])
 # ================== MAIN PIPELINE ==================
 if file:
 
+    # ---------- PIPELINE (memoized across reruns) ----------
+    # Stages are keyed on the upload's content hash plus the parameters they
+    # depend on, so widget changes only recompute the stages they affect.
+    streaming = file.size >= STREAMING_MIN_BYTES
+    out_of_core = file.size >= OUT_OF_CORE_MIN_BYTES
+    progress_bar = st.progress(0.0, text="Reading dataset…") if streaming else None
+
+    def _on_chunk(rows_read, fraction):
+        progress_bar.progress(fraction or 0.0, text=f"Reading dataset… {rows_read:,} rows")
+
+    upload_key = _upload_key(file)
+    pipeline = analysis_pipeline(
+        file,
+        source_key=upload_key,
+        content_key=upload_key,
+        cache=st.session_state.setdefault("pipeline_cache", {}),
+        streaming=streaming,
+        progress=_on_chunk if streaming else None,
+        trace=RunTrace(meta={"file": file.name, "bytes": file.size}),
+    )
+
+    # ---------- OUT-OF-CORE EDA ----------
+    # Too large to hold in memory: summarize chunk by chunk and stop at EDA
+    if out_of_core:
+        eda_report, eda_tables = pipeline.get("chunked_eda")
+        progress_bar.empty()
+        st.info(
+            "📦 This dataset is too large to load in memory. Showing out-of-core EDA "
+            "(quantiles and very high unique counts are approximate); cleaning, "
+            "features and reports need a smaller extract."
+        )
+        _render_eda(eda_report, eda_tables)
+        _render_trace(pipeline)
+        st.stop()
+
     # ---------- INGESTION ----------
-    df = load_data(file)
+    # Large uploads stream in bounded chunks with compact dtypes
+    df = pipeline.get("df")
+    if progress_bar is not None:
+        progress_bar.empty()
     st.success("✅ Dataset loaded successfully")
 
+    memory_report = pipeline.get("memory_report")
+    st.caption(
+        f"🗜️ In memory: {memory_report['before_mb']:,.1f} MB → {memory_report['after_mb']:,.1f} MB "
+        f"after dtype compaction ({memory_report['saved_pct']:.0f}% smaller)"
+    )
+
     # ---------- MEMORY ----------
-    fingerprint = dataset_fingerprint(df)
+    fingerprint = pipeline.get("fingerprint")
     memory = load_memory()
 
     if fingerprint in memory:
@@ -62,14 +186,21 @@ if file:
     else:
         st.info("🆕 New dataset detected. Starting fresh analysis.")
 
+    cache_info = cache_stats()
+    st.caption(
+        f"💾 Dataset cache: {cache_info['hit_rate']:.0%} hit rate "
+        f"({cache_info['hits']} hits / {cache_info['hits'] + cache_info['misses']} loads, "
+        f"{cache_info['entries']} cached files)"
+    )
+
     # ---------- CLEANING ----------
-    df_cleaned, cleaning_stats, cleaning_text = clean_data(df)
+    df_cleaned, cleaning_stats, cleaning_text = pipeline.get("cleaning")
 
     st.subheader("🧹 Data Cleaning Summary")
     for line in cleaning_text:
         st.write("•", line)
 
-    profile = profile_dataset(df)
+    profile = pipeline.get("profile")
 
     st.subheader("🧠 Column Profiling Summary")
 
@@ -89,46 +220,14 @@ if file:
         target_column = None
 
     # ---------- EDA ----------
-    eda_report, eda_tables = generate_eda(df_cleaned)
+    eda_report, eda_tables = pipeline.get("eda")
 
-    st.subheader("📊 Exploratory Data Analysis")
-
-    # 1) Shape
-    st.markdown("### ✅ Dataset Overview")
-    st.write(f"Rows: **{eda_report['shape'][0]}** | Columns: **{eda_report['shape'][1]}**")
-
-    # 2) Missing table
-    st.markdown("### 🕳️ Missing Values")
-    if not eda_tables["missing_table"].empty:
-        st.dataframe(eda_tables["missing_table"], width="stretch")
-    else:
-        st.success("No missing values found ✅")
-
-    # 3) Dtypes table
-    st.markdown("### 🧾 Column Types & Unique Values")
-    st.dataframe(eda_tables["dtypes_table"], width="stretch")
-
-    # 4) Numeric summary
-    if "numeric_summary_table" in eda_tables:
-        st.markdown("### 📈 Numeric Summary")
-        st.dataframe(eda_tables["numeric_summary_table"], width="stretch")
-
-    # 5) Correlation matrix
-    if "correlation_table" in eda_tables:
-        st.markdown("### 🔗 Correlation Matrix")
-        st.dataframe(eda_tables["correlation_table"], width="stretch")
-
-    # 6) Top correlations
-    if "top_correlations_table" in eda_tables:
-        st.markdown("### ⭐ Top Correlations")
-        st.dataframe(eda_tables["top_correlations_table"], width="stretch")
-
-    with st.expander("🧩 View raw EDA JSON (optional)", expanded=False):
-        st.json(eda_report)
+    _render_eda(eda_report, eda_tables)
 
 
     # ---------- ASSUMPTIONS ----------
-    assumptions = eda_assumptions(df_cleaned, target_column)
+    with pipeline.trace.span("eda_assumptions", inputs=df_cleaned):
+        assumptions = eda_assumptions(df_cleaned, target_column)
 
     st.subheader("📌 EDA Assumptions")
     for a in assumptions:
@@ -137,50 +236,38 @@ if file:
     # ---------- TARGET-AWARE EDA ----------
     if target_column:
         st.subheader("🎯 Target-aware Insights")
-        for insight in target_eda(df_cleaned, target_column):
+        for insight in pipeline.get("target_eda", target=target_column):
             st.write("•", insight)
 
     # ---------- FEATURE ENGINEERING (POST-EDA) ----------
-    df_features, feature_report = engineer_features(df_cleaned)
+    df_features, feature_report = pipeline.get("features")
 
     if target_column:
         st.subheader("📈 Feature Importance (Pre-model)")
-        for i in feature_importance(df_features, target_column):
+        for i in pipeline.get("feature_importance", target=target_column):
             st.write("•", i)
     
-    # ---------- REPORT CONTEXT (SSOT for UI + PDF + LLM) ----------
-    report_context = build_report_context(
-        eda=eda_report,
-        eda_tables=eda_tables,
-        cleaning_stats=cleaning_stats,
-        cleaning_text=cleaning_text,
-        feature_report=feature_report,
-        target_column=target_column
-    )
-
-
     # ---------- RULE-BASED INSIGHTS ----------
-    insights = generate_insights(
-        eda_report,
-        cleaning_stats
-    )
+    insights = pipeline.get("insights")
 
-        # ---------- AI REPORT NARRATIVE ----------
+    # ---------- AI REPORT NARRATIVE ----------
+    # Built from the report context (SSOT for UI + PDF + LLM). Narration runs
+    # in the background; the slot is filled once the rest of the page is up.
     st.subheader("🧠 AI EDA Report Narrative")
-    narrative = narrate_insights(
-        report_context,  
-        cleaning_stats,
-        feature_report
-    )
-    st.markdown(narrative)
+    narration = pipeline.get("narration")
+    narrative_slot = st.empty()
+    if narration.done and narration.error is None:
+        narrative_slot.markdown(narration.wait())
+    else:
+        narrative_slot.info("✍️ Writing the narrative in the background…")
 
 
     # ---------- VISUALIZATION ----------
     st.subheader("📉 Visual Analysis")
-    plots = auto_visualize(df_cleaned)
+    plots = pipeline.get("plots")
 
-    for fig in plots:
-        st.pyplot(fig)
+    for png in plots:
+        st.image(png)
 
     # ---------- DATA PREVIEW ----------
     st.subheader("🧾 Cleaned Data Preview")
@@ -190,48 +277,117 @@ if file:
         st.dataframe(df_features.head(), width="stretch")
 
     # ---------- MEMORY UPDATE ----------
-    memory[fingerprint] = {
+    # Reruns of the same analysis leave the stored entry as it is
+    remembered = {
         "cleaning": cleaning_stats,
         "features": feature_report,
-        "eda_summary": str(eda_report)
+        "eda_summary": eda_summary(eda_report)
     }
-    save_memory(memory)
+    if memory.put_if_changed(fingerprint, remembered):
+        save_memory(memory)
 
     # ---------- PDF EXPORT ----------
     st.subheader("📄 Report Export")
 
     if st.button("Generate EDA PDF Report"):
-        pdf_path = generate_pdf(
-        insights=cleaning_text + feature_report,
-        llm_text=narrative,
-        assumptions=assumptions,
-        charts=plots,
-        eda_tables=eda_tables
-    )
-
-        with open(pdf_path, "rb") as f:
+        try:
+            llm_text = narration.wait()
+        except Exception:
+            # The failure is shown in the narrative slot below; like batch
+            # mode, the PDF lists the rule-based insights instead
+            llm_text = "\n".join(f"- {line}" for line in insights)
+
+        # Built on a background thread from the PNGs already shown above;
+        # an unchanged report comes straight from the PDF cache
+        st.session_state["pdf_job"] = (fingerprint, start_pdf_export(
+            insights=cleaning_text + feature_report,
+            llm_text=llm_text,
+            assumptions=assumptions,
+            charts=plots,
+            eda_tables=eda_tables
+        ))
+
+    pdf_fingerprint, pdf_job = st.session_state.get("pdf_job", (None, None))
+    if pdf_fingerprint != fingerprint:
+        pdf_job = None
+    pdf_polling = pdf_job is not None and not pdf_job.done
+
+    # Polls only while the export runs
+    @st.fragment(run_every=0.5 if pdf_polling else None)
+    def _pdf_export_status():
+        if pdf_job is None:
+            return
+        if not pdf_job.done:
+            st.progress(pdf_job.progress, text=f"📄 {pdf_job.message}…")
+        elif pdf_polling:
+            # Finished since the page was drawn: one full rerun redefines
+            # the fragment without polling and shows the download once
+            st.rerun()
+        elif pdf_job.error is not None:
+            st.error(f"PDF export failed: {pdf_job.error}")
+        else:
             st.download_button(
                 "⬇️ Download EDA Report",
-                data=f,
+                data=pdf_job.wait(),
                 file_name="EDA_Report.pdf",
                 mime="application/pdf",
                 key="download_pdf"
             )
 
+    _pdf_export_status()
+
     # ---------- NOTEBOOK EXPORT ----------
     st.subheader("📓 Modeling Handoff")
 
-    if st.button("Export EDA → Modeling Notebook"):
-        nb_path = export_notebook(target_column)
+    sample_notebook = st.checkbox(
+        "Include a row sample for quick exploration",
+        value=len(df_cleaned) >= NOTEBOOK_SAMPLE_MIN_ROWS,
+    )
+    sample_only = st.checkbox(
+        "Ship only the sample (smaller download, no full data)",
+        value=False,
+        disabled=not sample_notebook,
+    )
 
-        with open(nb_path, "rb") as f:
-            st.download_button(
-                "⬇️ Download Notebook",
-                data=f,
-                file_name="eda_to_modeling.ipynb",
-                mime="application/x-ipynb+json",
-                key="download_notebook"
+    if st.button("Export EDA → Modeling Notebook"):
+        # Notebook + Parquet snapshot + precomputed results: opens without rerunning the pipeline
+        with pipeline.trace.span("export_bundle", inputs=df_features):
+            bundle = export_bundle(
+                df_cleaned,
+                df_features,
+                eda_report,
+                eda_tables,
+                cleaning_text=cleaning_text,
+                feature_report=feature_report,
+                target=target_column,
+                sample_rows=NOTEBOOK_SAMPLE_ROWS if sample_notebook else None,
+                sample_only=sample_notebook and sample_only,
             )
 
+        st.download_button(
+            "⬇️ Download Notebook Bundle",
+            data=bundle,
+            file_name="eda_to_modeling.zip",
+            mime="application/zip",
+            key="download_notebook"
+        )
+
+    # ---------- NARRATIVE STREAM ----------
+    # Everything else is on screen: stream the narrative into its slot
+    while not narration.done:
+        if narration.text:
+            narrative_slot.markdown(narration.text + " ▌")
+        time.sleep(0.15)
+
+    if narration.error is not None:
+        narrative_slot.error(f"Narrative generation failed: {narration.error}")
+        # retry on the next rerun instead of caching the failure
+        pipeline.invalidate("narration")
+    else:
+        narrative_slot.markdown(narration.wait())
+
+    # ---------- RUN PROFILE ----------
+    _render_trace(pipeline)
+
 else:
     st.warning("⚠️ Please upload a CSV file to start the autonomous analysis.")
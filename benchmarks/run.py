@@ -0,0 +1,217 @@
+"""
+Agent benchmarks over synthetic datasets.
+
+    python -m benchmarks.run --tiers small medium --out benchmarks/results/latest.json
+    python -m benchmarks.run --tiers small --save-baseline benchmarks/baselines/local.json
+    python -m benchmarks.run --tiers small --compare benchmarks/baselines/local.json
+
+Each agent is timed (best wall / CPU seconds of `--repeat` runs) and then run
+once more under tracemalloc for its peak Python-side allocation. Results are
+JSON; with --compare, anything slower or hungrier than the baseline by more
+than the tolerance is flagged and the exit code is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from agents.cleaning import clean_data
+from agents.correlation import correlation_service
+from agents.datetime_detection import clear_format_cache
+from agents.eda import generate_eda
+from agents.feature_engineering import engineer_features
+from agents.feature_importance import feature_importance
+from agents.profiling import profile_dataset
+from agents.report import clear_pdf_cache, generate_pdf
+from agents.visualization import auto_visualize, clear_image_cache
+from benchmarks.synthetic import make_dataset
+
+# name -> make_dataset arguments
+TIERS = {
+    "small": {"rows": 10_000, "cols": 20},
+    "medium": {"rows": 200_000, "cols": 40},
+    "large": {"rows": 2_000_000, "cols": 60},
+    "wide": {"rows": 20_000, "cols": 600},
+}
+
+# Relative slowdown / growth flagged as a regression, and the absolute
+# floors below which differences are treated as noise
+TOLERANCE = 0.25
+MIN_SECONDS = 0.05
+MIN_PEAK_MB = 5.0
+
+METRICS = (("seconds", MIN_SECONDS), ("peak_mb", MIN_PEAK_MB))
+
+
+def _reset_caches():
+    # Cached results would turn every repeat after the first into a lookup:
+    # reset every in-process cache the agents keep
+    correlation_service.clear()
+    clear_format_cache()
+    clear_image_cache()
+    clear_pdf_cache()
+
+
+def measure(func, repeat: int = 3) -> tuple:
+    """
+    (result, timings) for func(): best wall and CPU seconds over `repeat`
+    runs, then the tracemalloc peak of one extra run.
+    """
+    walls, cpus = [], []
+    for _ in range(max(1, repeat)):
+        _reset_caches()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = func()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+
+    _reset_caches()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, {
+        "seconds": round(min(walls), 4),
+        "cpu_seconds": round(min(cpus), 4),
+        "peak_mb": round(peak / 1024 ** 2, 2),
+    }
+
+
+def run_tier(name: str, spec: dict, repeat: int = 3, progress=None) -> dict:
+    """
+    Benchmark every agent on one synthetic dataset, feeding each agent the
+    previous agents' outputs as the app does.
+    """
+    df = make_dataset(**spec)
+    agents = {}
+
+    def _run(agent, func):
+        if progress is not None:
+            progress(f"{name}: {agent}")
+        result, agents[agent] = measure(func, repeat)
+        return result
+
+    profile = _run("profile_dataset", lambda: profile_dataset(df))
+    cleaned, cleaning_stats, cleaning_text = _run("clean_data", lambda: clean_data(df, profile=profile))
+    eda_report, eda_tables = _run("generate_eda", lambda: generate_eda(cleaned))
+    features, feature_report = _run("engineer_features", lambda: engineer_features(cleaned, profile=profile))
+    _run("feature_importance", lambda: feature_importance(features, "target"))
+    charts = _run("auto_visualize", lambda: auto_visualize(cleaned, profile=profile, output="png"))
+    _run("generate_pdf", lambda: generate_pdf(
+        insights=cleaning_text + feature_report,
+        llm_text="## Summary\n- synthetic benchmark dataset",
+        charts=charts,
+        eda_tables=eda_tables,
+    ))
+
+    return {
+        "rows": int(df.shape[0]),
+        "cols": int(df.shape[1]),
+        "input_mb": round(df.memory_usage(deep=True).sum() / 1024 ** 2, 2),
+        "agents": agents,
+    }
+
+
+def run_benchmarks(tiers, repeat: int = 3, progress=None) -> dict:
+    """
+    `tiers` maps tier names to make_dataset arguments (see TIERS).
+    """
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "tiers": {name: {**run_tier(name, spec, repeat, progress), "spec": spec} for name, spec in tiers.items()},
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """
+    Regressions of `results` against `baseline`: one dict per agent and
+    metric that grew by more than `tolerance` (relative) and the metric's
+    noise floor (absolute). Tiers or agents missing from either are skipped.
+    """
+    regressions = []
+    for tier, current in results["tiers"].items():
+        previous = baseline.get("tiers", {}).get(tier)
+        if previous is None or previous.get("spec") != current.get("spec"):
+            continue
+        for agent, metrics in current["agents"].items():
+            before = previous["agents"].get(agent)
+            if before is None:
+                continue
+            for metric, floor in METRICS:
+                old, new = before.get(metric), metrics.get(metric)
+                if old is None or new is None:
+                    continue
+                if new - old > floor and new > old * (1 + tolerance):
+                    regressions.append({
+                        "tier": tier,
+                        "agent": agent,
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(new / old - 1, 3) if old else None,
+                    })
+    return regressions
+
+
+def _table(results: dict) -> str:
+    lines = [f"{'tier':<8} {'agent':<20} {'seconds':>9} {'cpu':>9} {'peak MB':>9}"]
+    for tier, data in results["tiers"].items():
+        for agent, m in data["agents"].items():
+            lines.append(f"{tier:<8} {agent:<20} {m['seconds']:>9.3f} {m['cpu_seconds']:>9.3f} {m['peak_mb']:>9.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the agents on synthetic datasets.")
+    parser.add_argument("--tiers", nargs="+", default=["small"], choices=sorted(TIERS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="benchmarks/results/latest.json", help="where to write the results")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also store the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        {name: TIERS[name] for name in args.tiers},
+        repeat=args.repeat,
+        progress=lambda msg: print(f"  {msg}", file=sys.stderr),
+    )
+
+    for path in filter(None, (args.out, args.save_baseline)):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(results, indent=2))
+    print(_table(results))
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()), args.tolerance)
+        results["regressions"] = regressions
+        Path(args.out).write_text(json.dumps(results, indent=2))
+        for r in regressions:
+            print(f"REGRESSION {r['tier']}/{r['agent']} {r['metric']}: {r['baseline']} -> {r['current']}")
+        if regressions:
+            return 1
+        print("No regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
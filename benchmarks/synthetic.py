@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+
+def make_dataset(
+    rows: int,
+    cols: int,
+    null_rate: float = 0.05,
+    cardinality: int = 50,
+    datetime_cols: int = 1,
+    duplicate_rate: float = 0.01,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Synthetic dataset shaped like the uploads the agents see.
+
+    Columns, in order: a numeric `target`, roughly half numeric features
+    (float and int, some correlated with the target), categoricals with
+    `cardinality` levels (Zipf-like frequencies), `datetime_cols` text date
+    columns and the rest binary flags. `null_rate` of the feature cells are
+    blanked and `duplicate_rate` of the rows repeat earlier rows.
+    """
+    rng = np.random.default_rng(seed)
+    n_unique = rows - int(rows * duplicate_rate)
+    n_features = max(0, cols - 1)
+
+    n_date = min(datetime_cols, n_features)
+    n_numeric = (n_features - n_date + 1) // 2
+    n_cat = max(0, (n_features - n_date - n_numeric) * 2 // 3)
+    n_flag = n_features - n_date - n_numeric - n_cat
+
+    latent = rng.normal(size=n_unique)
+    data = {"target": (3 * latent + rng.normal(size=n_unique)).round(3)}
+
+    for i in range(n_numeric):
+        if i % 3 == 0:
+            # Correlated with the target to a varying degree
+            values = latent * rng.uniform(0.2, 1.0) + rng.normal(size=n_unique)
+            data[f"num_{i}"] = values.round(4)
+        elif i % 3 == 1:
+            data[f"num_{i}"] = rng.lognormal(mean=3, sigma=1, size=n_unique).round(2)
+        else:
+            data[f"num_{i}"] = rng.integers(0, 1000, size=n_unique)
+
+    levels = np.array([f"level_{j}" for j in range(max(1, cardinality))], dtype=object)
+    weights = 1.0 / np.arange(1, len(levels) + 1)
+    weights /= weights.sum()
+    for i in range(n_cat):
+        data[f"cat_{i}"] = levels[rng.choice(len(levels), size=n_unique, p=weights)]
+
+    start = np.datetime64("2015-01-01")
+    for i in range(n_date):
+        days = rng.integers(0, 3650, size=n_unique)
+        data[f"date_{i}"] = np.datetime_as_string(start + days, unit="D").astype(object)
+
+    for i in range(n_flag):
+        data[f"flag_{i}"] = np.where(rng.random(n_unique) < 0.3, "yes", "no").astype(object)
+
+    df = pd.DataFrame(data)
+
+    if null_rate > 0:
+        for col in df.columns[1:]:
+            mask = rng.random(n_unique) < null_rate
+            if mask.any():
+                df[col] = df[col].mask(mask)
+
+    if rows > n_unique:
+        repeats = df.iloc[rng.integers(0, n_unique, size=rows - n_unique)]
+        df = pd.concat([df, repeats], ignore_index=True)
+        df = df.iloc[rng.permutation(rows)].reset_index(drop=True)
+
+    return df
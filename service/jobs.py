@@ -0,0 +1,288 @@
+import multiprocessing
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from multiprocessing.connection import wait
+from pathlib import Path
+
+from agents.batch import collect_result, run_one
+from utils.config import (
+    SERVICE_JOB_HISTORY,
+    SERVICE_JOB_TIMEOUT_SECONDS,
+    SERVICE_JOBS_DIR,
+    SERVICE_MAX_PENDING,
+    SERVICE_UPLOAD_CHUNK_BYTES,
+    SERVICE_WORKERS,
+)
+
+
+class QueueFull(Exception):
+    """
+    Raised by JobQueue.submit when `max_pending` jobs are already waiting
+    or running; callers should retry later (HTTP 503).
+    """
+
+
+def _safe_name(filename: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", Path(filename or "dataset.csv").name)
+    return name if name.strip("._") else "dataset.csv"
+
+
+def _write_upload(data, path: Path, length: int | None):
+    if isinstance(data, (bytes, bytearray)):
+        path.write_bytes(data)
+        return
+    # Stream (e.g. the request body): copy in chunks, never whole in memory
+    remaining = length
+    with path.open("wb") as out:
+        while remaining:
+            chunk = data.read(min(SERVICE_UPLOAD_CHUNK_BYTES, remaining))
+            if not chunk:
+                raise ValueError(f"upload ended {remaining} bytes short of {length}")
+            out.write(chunk)
+            remaining -= len(chunk)
+
+
+class Job:
+    """
+    One submitted dataset. Status is queued -> running -> done | failed;
+    outputs (the batch runner's artifacts) live under `output_dir`.
+    """
+
+    def __init__(self, job_id: str, job_dir: Path, filename: str, options: dict):
+        self.id = job_id
+        self.dir = job_dir
+        self.filename = filename
+        self.options = options
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self._state = "queued"
+        self._process = None
+        self._done = threading.Event()
+
+    @property
+    def input_path(self) -> Path:
+        return self.dir / self.filename
+
+    @property
+    def output_dir(self) -> Path:
+        return self.dir / "output"
+
+    @property
+    def status(self) -> str:
+        return self._state
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until the job is done or failed; False if `timeout` ran out first.
+        """
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "options": self.options,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "result": self.result,
+            "artifacts": self.artifacts() if self.status == "done" else [],
+        }
+
+    def artifacts(self) -> list:
+        return sorted(
+            str(p.relative_to(self.output_dir))
+            for p in self.output_dir.rglob("*") if p.is_file()
+        )
+
+    def _finished(self, record: dict):
+        if record["status"] == "ok":
+            self.result = record
+        elif record["status"] == "crashed":
+            self.error = f"worker exited with code {record['exitcode']}"
+        else:
+            self.error = record.get("error") or record["status"]
+        self.finished_at = time.time()
+        self._process = None
+        # State last, once result/error are in place
+        self._state = "failed" if self.error is not None else "done"
+        self._done.set()
+
+
+class JobQueue:
+    """
+    In-process job queue in front of a bounded number of worker processes.
+
+    At most `workers` datasets are analyzed at once, each in its own
+    process like the batch runner: a worker that crashes or is killed (e.g.
+    out of memory) fails only its own job, and one still running after
+    `timeout` seconds is terminated. Beyond `max_pending` queued or running
+    jobs, submit() raises QueueFull instead of letting the backlog grow.
+    Jobs and their artifacts are kept on disk under `root`, with the oldest
+    finished jobs removed beyond `history`.
+    """
+
+    def __init__(
+        self,
+        root=SERVICE_JOBS_DIR,
+        workers: int = SERVICE_WORKERS,
+        max_pending: int = SERVICE_MAX_PENDING,
+        history: int = SERVICE_JOB_HISTORY,
+        timeout: float | None = SERVICE_JOB_TIMEOUT_SECONDS,
+    ):
+        self.root = Path(root)
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.history = history
+        self.timeout = timeout
+        self.jobs = OrderedDict()
+        self._queued = deque()
+        self._receiving = 0
+        self._lock = threading.Lock()
+        self._closing = False
+        self._cancel = False
+
+        # Spawned workers: no inherited locks or threads from the server
+        self._ctx = multiprocessing.get_context("spawn")
+        # Wakes the dispatcher's wait() on submit and shutdown
+        self._wake_reader, self._wake_writer = self._ctx.Pipe(duplex=False)
+        self._dispatcher = threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def _active(self) -> int:
+        # Uploads still being written hold their slot too
+        return self._receiving + sum(1 for job in self.jobs.values() if job.status in ("queued", "running"))
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._active()
+
+    def submit(self, data, filename: str = "dataset.csv", length: int | None = None, **options) -> Job:
+        """
+        Queue a CSV for analysis: raw bytes, or a binary stream from which
+        exactly `length` bytes are read (ValueError if it ends early).
+        `options` are passed to batch.process_dataset (target, pdf,
+        notebook, narrative).
+        """
+        with self._lock:
+            active = self._active()
+            if active >= self.max_pending:
+                raise QueueFull(f"{active} jobs pending (limit {self.max_pending})")
+            self._receiving += 1
+
+        # Written outside the lock: a large upload must not stall status requests
+        job_id = uuid.uuid4().hex
+        job = Job(job_id, self.root / job_id, _safe_name(filename), options)
+        try:
+            job.output_dir.mkdir(parents=True)
+            _write_upload(data, job.input_path, length)
+        except BaseException:
+            shutil.rmtree(job.dir, ignore_errors=True)
+            with self._lock:
+                self._receiving -= 1
+            raise
+
+        with self._lock:
+            self._receiving -= 1
+            self.jobs[job_id] = job
+            self._queued.append(job)
+            self._wake_writer.send(None)
+            self._prune()
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def artifact(self, job_id: str, name: str):
+        """
+        Path of one output file of a finished job, or None. Names are
+        relative to the job's output directory (e.g. "eda_tables/missing_table.csv").
+        """
+        job = self.get(job_id)
+        if job is None or job.status != "done":
+            return None
+        root = job.output_dir.resolve()
+        path = (root / name).resolve()
+        if root not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job.status in ("done", "failed")]
+        for job in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job.id]
+            shutil.rmtree(job.dir, ignore_errors=True)
+
+    # ----------------------------- Dispatcher -----------------------------
+
+    def _start(self, job: Job):
+        options = {"force": True, **job.options}
+        proc = self._ctx.Process(
+            target=run_one, args=(str(job.input_path), str(job.output_dir), options), daemon=True
+        )
+        proc.start()
+        job._process = proc
+        job.started_at = time.time()
+        job._state = "running"
+        return proc
+
+    def _dispatch(self):
+        running = {}
+        while True:
+            with self._lock:
+                if self._cancel:
+                    while self._queued:
+                        self._queued.popleft()._finished({"status": "cancelled"})
+                    for proc, _, _ in running.values():
+                        proc.terminate()
+                starting = []
+                while self._queued and len(running) + len(starting) < self.workers:
+                    starting.append(self._queued.popleft())
+                if self._closing and not running and not starting and not self._queued:
+                    return
+
+            for job in starting:
+                proc = self._start(job)
+                running[proc.sentinel] = (proc, job, time.monotonic())
+
+            now = time.monotonic()
+            deadlines = [t0 + self.timeout - now for _, _, t0 in running.values()] if self.timeout else []
+            ready = wait([self._wake_reader, *running], timeout=max(0.0, min(deadlines)) if deadlines else None)
+            while self._wake_reader.poll():
+                self._wake_reader.recv()
+
+            now = time.monotonic()
+            for sentinel in list(running):
+                proc, job, t0 = running[sentinel]
+                if sentinel in ready:
+                    proc.join()
+                    job._finished(collect_result(job.input_path, job.output_dir, proc.exitcode, now - t0))
+                elif self.timeout and now - t0 >= self.timeout:
+                    proc.terminate()
+                    proc.join()
+                    job._finished({"status": "timeout", "error": f"timed out after {self.timeout:g} s"})
+                else:
+                    continue
+                del running[sentinel]
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the dispatcher: after the queued and running jobs finish, or
+        right away (queued jobs cancelled, running workers terminated).
+        """
+        with self._lock:
+            self._closing = True
+            self._cancel = not wait
+            self._wake_writer.send(None)
+        if wait:
+            self._dispatcher.join()
@@ -0,0 +1,130 @@
+"""
+Minimal HTTP front end for the job queue (standard library only).
+
+    python -m service.server --port 8080
+
+    POST /jobs?filename=sales.csv&target=price&pdf=1&notebook=1   body: raw CSV
+        -> 202 {"job_id": ..., "status": "queued"}   (503 + Retry-After when full,
+                                                      413 beyond the upload limit)
+    GET  /jobs/<job_id>                       -> job status, result and artifact names
+    GET  /jobs/<job_id>/artifacts/<name>      -> artifact file (e.g. eda_report.json)
+"""
+import argparse
+import json
+import mimetypes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from service.jobs import JobQueue, QueueFull
+from utils.config import SERVICE_MAX_UPLOAD_BYTES, SERVICE_PORT
+
+_FLAGS = ("pdf", "notebook", "narrative")
+
+
+def _options(query: dict) -> dict:
+    options = {flag: query.get(flag, ["0"])[0].lower() in ("1", "true", "yes") for flag in _FLAGS}
+    if query.get("target"):
+        options["target"] = query["target"][0]
+    return options
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    """
+    Request handler bound to one JobQueue (`server.queue`), accepting
+    uploads up to `server.max_upload` bytes.
+    """
+
+    def _send_json(self, status: int, obj, headers=None):
+        body = json.dumps(obj, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "not found"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return self._send_json(400, {"error": "empty body: send the CSV as the request body"})
+        if length > self.server.max_upload:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            return self._send_json(413, {"error": f"upload larger than {self.server.max_upload} bytes"})
+
+        query = parse_qs(url.query)
+        try:
+            # The body streams straight to the job directory
+            job = self.server.queue.submit(
+                self.rfile, filename=query.get("filename", ["dataset.csv"])[0], length=length, **_options(query)
+            )
+        except QueueFull as exc:
+            self.close_connection = True
+            return self._send_json(503, {"error": str(exc)}, headers={"Retry-After": "30"})
+        except ValueError as exc:
+            self.close_connection = True
+            return self._send_json(400, {"error": str(exc)})
+        self._send_json(202, {"job_id": job.id, "status": job.status}, headers={"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self):
+        parts = [unquote(p) for p in urlsplit(self.path).path.strip("/").split("/")]
+        if len(parts) < 2 or parts[0] != "jobs":
+            return self._send_json(404, {"error": "not found"})
+
+        job = self.server.queue.get(parts[1])
+        if job is None:
+            return self._send_json(404, {"error": "unknown job"})
+        if len(parts) == 2:
+            return self._send_json(200, job.to_dict())
+
+        if parts[2] != "artifacts" or len(parts) < 4:
+            return self._send_json(404, {"error": "not found"})
+        path = self.server.queue.artifact(job.id, "/".join(parts[3:]))
+        if path is None:
+            return self._send_json(404, {"error": "artifact not available", "status": job.status})
+
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(
+    queue: JobQueue,
+    host: str = "127.0.0.1",
+    port: int = SERVICE_PORT,
+    max_upload: int = SERVICE_MAX_UPLOAD_BYTES,
+) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), JobHandler)
+    server.queue = queue
+    server.max_upload = max_upload
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI Data Agent analysis service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    args = parser.parse_args(argv)
+
+    queue = JobQueue()
+    server = make_server(queue, args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        queue.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    main()
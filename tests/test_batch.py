@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import agents.batch as batch
+import agents.dataset_cache as dataset_cache
+from agents.batch import output_dir_for, process_dataset, run_batch
+
+
+def _write(path, seed, n=200):
+    rng = np.random.default_rng(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "x": rng.normal(size=n).round(1),
+        "y": rng.integers(0, 5, size=n),
+        "city": rng.choice(["a", "b", "c"], size=n),
+    }).to_csv(path, index=False)
+
+
+def test_batch_processes_skips_and_reports(tmp_path):
+    data, out = tmp_path / "data", tmp_path / "out"
+    _write(data / "a.csv", 0)
+    _write(data / "nested" / "a.csv", 1)
+    (data / "empty.csv").write_text("")
+    options = {"workers": 2, "memory_path": tmp_path / "memory.db"}
+
+    summary = run_batch(data, out, **options)
+    statuses = {d["path"]: d["status"] for d in summary["datasets"]}
+
+    assert summary["counts"] == {"ok": 2, "error": 1}
+    assert statuses[str(data / "empty.csv")] == "error"
+    assert json.loads((out / "summary.json").read_text())["total"] == 3
+    assert (output_dir_for(data / "nested" / "a.csv", data, out) / "eda_tables").is_dir()
+    assert (out / "a" / "profile.json").exists() and (out / "nested" / "a" / "result.json").exists()
+
+    # Unchanged datasets are skipped; a changed one is processed again
+    _write(data / "a.csv", 2)
+    summary = run_batch(data, out, **options)
+    statuses = {d["path"]: d["status"] for d in summary["datasets"]}
+
+    assert statuses[str(data / "a.csv")] == "ok"
+    assert statuses[str(data / "nested" / "a.csv")] == "skipped"
+
+
+def test_batch_times_out(tmp_path):
+    _write(tmp_path / "data" / "a.csv", 0)
+
+    summary = run_batch(tmp_path / "data", tmp_path / "out", timeout=0.01, memory_path=tmp_path / "memory.db")
+
+    assert summary["counts"] == {"timeout": 1}
+
+
+def test_unchanged_dataset_is_skipped_without_parsing(monkeypatch, tmp_path):
+    monkeypatch.setattr(dataset_cache, "CACHE_DIR", tmp_path / "cache")
+    _write(tmp_path / "a.csv", 0)
+    options = {"memory_path": tmp_path / "memory.db"}
+
+    first = process_dataset(tmp_path / "a.csv", tmp_path / "out", **options)
+    assert first["status"] == "ok" and first["content_hash"]
+    # Batch loads leave the app's dataset cache alone
+    assert not list((tmp_path / "cache").glob("*.arrow"))
+
+    def no_pipeline(*args, **kwargs):
+        raise AssertionError("unchanged dataset parsed again")
+
+    monkeypatch.setattr(batch, "analysis_pipeline", no_pipeline)
+    second = process_dataset(tmp_path / "a.csv", tmp_path / "out", **options)
+    assert second["status"] == "skipped"
+    assert second["fingerprint"] == first["fingerprint"]
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from agents.datetime_detection import infer_datetime_format
+from benchmarks.run import compare, measure
+from benchmarks.synthetic import make_dataset
+
+
+def test_synthetic_dataset_knobs():
+    df = make_dataset(5_000, 12, null_rate=0.1, cardinality=7, datetime_cols=2, duplicate_rate=0.02, seed=1)
+
+    assert df.shape == (5_000, 12)
+    assert df.duplicated().sum() >= 100
+    assert 0.07 < df.drop(columns="target").isna().mean().mean() < 0.13
+
+    cat_cols = [c for c in df.columns if c.startswith("cat_")]
+    assert cat_cols and all(df[c].nunique() <= 7 for c in cat_cols)
+
+    date_cols = [c for c in df.columns if c.startswith("date_")]
+    assert len(date_cols) == 2
+    assert pd.to_datetime(df[date_cols[0]], format="%Y-%m-%d").notna().sum() == df[date_cols[0]].notna().sum()
+
+    pd.testing.assert_frame_equal(df, make_dataset(5_000, 12, null_rate=0.1, cardinality=7, datetime_cols=2, duplicate_rate=0.02, seed=1))
+
+
+def test_compare_flags_only_real_regressions():
+    spec = {"rows": 10, "cols": 3}
+    baseline = {"tiers": {"small": {"spec": spec, "agents": {
+        "clean_data": {"seconds": 1.0, "peak_mb": 100.0},
+        "generate_eda": {"seconds": 0.01, "peak_mb": 1.0},
+    }}}}
+    results = {"tiers": {"small": {"spec": spec, "agents": {
+        "clean_data": {"seconds": 1.1, "peak_mb": 200.0},
+        "generate_eda": {"seconds": 0.03, "peak_mb": 3.0},
+    }}}}
+
+    regressions = compare(results, baseline)
+
+    # 10% slower is within tolerance; tiny absolute changes are noise
+    assert [(r["agent"], r["metric"]) for r in regressions] == [("clean_data", "peak_mb")]
+    assert regressions[0]["change"] == 1.0
+
+    results["tiers"]["small"]["spec"] = {"rows": 20, "cols": 3}
+    assert compare(results, baseline) == []
+
+
+def test_every_measured_run_starts_with_cold_caches(monkeypatch):
+    calls = []
+    guess = pd.tseries.api.guess_datetime_format
+
+    def counting_guess(value):
+        calls.append(value)
+        return guess(value)
+
+    monkeypatch.setattr(pd.tseries.api, "guess_datetime_format", counting_guess)
+    dates = pd.Series(["2024-01-02", "2024-03-04"], name="d")
+
+    result, _ = measure(lambda: infer_datetime_format(dates), repeat=3)
+
+    assert result == "%Y-%m-%d"
+    # Three timed runs plus the tracemalloc run, none served from the cache
+    assert len(calls) == 4
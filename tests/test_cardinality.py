@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from agents.cardinality import CardinalitySketches, HyperLogLog, distinct_count
+from agents.column_stats import compute_column_stats
+
+
+def test_estimate_within_error():
+    values = pd.Series(np.arange(200_000))
+    sketch = HyperLogLog(relative_error=0.01)
+    sketch.add_series(values)
+
+    assert abs(sketch.estimate() - 200_000) <= 3 * sketch.relative_error * 200_000
+
+
+def test_merge_matches_single_sketch():
+    values = pd.Series(np.arange(50_000).astype(str))
+    left, right, whole = HyperLogLog(0.02), HyperLogLog(0.02), HyperLogLog(0.02)
+    left.add_series(values[:30_000])
+    right.add_series(values[20_000:])
+    whole.add_series(values)
+    left.merge(right)
+
+    assert np.array_equal(left.registers, whole.registers)
+
+
+def test_exact_fallback_near_threshold():
+    df = pd.DataFrame({"a": np.arange(1000) % 50, "b": np.arange(1000)})
+    sketches = CardinalitySketches(df, relative_error=0.05)
+
+    assert sketches.count("a", near=(50,)) == 50
+    assert sketches.count("b", near=(50,)) == sketches.estimate("b")
+
+
+def test_sketched_stats_drive_profile_decisions():
+    n = 5000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "const": ["x"] * n,
+        "cat": np.array(["a", "b", "c"])[np.arange(n) % 3],
+    })
+    stats = compute_column_stats(df, sketch_min_rows=1000)
+
+    assert stats["sketches"] is not None
+    assert distinct_count(stats, "const", near=(1,)) == 1
+    assert distinct_count(stats, "cat") == 3
+    assert distinct_count(stats, "id", near=(0.9 * n,)) > 0.9 * n
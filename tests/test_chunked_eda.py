@@ -0,0 +1,128 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import agents.chunked_eda as chunked_eda
+from agents.chunked_eda import CoMoments, EdaSummary, TDigest, generate_eda_chunked
+from agents.eda import generate_eda
+from agents.ingestion import iter_csv_chunks
+
+
+def _frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "x": rng.normal(1e6, 1, n),
+        "y": rng.exponential(2, n),
+        "k": rng.integers(0, 20, n),
+        "c": rng.choice(["a", "b", "c"], n),
+    })
+    df["z"] = df["x"] * 3 + rng.normal(0, 1, n)
+    df.loc[rng.random(n) < 0.1, "y"] = np.nan
+    df.loc[rng.random(n) < 0.05, "c"] = None
+    return df
+
+
+def test_chunked_eda_matches_in_memory():
+    df = _frame()
+    report, tables = generate_eda(df)
+    chunks = (df.iloc[i:i + 700] for i in range(0, len(df), 700))
+    chunked_report, chunked_tables = generate_eda_chunked(chunks)
+
+    assert chunked_report.keys() == report.keys()
+    assert chunked_tables.keys() == tables.keys()
+    assert chunked_report["shape"] == report["shape"]
+    assert chunked_report["missing"] == report["missing"]
+    pd.testing.assert_frame_equal(chunked_tables["dtypes_table"], tables["dtypes_table"])
+    pd.testing.assert_frame_equal(chunked_tables["numeric_summary_table"], tables["numeric_summary_table"])
+    pd.testing.assert_frame_equal(chunked_tables["correlation_table"], tables["correlation_table"])
+
+
+def test_comoments_pairwise_complete_corr():
+    df = _frame(500, seed=1)[["x", "y", "z"]]
+    values = df.to_numpy()
+    moments = CoMoments(3)
+    for part in np.array_split(values, 4):
+        moments.update(part)
+
+    np.testing.assert_allclose(moments.corr(), df.corr().to_numpy(), atol=1e-9)
+    np.testing.assert_allclose(moments.variance(), df.var().to_numpy(), rtol=1e-9)
+
+
+def test_tdigest_merge_and_compression():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=100_000)
+    left, right = TDigest(), TDigest()
+    left.update(values[:60_000])
+    right.update(values[60_000:])
+    left.merge(right)
+
+    assert len(left.means) < 5 * left.compression
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert abs(left.quantile(q) - np.quantile(values, q)) < 0.02
+
+
+def test_iter_csv_chunks_feeds_chunked_eda():
+    df = _frame(1000)
+    buf = io.StringIO(df.to_csv(index=False))
+    report, _ = generate_eda_chunked(iter_csv_chunks(buf, chunk_rows=300, sample_rows=100))
+
+    assert report["shape"] == df.shape
+    assert report["missing"]["y"] == df["y"].isna().sum()
+
+
+def test_chunked_eda_survives_text_in_a_numeric_column():
+    rows = "\n".join(f"{i},{i % 7}" for i in range(5000))
+    buf = io.StringIO("n,k\n" + rows + "\nx,3\n")
+    report, tables = generate_eda_chunked(iter_csv_chunks(buf, chunk_rows=1000))
+
+    assert report["shape"] == (5001, 2)
+    assert report["non_numeric_values"] == {"n": 1}
+    summary = tables["numeric_summary_table"]
+    assert summary.loc["n", "count"] == 5000
+    assert summary.loc["n", "max"] == 4999
+
+
+def test_column_empty_in_the_first_chunk_is_summarized_as_text():
+    rows = [f"{i}," for i in range(1000)] + [f"{i},note {i % 30}" for i in range(1000, 3000)]
+    buf = io.StringIO("n,note\n" + "\n".join(rows) + "\n")
+    report, tables = generate_eda_chunked(iter_csv_chunks(buf, chunk_rows=1000, sample_rows=100))
+    df = pd.read_csv(io.StringIO("n,note\n" + "\n".join(rows) + "\n"))
+
+    assert "note" not in report["numeric_summary"]["count"]
+    assert "non_numeric_values" not in report
+    assert report["missing"]["note"] == df["note"].isna().sum()
+    dtypes = tables["dtypes_table"].set_index("column")
+    assert dtypes.loc["note", "unique_values"] == 30
+
+
+def test_wide_files_pair_only_the_first_columns(monkeypatch):
+    monkeypatch.setattr(chunked_eda, "CORR_DENSE_MAX_COLS", 3)
+    df = _frame()[["x", "z", "y", "c", "k"]]
+    summary = EdaSummary()
+    for i in range(0, len(df), 700):
+        summary.update(df.iloc[i:i + 700])
+    assert summary.pair_cols == ["x", "z", "y"]
+    assert summary.pair_moments.n.shape == (3, 3)
+    assert summary.moments.n.shape == (4,)
+
+    chunks = (df.iloc[i:i + 700] for i in range(0, len(df), 700))
+    report, tables = generate_eda_chunked(chunks)
+    assert report["correlation_columns"] == {"paired": 3, "numeric": 4}
+    assert "correlation_table" not in tables
+    assert set(tables["numeric_summary_table"].index) == {"x", "y", "k", "z"}
+
+    pairs = tables["correlation_pairs_table"]
+    assert pairs[["feature_1", "feature_2"]].values.tolist() == [["x", "z"]]
+    assert pairs["corr"].iloc[0] == round(df["x"].corr(df["z"]), 2)
+
+
+def test_date_column_demoted_mid_stream_counts_each_value_once():
+    dates = [f"2024-01-{d:02d}" for d in range(1, 30)]
+    rows = [dates[i % 29] for i in range(2000)] + ["unknown"] + [dates[i % 29] for i in range(999)]
+    text = "d\n" + "\n".join(rows) + "\n"
+    report, tables = generate_eda_chunked(iter_csv_chunks(io.StringIO(text), chunk_rows=1000, sample_rows=100))
+
+    assert report["shape"] == (3000, 1)
+    dtypes = tables["dtypes_table"].set_index("column")
+    assert dtypes.loc["d", "unique_values"] == pd.read_csv(io.StringIO(text))["d"].nunique() == 30
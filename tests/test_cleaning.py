@@ -3,5 +3,41 @@ from agents.cleaning import clean_data
 
 def test_cleaning_removes_duplicates():
     df = pd.DataFrame({"a": [1, 1], "b": [2, 2]})
-    cleaned, report = clean_data(df)
+    cleaned, stats, text = clean_data(df)
     assert len(cleaned) == 1
+    assert stats["duplicates_removed"] == 1
+
+
+def test_cleaning_single_pass_matches_reference():
+    df = pd.DataFrame({
+        "x": [1.0, None, 3.0, 1.0, -0.0, 0.0],
+        "c": ["a", "b", None, "a", "b", "b"],
+    })
+    expected = df.copy().drop_duplicates()
+
+    for inplace in (False, True):
+        data = df.copy()
+        cleaned, stats, text = clean_data(data, inplace=inplace)
+
+        assert stats["duplicates_removed"] == 2
+        assert cleaned.index.tolist() == expected.index.tolist()
+        assert cleaned["x"].tolist() == [1.0, 1.0, 3.0, -0.0]
+        assert cleaned["c"].tolist() == ["a", "b", "b", "b"]
+        assert text[1:] == [
+            "Filled 1 missing values in 'x' using median.",
+            "Filled 1 missing values in 'c' using mode.",
+        ]
+        if not inplace:
+            pd.testing.assert_frame_equal(data, df)
+
+
+def test_hash_collisions_never_drop_distinct_rows(monkeypatch):
+    from agents import cleaning
+
+    df = pd.DataFrame({"a": [1, 2, 1, 3], "b": ["x", "y", "x", "z"]})
+    # Every row hashes alike: only the exact comparison may decide
+    monkeypatch.setattr(cleaning, "_row_hashes", lambda frame: pd.Series(0, index=frame.index, dtype="uint64"))
+    cleaned, stats, _ = clean_data(df)
+
+    assert stats["duplicates_removed"] == 1
+    assert cleaned.index.tolist() == [0, 1, 3]
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from agents.column_stats import SUMMARY_COLS, compute_column_stats
+
+
+def test_column_stats_match_pandas():
+    df = pd.DataFrame({
+        "x": [1.0, 2.5, np.nan, 4.0, 2.5],
+        "n": [3, 1, 2, 2, 5],
+        "c": ["b", "a", None, "b", "a"],
+    })
+    stats = compute_column_stats(df)
+    cols = stats["columns"]
+
+    assert cols["null_count"].tolist() == df.isna().sum().tolist()
+    assert cols["n_unique"].tolist() == [df[c].nunique() for c in df.columns]
+    assert cols["n_unique_with_na"].tolist() == [df[c].nunique(dropna=False) for c in df.columns]
+
+    expected = df.describe().T
+    pd.testing.assert_frame_equal(
+        cols.loc[expected.index, SUMMARY_COLS].astype("float64"), expected, check_names=False
+    )
+
+    # ties resolve like Series.mode()
+    assert cols.loc["c", "mode"] == df["c"].mode().iloc[0] == "a"
+    assert stats["top_values"]["c"].to_dict() == {"b": 2, "a": 2}
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from agents.correlation import correlation_matrix, correlation_pairs, top_k_pairs
+from agents.eda import generate_eda
+
+
+def _frame(n=400, p=12, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(n, 3))
+    values = base @ rng.normal(size=(3, p)) + rng.normal(size=(n, p))
+    df = pd.DataFrame(values, columns=[f"c{i}" for i in range(p)])
+    df.iloc[rng.random(n) < 0.1, 2] = np.nan
+    df["const"] = 1.0
+    return df
+
+
+def test_blocked_matrix_matches_pandas():
+    df = _frame()
+    expected = df.corr()
+    for block_size in (1, 5, 256):
+        got = correlation_matrix(df, block_size=block_size)
+        pd.testing.assert_frame_equal(got, expected, atol=1e-10)
+
+
+def test_top_k_pairs_upper_triangle():
+    df = _frame()
+    top = top_k_pairs(correlation_matrix(df), k=5)
+    expected = df.corr().abs().where(np.triu(np.ones((13, 13), dtype=bool), k=1)).stack()
+    expected = expected.sort_values(ascending=False).head(5)
+
+    assert len(top) == 5
+    assert np.allclose(top["corr"].abs(), expected.to_numpy())
+    assert all(a != b for a, b in zip(top["feature_1"], top["feature_2"]))
+
+
+def test_sparse_pairs_match_dense_threshold():
+    df = _frame()
+    dense = top_k_pairs(correlation_matrix(df), k=None)
+    dense = dense[dense["corr"].abs() >= 0.6].reset_index(drop=True)
+
+    sparse = correlation_pairs(df, threshold=0.6, block_size=4)
+    pd.testing.assert_frame_equal(sparse, dense)
+
+
+def test_wide_eda_uses_sparse_pairs(monkeypatch):
+    monkeypatch.setattr("agents.eda.CORR_DENSE_MAX_COLS", 5)
+    report, tables = generate_eda(_frame())
+
+    assert "correlation_table" not in tables
+    assert "correlation_matrix" not in report
+    pairs = tables["correlation_pairs_table"]
+    assert (pairs["corr"].abs() >= 0.5).all()
+    assert len(tables["top_correlations_table"]) == min(10, len(pairs))
+
+
+def test_service_slices_cached_matrix():
+    from agents.correlation import CorrelationService
+
+    df = _frame()
+    service = CorrelationService()
+    full = service.matrix(df)
+
+    # Subsets and renamed copies of the same data are served by slicing
+    sub = service.matrix(df, ["c3", "c1"])
+    renamed = service.matrix(df.rename(columns={"c1": "x"}), ["x", "c3"])
+
+    assert service.misses == 1 and service.hits == 2
+    pd.testing.assert_frame_equal(sub, full.loc[["c3", "c1"], ["c3", "c1"]])
+    assert renamed.loc["x", "c3"] == full.loc["c1", "c3"]
+
+    # Changed data is a different column
+    changed = df.copy()
+    changed.loc[0, "c1"] = 99.0
+    service.matrix(changed, ["c1", "c4"])
+    assert service.misses == 2
+
+
+def test_service_evicts_least_recently_used():
+    from agents.correlation import CorrelationService
+
+    df = _frame()
+    service = CorrelationService(max_bytes=1)
+    service.matrix(df, ["c0", "c1"])
+    service.matrix(df, ["c2", "c3"])
+
+    assert len(service.entries) == 1
+    service.matrix(df, ["c0", "c1"])
+    assert service.misses == 3
+
+
+def test_blocked_results_with_missing_values_in_many_blocks():
+    # Complete and incomplete blocks mixed: the kept per-block arrays
+    # outgrow their budget, so some blocks are rebuilt on use
+    df = _frame(p=16, seed=4)
+    rng = np.random.default_rng(5)
+    for col in ("c0", "c5", "c6", "c11", "c15"):
+        df.loc[rng.random(len(df)) < 0.05, col] = np.nan
+    expected = df.corr()
+
+    for block_size in (1, 2, 3):
+        got = correlation_matrix(df, block_size=block_size)
+        pd.testing.assert_frame_equal(got, expected, atol=1e-10)
+
+        pairs = correlation_pairs(df, threshold=0.3, block_size=block_size)
+        dense = top_k_pairs(expected, k=None)
+        dense = dense[dense["corr"].abs() >= 0.3]
+        assert len(pairs) == len(dense)
+        np.testing.assert_allclose(pairs["corr"].to_numpy(), dense["corr"].to_numpy(), atol=1e-10)
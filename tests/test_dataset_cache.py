@@ -0,0 +1,74 @@
+import io
+import pandas as pd
+import agents.dataset_cache as dataset_cache
+from agents.ingestion import load_data
+
+
+def _use_tmp_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(dataset_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(dataset_cache, "STATS_PATH", tmp_path / "stats.json")
+
+
+def test_repeat_load_hits_cache(monkeypatch, tmp_path):
+    _use_tmp_cache(monkeypatch, tmp_path)
+    data = b"a,b\n1,x\n2,y\n3,x\n"
+
+    first = load_data(io.BytesIO(data), use_cache=True)
+    second = load_data(io.BytesIO(data), use_cache=True)
+
+    pd.testing.assert_frame_equal(first, second)
+    stats = dataset_cache.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["entries"] == 1
+
+
+def test_eviction_keeps_cache_under_budget(monkeypatch, tmp_path):
+    _use_tmp_cache(monkeypatch, tmp_path)
+    df = pd.DataFrame({"x": range(1000)})
+
+    dataset_cache.cache_put("old", df)
+    size = dataset_cache.cache_stats()["bytes"]
+    dataset_cache.cache_put("new", df, max_bytes=size)
+
+    assert dataset_cache.cache_get("old") is None
+    assert dataset_cache.cache_get("new") is not None
+
+
+def test_known_content_key_skips_rehashing(monkeypatch, tmp_path):
+    import agents.ingestion as ingestion
+
+    _use_tmp_cache(monkeypatch, tmp_path)
+    data = b"a,b\n1,x\n2,y\n"
+    key = dataset_cache.content_hash(io.BytesIO(data))
+
+    def no_hash(file):
+        raise AssertionError("upload hashed again")
+
+    monkeypatch.setattr(ingestion, "content_hash", no_hash)
+    load_data(io.BytesIO(data), use_cache=True, content_key=key)
+    load_data(io.BytesIO(data), use_cache=True, content_key=key)
+    assert dataset_cache.cache_stats()["hits"] == 1
+
+
+def test_cache_holds_the_compacted_frame(monkeypatch, tmp_path):
+    import agents.ingestion as ingestion
+    from agents.memory import DatasetFingerprint
+
+    _use_tmp_cache(monkeypatch, tmp_path)
+    data = b"a,b,c\n" + b"".join(b"%d,%s,%d.5\n" % (i, b"xy"[i % 2:i % 2 + 1], i) for i in range(200))
+
+    cold_report, cold_fp = {}, DatasetFingerprint()
+    cold = load_data(io.BytesIO(data), use_cache=True, fingerprint=cold_fp, memory_report=cold_report)
+
+    def no_compaction(df):
+        raise AssertionError("warm load compacted again")
+
+    monkeypatch.setattr(ingestion, "compact_dtypes", no_compaction)
+    warm_report, warm_fp = {}, DatasetFingerprint()
+    warm = load_data(io.BytesIO(data), use_cache=True, fingerprint=warm_fp, memory_report=warm_report)
+
+    assert str(cold["a"].dtype) == "int16"
+    pd.testing.assert_frame_equal(warm, cold)
+    assert warm_report == cold_report and cold_report["changes"]
+    assert warm_fp.hexdigest() == cold_fp.hexdigest()
+    assert not warm.attrs
@@ -0,0 +1,25 @@
+import pandas as pd
+from agents.datetime_detection import detect_datetime_formats, parse_datetime
+from agents.feature_engineering import engineer_features
+from agents.profiling import profile_dataset
+
+
+def test_detects_dates_and_skips_free_text():
+    df = pd.DataFrame({
+        "day": ["2024-01-05", "2024-02-10", None, "2024-03-15"],
+        "note": ["call back", "paid", "n/a", "late"],
+    })
+    formats = detect_datetime_formats(df)
+
+    assert formats == {"day": "%Y-%m-%d"}
+    assert parse_datetime(df["day"], formats["day"]).notna().sum() == 3
+    assert parse_datetime(pd.Series(["2024-01-05", "soon"]), "%Y-%m-%d") is None
+
+
+def test_feature_engineering_reuses_profile_formats():
+    df = pd.DataFrame({"day": ["05/01/2024", "10/02/2024"], "x": [1, 2]})
+    profile = profile_dataset(df)
+    engineered, report = engineer_features(df, profile=profile)
+
+    assert "day" in profile["datetime_cols"]
+    assert {"day_year", "day_month", "day_day"} <= set(engineered.columns)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.cleaning import clean_data
+from agents.dtype_optimizer import compact_dtypes
+from agents.feature_engineering import engineer_features
+from agents.visualization import _group_rare_categories
+
+
+def _frame(n=2_000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "small": rng.integers(0, 100, size=n),
+        "wide": rng.integers(0, 10 ** 10, size=n),
+        "half": rng.integers(0, 50, size=n) / 2,
+        "noisy": rng.normal(size=n),
+        "city": rng.choice(["paris", "rome", "oslo"], size=n).astype(object),
+        "uid": [f"id-{i}" for i in range(n)],
+    })
+
+
+def test_compaction_shrinks_without_changing_values():
+    df = _frame()
+    compact, report = compact_dtypes(df)
+
+    assert compact.dtypes.astype(str).to_dict() == {
+        "small": "int8", "wide": "int64", "half": "float32", "noisy": "float64",
+        "city": "category", "uid": str(df["uid"].dtype),
+    }
+    assert report["after_mb"] < report["before_mb"] and report["saved_pct"] > 0
+    assert set(report["changes"]) == {"small", "half", "city"}
+
+    # Same values; the input frame keeps its dtypes
+    pd.testing.assert_frame_equal(compact.astype(df.dtypes.to_dict()), df)
+    assert df["small"].dtype == "int64"
+
+
+def test_arrow_strings_for_high_cardinality_text():
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"uid": pd.Series([f"id-{i}" for i in range(100)] + [None], dtype=object)})
+
+    compact, _ = compact_dtypes(df, arrow_strings=True)
+
+    assert isinstance(compact["uid"].dtype, pd.StringDtype) and compact["uid"].dtype.storage == "pyarrow"
+    assert compact["uid"].isna().sum() == 1
+
+
+def test_agents_handle_category_columns():
+    df = pd.DataFrame({
+        "city": pd.Series(["a", "b", None, "a"] * 50, dtype="category"),
+        "empty": pd.Series([None] * 200, dtype="category"),
+        "day": pd.Series(["2021-01-01", "2021-02-01"] * 100, dtype="category"),
+        "value": np.arange(200, dtype="int16"),
+    })
+
+    cleaned, stats, _ = clean_data(df)
+    assert cleaned["city"].isna().sum() == 0
+    assert (cleaned["empty"] == "Unknown").all()
+
+    features, report = engineer_features(cleaned)
+    assert "Parsed 'day' as datetime." in report
+    assert features["day_month"].tolist()[:2] == [1, 2]
+
+    grouped = _group_rare_categories(df, "city", top_n=1)
+    assert set(grouped["city"].dropna()) == {"a", "Other"}
+    assert list(grouped["city"].cat.categories) == ["a", "Other"]
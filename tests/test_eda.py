@@ -3,5 +3,6 @@ from agents.eda import generate_eda
 
 def test_eda_structure():
     df = pd.DataFrame({"x": [1, 2, 3]})
-    eda = generate_eda(df)
-    assert "shape" in eda
+    eda_report, eda_tables = generate_eda(df)
+    assert "shape" in eda_report
+    assert "numeric_summary_table" in eda_tables
@@ -0,0 +1,32 @@
+import io
+import pandas as pd
+from agents.ingestion import load_data, load_data_streaming
+
+
+def test_streaming_ingestion_compacts_dtypes():
+    csv = "n,x,cat,day\n" + "".join(
+        f"{i},{i * 0.5},{'ab'[i % 2]},2024-01-{i % 28 + 1:02d}\n" for i in range(50)
+    )
+    df = load_data(io.StringIO(csv), streaming=True)
+    plain = pd.read_csv(io.StringIO(csv))
+
+    assert df.shape == plain.shape
+    assert str(df["n"].dtype) == "int8"
+    assert str(df["x"].dtype) == "float32"
+    assert isinstance(df["cat"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df["day"])
+
+
+def test_streaming_ingestion_widens_across_chunks():
+    csv = "n,cat\n" + "".join(f"{i},c{i % 3}\n" for i in range(20)) + "100000,new\n"
+    rows_seen = []
+    df = load_data_streaming(
+        io.StringIO(csv),
+        chunk_rows=5,
+        sample_rows=10,
+        progress=lambda rows, fraction: rows_seen.append(rows),
+    )
+
+    assert df["n"].max() == 100000
+    assert set(df["cat"].cat.categories) == {"c0", "c1", "c2", "new"}
+    assert rows_seen[-1] == 21
@@ -0,0 +1,71 @@
+import json
+
+import pandas as pd
+import pytest
+
+from agents.pipeline import Pipeline, Stage
+from utils.instrumentation import RunTrace, current_rss_mb, shape_of
+
+
+def test_span_records_time_shapes_and_errors(tmp_path):
+    trace = RunTrace(meta={"file": "a.csv"})
+    df = pd.DataFrame({"a": range(10), "b": range(10)})
+
+    with trace.span("head", inputs={"df": df}) as span:
+        span["output"] = (df.head(3), ["report"])
+
+    with pytest.raises(ValueError):
+        with trace.span("broken"):
+            raise ValueError("bad input")
+
+    head, broken = trace.spans
+    assert head["input_shape"] == [10, 2] and head["output_shape"] == [3, 2]
+    assert head["seconds"] >= 0 and head["cpu_seconds"] >= 0
+    assert broken["error"] == "ValueError: bad input"
+
+    saved = json.loads(trace.save(tmp_path / "trace.json").read_text())
+    assert saved["meta"] == {"file": "a.csv"}
+    assert [s["stage"] for s in saved["spans"]] == ["head", "broken"]
+
+
+def test_pipeline_traces_computed_and_cached_stages():
+    stages = [
+        Stage("double", lambda df: df * 2, inputs=("df",)),
+        Stage("total", lambda double: double.sum().sum(), inputs=("double",)),
+    ]
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    cache = {}
+
+    first = Pipeline(stages, "key", {"df": df}, cache)
+    first.get("total")
+    assert first.trace.to_frame()["stage"].tolist() == ["double", "total"]
+    assert not first.trace.to_frame()["cached"].any()
+
+    second = Pipeline(stages, "key", {"df": df}, cache)
+    second.get("total")
+    second.get("total")
+    assert second.trace.spans == [{**second.trace.spans[0], "stage": "total", "cached": True}]
+
+
+def test_shape_of_finds_frames():
+    df = pd.DataFrame({"a": [1]})
+    assert shape_of((df, {}, [])) == [1, 1]
+    assert shape_of({"x": 1, "df": df}) == [1, 1]
+    assert shape_of([b"png"]) is None
+
+
+def test_rss_delta_tracks_memory_after_an_earlier_peak():
+    if current_rss_mb() is None:
+        pytest.skip("current RSS not available on this platform")
+    trace = RunTrace()
+
+    # Raise the process high-water mark first, then free it
+    block = b"x" * (200 * 1024 ** 2)
+    del block
+
+    with trace.span("allocate") as span:
+        span["output"] = b"y" * (100 * 1024 ** 2)
+
+    (record,) = trace.spans
+    assert record["rss_delta_mb"] > 50
+    assert record["peak_rss_delta_mb"] < record["rss_delta_mb"]
@@ -0,0 +1,19 @@
+import agents.llm_cache as llm_cache
+
+
+def test_response_cache_roundtrip_and_ttl(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+    messages = [{"role": "user", "content": "brief"}]
+    key = llm_cache.response_key("m", messages, 0.2)
+
+    assert key != llm_cache.response_key("m", messages, 0.35)
+    assert llm_cache.get_response(key) is None
+
+    llm_cache.put_response(key, "report")
+    assert llm_cache.get_response(key) == "report"
+    assert llm_cache.get_response(key, ttl=-1) is None
+
+
+def test_bypass_switch(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+    assert llm_cache.cache_disabled()
@@ -0,0 +1,44 @@
+import importlib
+from types import SimpleNamespace
+
+import agents.llm_cache as llm_cache
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, model, messages, temperature, stream=False):
+        self.calls += 1
+        text = "## Summary\nRows look clean." if stream else "draft"
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+        return [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=t))])
+            for t in (text[:10], text[10:])
+        ]
+
+
+def _narrator(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path)
+    narrator = importlib.import_module("agents.llm_narrator")
+    completions = _FakeCompletions()
+    monkeypatch.setattr(narrator, "client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    return narrator, completions
+
+
+def test_narration_job_streams_and_caches(monkeypatch, tmp_path):
+    narrator, completions = _narrator(monkeypatch, tmp_path)
+    context = {"eda_highlights": ["Dataset contains 4 rows and 2 columns."]}
+
+    job = narrator.start_narration(context, {}, [])
+    result = job.wait(timeout=5)
+
+    assert job.done and job.text == "## Summary\nRows look clean."
+    assert result.startswith("##") and "Rows look clean." in result
+    assert completions.calls == 2
+
+    # Same brief again: both completions come from the cache
+    assert narrator.narrate_insights(context, {}, []) == result
+    assert completions.calls == 2
@@ -0,0 +1,53 @@
+import numpy as np
+from agents.memory import MemoryStore
+
+
+def test_store_upserts_and_looks_up(tmp_path):
+    store = MemoryStore(tmp_path / "memory.db")
+    store["fp1"] = {"cleaning": {"duplicates_removed": np.int64(3)}, "shape": (10, 2)}
+    store["fp1"] = {"cleaning": {"duplicates_removed": np.int64(4)}, "shape": (10, 2)}
+
+    assert "fp1" in store and "fp2" not in store
+    assert len(store) == 1
+    assert store["fp1"] == {"cleaning": {"duplicates_removed": 4}, "shape": [10, 2]}
+
+
+def test_unchanged_entry_is_not_rewritten(tmp_path):
+    store = MemoryStore(tmp_path / "memory.db")
+    entry = {"cleaning": {"duplicates_removed": np.int64(3)}, "shape": (10, 2)}
+
+    assert store.put_if_changed("fp1", entry)
+    assert not store.put_if_changed("fp1", dict(entry))
+    assert store.put_if_changed("fp1", {**entry, "shape": (11, 2)})
+    assert store["fp1"]["shape"] == [11, 2]
+
+
+def test_prune_keeps_most_recent(tmp_path):
+    store = MemoryStore(tmp_path / "memory.db")
+    for i in range(5):
+        store[f"fp{i}"] = {"i": i}
+
+    store.get("fp0")
+    store.prune(max_entries=2)
+
+    assert len(store) == 2
+    assert "fp0" in store and "fp4" in store
+
+
+def test_fingerprint_sees_full_content_and_streaming_matches():
+    import io
+    import pandas as pd
+    from agents.ingestion import load_data
+    from agents.memory import DatasetFingerprint, dataset_fingerprint
+
+    csv = "id,score,grp\n" + "".join(f"{i},{i * 0.5},{'ab'[i % 2]}\n" for i in range(40))
+    plain = pd.read_csv(io.StringIO(csv))
+
+    changed = plain.copy()
+    changed.loc[39, "score"] = -1.0
+    assert dataset_fingerprint(plain) != dataset_fingerprint(changed)
+    assert dataset_fingerprint(plain, sample_rows=5).startswith("sampled-40-")
+
+    streamed = DatasetFingerprint()
+    load_data(io.StringIO(csv), streaming=True, fingerprint=streamed)
+    assert streamed.hexdigest() == dataset_fingerprint(plain)
@@ -0,0 +1,99 @@
+import gc
+import io
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.cleaning import clean_data
+from agents.column_stats import compute_column_stats
+from agents.correlation import correlation_service
+from agents.dtype_optimizer import compact_dtypes
+from agents.feature_engineering import engineer_features
+from agents.pipeline import analysis_pipeline
+from agents.profiling import profile_dataset
+from agents.visualization import build_chart_specs
+from benchmarks.synthetic import make_dataset
+
+
+@pytest.fixture(scope="module")
+def frame():
+    df, _ = compact_dtypes(make_dataset(50_000, 30, null_rate=0.02, duplicate_rate=0.01, seed=3))
+    return df
+
+
+def _peak_ratio(func, df) -> float:
+    """
+    Peak Python-side allocation of func() relative to the size of `df`.
+    """
+    correlation_service.clear()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / df.memory_usage(deep=True).sum()
+
+
+def test_profiling_does_not_copy_the_frame(frame):
+    stats = compute_column_stats(frame)
+    assert _peak_ratio(lambda: profile_dataset(frame, stats=stats), frame) < 0.1
+
+
+def test_cleaning_features_and_charts_peak_memory(frame):
+    stats = compute_column_stats(frame)
+    cleaned = clean_data(frame, stats=stats)[0]
+    cleaned_stats = compute_column_stats(cleaned)
+    profile = profile_dataset(cleaned, stats=cleaned_stats)
+
+    # Row hashing for duplicate detection is the bulk of clean_data's peak
+    assert _peak_ratio(lambda: clean_data(frame, stats=stats), frame) < 2.25
+    assert _peak_ratio(lambda: engineer_features(cleaned, profile=profile, stats=cleaned_stats), cleaned) < 1.0
+    assert _peak_ratio(lambda: build_chart_specs(cleaned, profile, cleaned_stats), cleaned) < 1.5
+
+
+def test_agents_leave_their_input_untouched(frame):
+    df = frame.copy()
+    before = df.copy()
+
+    profile = profile_dataset(df)
+    cleaned = clean_data(df, profile=profile)[0]
+    engineer_features(df, profile=profile)
+    build_chart_specs(df, profile)
+
+    pd.testing.assert_frame_equal(df, before)
+    assert cleaned is not df
+
+
+def test_session_keeps_only_compact_results(monkeypatch, tmp_path):
+    # The dataset cache is written under the cwd
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    n = 50_000
+    raw = pd.DataFrame({f"i{j}": rng.integers(0, 100, n) for j in range(12)})
+    raw["g"] = rng.choice(["a", "b", "c"], n)
+    raw["y"] = rng.normal(size=n).round(3)
+    data = raw.to_csv(index=False).encode()
+    raw_bytes = raw.memory_usage(deep=True).sum()
+
+    # Everything the app computes for a session, minus charts and the LLM
+    cache = {}
+    correlation_service.clear()
+    tracemalloc.start()
+    try:
+        pipeline = analysis_pipeline(io.BytesIO(data), source_key="session", cache=cache)
+        for stage in ("df", "fingerprint", "memory_report", "cleaning", "profile", "eda", "features", "insights"):
+            pipeline.get(stage)
+        compact_bytes = pipeline.get("df").memory_usage(deep=True).sum()
+        del pipeline
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # What stays in the session cache is about the compacted frame, not the read
+    assert compact_bytes < raw_bytes / 3
+    assert retained < 2 * compact_bytes
+    assert peak < 4 * raw_bytes
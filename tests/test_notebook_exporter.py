@@ -0,0 +1,101 @@
+import io
+import json
+import zipfile
+
+import nbformat
+import numpy as np
+import pandas as pd
+
+from agents.eda import generate_eda
+from utils.notebook_exporter import export_bundle
+
+
+def _frames(n=200):
+    rng = np.random.default_rng(0)
+    cleaned = pd.DataFrame({
+        "x": rng.normal(size=n),
+        "y": rng.integers(0, 10, size=n),
+        "city": rng.choice(["a", "b", "c"], size=n),
+    })
+    features = cleaned.assign(x_sq=cleaned["x"] ** 2)
+    return cleaned, features
+
+
+def _open(bundle):
+    return zipfile.ZipFile(io.BytesIO(bundle))
+
+
+def test_bundle_ships_data_and_results():
+    cleaned, features = _frames()
+    eda_report, eda_tables = generate_eda(cleaned)
+
+    bundle = export_bundle(
+        cleaned, features, eda_report, eda_tables,
+        cleaning_text=["Removed 1 duplicate rows."],
+        feature_report=["Added x_sq"],
+    )
+
+    with _open(bundle) as zf:
+        names = set(zf.namelist())
+        assert {"eda_to_modeling.ipynb", "data/cleaned.parquet", "data/features.parquet", "data/results.json"} <= names
+        assert not any("sample" in name for name in names)
+
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(zf.read("data/cleaned.parquet"))), cleaned)
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(zf.read("data/features.parquet"))), features)
+
+        for name, table in eda_tables.items():
+            restored = pd.read_parquet(io.BytesIO(zf.read(f"data/eda_tables/{name}.parquet")))
+            assert restored.shape == table.shape
+
+        results = json.loads(zf.read("data/results.json"))
+        assert results["eda_report"]["shape"] == list(eda_report["shape"])
+        assert results["feature_report"] == ["Added x_sq"]
+
+        nb = nbformat.reads(zf.read("eda_to_modeling.ipynb").decode(), as_version=4)
+        source = "\n".join(cell.source for cell in nb.cells)
+        assert "RECOMPUTE = False" in source
+        assert "pd.read_parquet(DATA / f'cleaned{suffix}.parquet')" in source
+
+
+def test_bundle_adds_row_sample_and_recompute_flag():
+    cleaned, features = _frames(500)
+    eda_report, eda_tables = generate_eda(cleaned)
+
+    bundle = export_bundle(cleaned, features, eda_report, eda_tables, sample_rows=100, recompute=True)
+
+    with _open(bundle) as zf:
+        sample = pd.read_parquet(io.BytesIO(zf.read("data/cleaned_sample.parquet")))
+        feature_sample = pd.read_parquet(io.BytesIO(zf.read("data/features_sample.parquet")))
+        source = zf.read("eda_to_modeling.ipynb").decode()
+
+    assert len(sample) == 100
+    assert sample.index.equals(feature_sample.index)
+    assert "RECOMPUTE = True" in source
+    assert "USE_SAMPLE = True" in source
+
+
+def test_bundle_can_ship_only_the_sample():
+    cleaned, features = _frames(500)
+    eda_report, eda_tables = generate_eda(cleaned)
+
+    full = export_bundle(cleaned, features, eda_report, eda_tables, sample_rows=100)
+    small = export_bundle(cleaned, features, eda_report, eda_tables, sample_rows=100, sample_only=True)
+
+    with _open(small) as zf:
+        names = set(zf.namelist())
+        source = zf.read("eda_to_modeling.ipynb").decode()
+    assert {"data/cleaned_sample.parquet", "data/features_sample.parquet"} <= names
+    assert "data/cleaned.parquet" not in names and "data/features.parquet" not in names
+    assert "Only a row sample" in source
+    assert len(small) < len(full)
+
+
+def test_parquet_fallback_handles_non_string_labels_and_mixed_values():
+    from utils.notebook_exporter import _parquet_bytes
+
+    df = pd.DataFrame({0: [1, 2], "mixed": ["a", 3]})
+    restored = pd.read_parquet(io.BytesIO(_parquet_bytes(df)))
+
+    assert restored.columns.tolist() == ["0", "mixed"]
+    assert restored["mixed"].tolist() == ["a", "3"]
+    assert df.columns.tolist() == [0, "mixed"]
@@ -0,0 +1,54 @@
+import io
+import pandas as pd
+from agents.pipeline import analysis_pipeline
+
+
+def _run(cache, target):
+    data = io.StringIO("a,b,c\n1,2.0,x\n2,4.1,y\n3,6.2,x\n4,8.0,y\n")
+    pipeline = analysis_pipeline(data, source_key="k1", cache=cache)
+    pipeline.get("eda")
+    pipeline.get("target_eda", target=target)
+    pipeline.get("feature_importance", target=target)
+    return pipeline.computed
+
+
+def test_target_change_reruns_only_target_stages(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    cache = {}
+
+    first = _run(cache, "a")
+    second = _run(cache, "b")
+    third = _run(cache, "b")
+
+    assert "eda" in first and "features" in first
+    assert sorted(second) == ["feature_importance", "target_eda"]
+    assert third == []
+
+
+def test_new_source_drops_old_results():
+    cache = {("old", "eda", ()): "stale"}
+    analysis_pipeline(None, source_key="new", cache=cache)
+    assert cache == {}
+
+
+def _frames(value):
+    if isinstance(value, pd.DataFrame):
+        yield value
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _frames(item)
+
+
+def test_cache_holds_only_the_compacted_frame(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    cache = {}
+    rows = "\n".join(f"{i},{i % 3},city_{i % 2}" for i in range(200))
+    pipeline = analysis_pipeline(io.StringIO("a,b,c\n" + rows + "\n"), source_key="k1", cache=cache)
+    df = pipeline.get("df")
+    pipeline.get("eda")
+
+    assert pipeline.get("memory_report")["after_mb"] < pipeline.get("memory_report")["before_mb"]
+    assert str(df["a"].dtype) == "int16" and str(df["c"].dtype) == "category"
+    # No cached frame (loaded, cleaned, ...) still has the read_csv dtypes
+    cached = [f for value in cache.values() for f in _frames(value) if "a" in f.columns]
+    assert cached and all(str(f["a"].dtype) != "int64" for f in cached)
@@ -0,0 +1,77 @@
+import pandas as pd
+from matplotlib.figure import Figure
+
+from agents.report import generate_pdf
+from agents.visualization import figure_to_png
+
+
+def _figure():
+    fig = Figure(figsize=(4, 3))
+    fig.subplots().plot([0, 1, 2], [1, 3, 2])
+    return fig
+
+
+def test_pdf_built_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tables = {"missing_table": pd.DataFrame({"missing_count": [1], "missing_%": [10.0]}, index=["a"])}
+
+    pdf = generate_pdf(
+        insights=["Removed 1 duplicate rows."],
+        llm_text="## Summary\n- fine",
+        charts=[figure_to_png(_figure()), _figure()],
+        eda_tables=tables,
+    )
+
+    assert isinstance(pdf, bytes) and pdf.startswith(b"%PDF")
+    assert not any(tmp_path.iterdir())
+
+
+def test_pdf_written_when_path_given(tmp_path):
+    path = tmp_path / "out" / "report.pdf"
+    result = generate_pdf(insights=[], llm_text="", output_path=str(path))
+
+    assert result == str(path)
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_background_export_reports_progress_and_caches():
+    from agents.report import start_pdf_export
+
+    first = start_pdf_export(insights=["a"], llm_text="text", charts=[figure_to_png(_figure())])
+    pdf = first.wait(timeout=60)
+    assert first.progress == 1.0 and first.message == "Done"
+
+    second = start_pdf_export(insights=["a"], llm_text="text", charts=[figure_to_png(_figure())])
+    assert second.wait(timeout=60) == pdf
+    assert second.message == "Done (cached)"
+
+
+def test_reports_with_figures_are_not_cached():
+    from agents.report import pdf_key, start_pdf_export
+
+    assert pdf_key(insights=["a"], llm_text="text", charts=[_figure()]) is None
+
+    first = start_pdf_export(insights=["a"], llm_text="text", charts=[_figure()])
+    first.wait(timeout=60)
+    second = start_pdf_export(insights=["a"], llm_text="text", charts=[_figure()])
+    second.wait(timeout=60)
+    assert second.message == "Done"
+
+
+def test_chart_images_are_reused(monkeypatch):
+    import numpy as np
+
+    from agents import visualization
+    from agents.visualization import build_chart_specs, render_charts
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.normal(size=300), "b": rng.normal(size=300)})
+    specs = build_chart_specs(df)
+    first = render_charts(specs, parallel=False)
+
+    calls = []
+    original = visualization.render_png
+    monkeypatch.setattr(visualization, "render_png", lambda spec, dpi=150: calls.append(spec) or original(spec, dpi))
+
+    assert render_charts(build_chart_specs(df), parallel=False) == first
+    assert calls == []
@@ -0,0 +1,162 @@
+import io
+import json
+import os
+import signal
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from service.jobs import JobQueue, QueueFull
+from service.server import make_server
+
+
+def _csv(seed=0, n=200) -> bytes:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "x": rng.normal(size=n).round(1),
+        "y": rng.integers(0, 5, size=n),
+        "city": rng.choice(["a", "b", "c"], size=n),
+    }).to_csv(index=False).encode()
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(root=tmp_path / "jobs", workers=1, max_pending=1)
+    yield queue
+    queue.shutdown()
+
+
+def test_queue_backpressure_and_artifacts(queue, tmp_path):
+    job = queue.submit(_csv(), filename="../sales.csv", memory_path=str(tmp_path / "memory.db"))
+
+    with pytest.raises(QueueFull):
+        queue.submit(_csv(1))
+
+    assert job.wait(timeout=120)
+    assert job.status == "done", job.error
+    assert job.filename == "sales.csv"
+    assert "eda_report.json" in job.artifacts()
+    assert queue.artifact(job.id, "eda_tables/missing_table.csv") is not None
+    assert queue.artifact(job.id, "../sales.csv") is None
+
+    # The slot is free again
+    assert queue.submit(_csv(1), memory_path=str(tmp_path / "memory.db")).wait(timeout=120)
+
+
+def test_killed_or_stuck_worker_fails_only_its_job(tmp_path):
+    queue = JobQueue(root=tmp_path / "jobs", workers=1, max_pending=4, timeout=0.5)
+    try:
+        # Spawning and importing the agents alone takes longer than the timeout
+        stuck = queue.submit(_csv(), memory_path=str(tmp_path / "memory.db"))
+        assert stuck.wait(timeout=60)
+        assert stuck.status == "failed" and "timed out" in stuck.error
+
+        queue.timeout = 120
+        killed = queue.submit(_csv(), memory_path=str(tmp_path / "memory.db"))
+        while killed.status == "queued":
+            time.sleep(0.01)
+        os.kill(killed._process.pid, signal.SIGKILL)
+        assert killed.wait(timeout=60)
+        assert killed.status == "failed" and str(-signal.SIGKILL) in killed.error
+
+        # The queue keeps serving after both failures
+        job = queue.submit(_csv(1), memory_path=str(tmp_path / "memory.db"))
+        assert job.wait(timeout=120)
+        assert job.status == "done", job.error
+    finally:
+        queue.shutdown()
+
+
+def test_http_submit_status_and_download(queue, tmp_path, monkeypatch):
+    # Workers start on first submit and write the agent memory under the cwd
+    monkeypatch.chdir(tmp_path)
+    server = make_server(queue, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        request = urllib.request.Request(f"{base}/jobs?filename=a.csv&notebook=1", data=_csv(), method="POST")
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 202
+            job_id = json.load(response)["job_id"]
+
+        deadline = time.time() + 120
+        while True:
+            with urllib.request.urlopen(f"{base}/jobs/{job_id}") as response:
+                status = json.load(response)
+            if status["status"] in ("done", "failed") or time.time() > deadline:
+                break
+            time.sleep(0.1)
+
+        assert status["status"] == "done", status
+        assert "eda_to_modeling.zip" in status["artifacts"]
+
+        with urllib.request.urlopen(f"{base}/jobs/{job_id}/artifacts/eda_report.json") as response:
+            assert "shape" in json.load(response)
+
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{base}/jobs/unknown")
+        assert err.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _SlowBody(io.RawIOBase):
+    """
+    Request body that stalls until `release` is set.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+    def read(self, n=-1):
+        self.reading.set()
+        self.release.wait(10)
+        return self.data.read(n)
+
+
+def test_upload_streams_without_blocking_the_queue(queue, tmp_path):
+    body = _SlowBody(_csv())
+    thread = threading.Thread(
+        target=queue.submit, args=(body,), kwargs={"length": len(_csv()), "memory_path": str(tmp_path / "m.db")}
+    )
+    thread.start()
+    assert body.reading.wait(10)
+
+    # The slot is held while the upload is written, but the lock is not
+    assert queue.get("unknown") is None
+    with pytest.raises(QueueFull):
+        queue.submit(_csv(1))
+
+    body.release.set()
+    thread.join(10)
+    (job,) = queue.jobs.values()
+    assert job.input_path.read_bytes() == _csv()
+    assert job.wait(timeout=120)
+
+    with pytest.raises(ValueError):
+        queue.submit(io.BytesIO(b"a,b\n"), length=100)
+    assert len(list((tmp_path / "jobs").iterdir())) == 1
+
+
+def test_http_rejects_oversized_upload(queue):
+    server = make_server(queue, port=0, max_upload=10)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/jobs"
+        request = urllib.request.Request(url, data=_csv(), method="POST")
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(request)
+        assert err.value.code == 413
+        assert queue.pending() == 0
+    finally:
+        server.shutdown()
+        server.server_close()
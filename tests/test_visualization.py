@@ -0,0 +1,105 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from agents.visualization import auto_visualize, build_chart_specs, render_charts
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def _frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "a": rng.normal(size=n),
+        "b": rng.normal(size=n) * 3,
+        "cat": rng.choice(["x", "y", "z"], n),
+    })
+    df["c"] = df["a"] * 2 + rng.normal(size=n)
+    return df
+
+
+def test_specs_are_independent_and_picklable():
+    specs = build_chart_specs(_frame())
+    kinds = [spec["kind"] for spec in specs]
+
+    assert kinds.count("hist") == 2
+    assert {"heatmap", "scatter", "box"} <= set(kinds)
+    for spec in specs:
+        assert pickle.loads(pickle.dumps(spec))["title"] == spec["title"]
+
+
+def test_png_output_matches_figure_count():
+    df = _frame()
+    figures = auto_visualize(df)
+    pngs = render_charts(build_chart_specs(df), parallel=False)
+
+    assert all(isinstance(fig, Figure) for fig in figures)
+    assert len(pngs) == len(figures)
+    assert all(png.startswith(PNG_MAGIC) for png in pngs)
+
+
+def test_large_frames_use_aggregated_specs(monkeypatch):
+    monkeypatch.setattr("agents.visualization.PLOT_AGGREGATE_MIN_ROWS", 100)
+    df = _frame(2000)
+    specs = build_chart_specs(df)
+    kinds = [spec["kind"] for spec in specs]
+
+    assert kinds.count("hist_binned") == 2
+    assert "density" in kinds and "box_stats" in kinds
+    assert "scatter" not in kinds and "box" not in kinds
+
+    for spec in specs:
+        if spec["kind"] == "hist_binned":
+            assert spec["counts"].sum() == df[spec["xlabel"]].notna().sum()
+        if spec["kind"] == "density":
+            assert spec["counts"].sum() == len(df)
+
+    pngs = render_charts(specs, parallel=False)
+    assert all(png.startswith(PNG_MAGIC) for png in pngs)
+
+
+def test_box_stats_match_quartiles():
+    from agents.visualization import _box_stats
+
+    df = _frame(1000)
+    stats = {s["label"]: s for s in _box_stats(df["cat"], df["a"])}
+    expected = df.groupby("cat")["a"].quantile([0.25, 0.5, 0.75]).unstack()
+
+    assert list(stats) == list(pd.unique(df["cat"]))
+    for label, row in expected.iterrows():
+        assert np.allclose([stats[label]["q1"], stats[label]["med"], stats[label]["q3"]], row.to_numpy())
+
+
+def test_pool_rendering_matches_serial():
+    from concurrent.futures.process import BrokenProcessPool
+
+    from agents import visualization
+
+    specs = build_chart_specs(_frame())
+    assert len(specs) > 1
+
+    visualization.clear_image_cache()
+    serial = render_charts(specs, parallel=False)
+    visualization.clear_image_cache()
+    pooled = render_charts(specs, parallel=True)
+    assert visualization._POOL is not None
+    assert pooled == serial
+
+    # A broken pool is dropped and the charts are rendered here instead
+    class Broken:
+        shutdowns = []
+
+        def map(self, *args):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shutdowns.append((wait, cancel_futures))
+
+    visualization._POOL.shutdown()
+    visualization._POOL = Broken()
+    visualization.clear_image_cache()
+    assert render_charts(specs, parallel=True) == serial
+    assert visualization._POOL is None
+    assert Broken.shutdowns == [(False, True)]
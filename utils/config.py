@@ -6,3 +6,85 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 AUTOML_MAX_MODELS = 10
 RANDOM_SEED = 42
+
+# Streaming ingestion
+INGEST_CHUNK_ROWS = 100_000
+INGEST_SAMPLE_ROWS = 10_000
+INGEST_CATEGORY_MAX_UNIQUE = 1_000
+INGEST_CATEGORY_MAX_RATIO = 0.5
+STREAMING_MIN_BYTES = 50 * 1024 * 1024
+# Dtype compaction after a plain read (Arrow strings need pyarrow)
+DTYPE_ARROW_STRINGS = False
+
+# Content-addressed dataset cache (Arrow IPC, LRU by size)
+DATASET_CACHE_DIR = "memory/dataset_cache"
+DATASET_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Datetime detection
+DATETIME_SAMPLE_SIZE = 200
+
+# LLM response cache (set LLM_CACHE_DISABLED=1 to bypass)
+LLM_CACHE_DIR = "memory/llm_cache"
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600
+LLM_CACHE_MAX_BYTES = 50 * 1024 ** 2
+
+# Analysis history retention
+MEMORY_MAX_ENTRIES = 500
+MEMORY_MAX_AGE_DAYS = 180
+
+# Dataset fingerprint
+FINGERPRINT_CHUNK_ROWS = 100_000
+
+# Approximate distinct counts (HyperLogLog) for large frames
+CARDINALITY_SKETCH_MIN_ROWS = 1_000_000
+CARDINALITY_RELATIVE_ERROR = 0.01
+CARDINALITY_FALLBACK_SIGMAS = 3
+CARDINALITY_TOP_VALUES_MAX_UNIQUE = 10_000
+
+# Out-of-core EDA (chunked summaries)
+OUT_OF_CORE_MIN_BYTES = 1024 ** 3
+TDIGEST_COMPRESSION = 200
+
+# Correlation (blocked Pearson; sparse pair list above CORR_DENSE_MAX_COLS)
+CORR_BLOCK_COLS = 256
+CORR_DENSE_MAX_COLS = 500
+CORR_SPARSE_THRESHOLD = 0.5
+CORR_SPARSE_MAX_PAIRS = 10_000
+CORR_CACHE_MAX_BYTES = 256 * 1024 ** 2
+
+# Chart rendering (PNG, worker processes)
+CHART_DPI = 150
+CHART_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
+# Large-data plotting (pre-aggregated specs from this many rows on)
+PLOT_AGGREGATE_MIN_ROWS = 100_000
+PLOT_MAX_BINS = 100
+PLOT_KDE_SAMPLE = 10_000
+PLOT_KDE_GRID = 200
+PLOT_DENSITY_BINS = 120
+CHART_CACHE_MAX_BYTES = 64 * 1024 ** 2
+
+# PDF export (in-process cache of finished reports)
+PDF_CACHE_MAX_ENTRIES = 16
+
+# Notebook handoff bundle (row sample added from this many rows on)
+NOTEBOOK_SAMPLE_MIN_ROWS = 1_000_000
+NOTEBOOK_SAMPLE_ROWS = 100_000
+
+# Headless batch runner (one worker process per dataset)
+BATCH_WORKERS = min(4, os.cpu_count() or 1)
+BATCH_TIMEOUT_SECONDS = 30 * 60
+
+# Analysis service (in-process job queue, worker processes)
+SERVICE_JOBS_DIR = "memory/jobs"
+SERVICE_WORKERS = min(2, os.cpu_count() or 1)
+SERVICE_MAX_PENDING = 16
+SERVICE_JOB_HISTORY = 200
+SERVICE_JOB_TIMEOUT_SECONDS = 30 * 60
+SERVICE_MAX_UPLOAD_BYTES = 2 * 1024 ** 3
+SERVICE_UPLOAD_CHUNK_BYTES = 1024 ** 2
+SERVICE_PORT = 8080
+
+# Run traces (per-stage timing / memory, one JSON file per run)
+TRACE_DIR = "memory/traces"
+TRACE_MAX_FILES = 200
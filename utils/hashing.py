@@ -0,0 +1,52 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+def _feed(hasher, obj):
+    """
+    Feed a deterministic, type-tagged encoding of `obj` into `hasher`.
+    Frames and Series are hashed by content (vectorized), not by repr.
+    """
+    if obj is None:
+        hasher.update(b"N")
+    elif isinstance(obj, (bytes, bytearray)):
+        hasher.update(b"B%d:" % len(obj))
+        hasher.update(obj)
+    elif isinstance(obj, str):
+        data = obj.encode()
+        hasher.update(b"S%d:" % len(data))
+        hasher.update(data)
+    elif isinstance(obj, (bool, int, float, np.integer, np.floating, np.bool_)):
+        hasher.update(b"V" + repr(obj).encode() + b";")
+    elif isinstance(obj, np.ndarray):
+        hasher.update(f"A{obj.dtype.str}{obj.shape};".encode())
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, pd.Series):
+        hasher.update(f"P{obj.name!r}{obj.dtype};".encode())
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.DataFrame):
+        hasher.update(f"F{list(obj.columns)!r}{list(obj.dtypes.astype(str))!r};".encode())
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, dict):
+        hasher.update(b"D%d:" % len(obj))
+        for key in sorted(obj, key=repr):
+            _feed(hasher, key)
+            _feed(hasher, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b"L%d:" % len(obj))
+        for item in obj:
+            _feed(hasher, item)
+    else:
+        hasher.update(b"R" + repr(obj).encode() + b";")
+
+
+def content_digest(*objs) -> str:
+    """
+    Stable hex digest of nested specs/frames/bytes, for in-process caches.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        _feed(hasher, obj)
+    return hasher.hexdigest()
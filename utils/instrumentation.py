@@ -0,0 +1,183 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from utils.config import TRACE_DIR, TRACE_MAX_FILES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def peak_rss_mb():
+    """
+    Process peak resident set size so far (MB), or None where unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 ** 2 if sys.platform == "darwin" else 1024)
+
+
+def current_rss_mb():
+    """
+    Process resident set size right now (MB), or None where unavailable.
+    """
+    try:
+        # Linux: resident pages are the second field
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    return None
+
+
+def shape_of(obj):
+    """
+    [rows, cols] of the frame an agent takes or returns: a DataFrame, the
+    first frame in a result tuple (df, report, ...) or in a kwargs dict.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return [int(obj.shape[0]), int(obj.shape[1])]
+    if isinstance(obj, tuple) and obj:
+        return shape_of(obj[0])
+    if isinstance(obj, dict):
+        for value in obj.values():
+            shape = shape_of(value)
+            if shape is not None:
+                return shape
+    return None
+
+
+class RunTrace:
+    """
+    Timing and memory record of one run, one span per agent call.
+
+    Each span holds wall seconds, CPU seconds of the calling thread, the
+    change in current RSS over the call (memory the stage left allocated,
+    e.g. its result), growth of the peak RSS (0 once an earlier call went
+    higher, so mostly informative in short-lived processes) and
+    input/output [rows, cols]. Memory figures are process-wide: other
+    threads or sessions running at the same time are included. Only clocks,
+    getrusage and /proc are read, so it is cheap enough to leave on.
+    """
+
+    def __init__(self, meta: dict | None = None):
+        self.run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        self.meta = dict(meta or {})
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, inputs=None):
+        """
+        Time the enclosed block. Set record["output"] to the result to get
+        its shape into the trace.
+        """
+        record = {"output": None}
+        rss_before, peak_before = current_rss_mb(), peak_rss_mb()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        error = None
+        try:
+            yield record
+        except BaseException as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            rss_after, peak_after = current_rss_mb(), peak_rss_mb()
+            self._add({
+                "stage": name,
+                "cached": False,
+                "seconds": round(time.perf_counter() - wall, 4),
+                "cpu_seconds": round(time.thread_time() - cpu, 4),
+                "rss_delta_mb": None if rss_before is None else round(rss_after - rss_before, 1),
+                "rss_mb": None if rss_after is None else round(rss_after, 1),
+                "peak_rss_delta_mb": None if peak_before is None else round(peak_after - peak_before, 1),
+                "peak_rss_mb": None if peak_after is None else round(peak_after, 1),
+                "input_shape": shape_of(inputs),
+                "output_shape": shape_of(record["output"]),
+                "error": error,
+            })
+
+    def cached(self, name: str, output=None):
+        """
+        Record a result served from cache (once per stage and run).
+        """
+        with self._lock:
+            if any(s["stage"] == name for s in self.spans):
+                return
+        self._add({
+            "stage": name,
+            "cached": True,
+            "seconds": 0.0,
+            "cpu_seconds": 0.0,
+            "rss_delta_mb": 0.0,
+            "rss_mb": None,
+            "peak_rss_delta_mb": 0.0,
+            "peak_rss_mb": None,
+            "input_shape": None,
+            "output_shape": shape_of(output),
+            "error": None,
+        })
+
+    def _add(self, record: dict):
+        with self._lock:
+            self.spans.append(record)
+
+    def to_frame(self) -> pd.DataFrame:
+        columns = [
+            "stage", "cached", "seconds", "cpu_seconds", "rss_delta_mb", "peak_rss_delta_mb",
+            "input_shape", "output_shape",
+        ]
+        with self._lock:
+            return pd.DataFrame(self.spans, columns=columns + ["rss_mb", "peak_rss_mb", "error"])[columns]
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "run_id": self.run_id,
+            "meta": self.meta,
+            "total_seconds": round(sum(s["seconds"] for s in spans), 4),
+            "rss_mb": current_rss_mb(),
+            "peak_rss_mb": peak_rss_mb(),
+            "spans": spans,
+        }
+
+    def save(self, path=None) -> Path:
+        """
+        Write the trace as JSON: to `path`, or as <run_id>.json under
+        TRACE_DIR, keeping the newest TRACE_MAX_FILES traces there.
+        """
+        if path is None:
+            path = Path(TRACE_DIR) / f"{self.run_id}.json"
+            _prune(Path(TRACE_DIR), TRACE_MAX_FILES - 1)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, default=str))
+        return path
+
+
+def _prune(directory: Path, keep: int):
+    if not directory.exists():
+        return
+    # run_id file names sort chronologically
+    traces = sorted(directory.glob("*.json"))
+    for old in traces[:max(0, len(traces) - keep)]:
+        old.unlink(missing_ok=True)
@@ -1,6 +1,62 @@
+import io
+import json
+import os
+import zipfile
+
 import nbformat
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 from nbformat.v4 import new_notebook, new_markdown_cell, new_code_cell
-import os
+
+from utils.config import RANDOM_SEED
+
+
+def _add_visual_cells(nb):
+    nb.cells.append(new_markdown_cell("### 4.1 Correlation Heatmap"))
+    nb.cells.append(new_code_cell(
+        "numeric_cols = df_cleaned.select_dtypes(include='number').columns.tolist()\n"
+        "if len(numeric_cols) >= 2:\n"
+        "    plt.figure(figsize=(7,5))\n"
+        "    corr = df_cleaned[numeric_cols].corr()\n"
+        "    sns.heatmap(corr, cmap='coolwarm')\n"
+        "    plt.title('Correlation Heatmap')\n"
+        "    plt.show()"
+    ))
+
+    nb.cells.append(new_markdown_cell("### 4.2 Numeric Distributions"))
+    nb.cells.append(new_code_cell(
+        "for col in numeric_cols[:2]:\n"
+        "    plt.figure(figsize=(6,4))\n"
+        "    sns.histplot(df_cleaned[col], kde=True)\n"
+        "    plt.title(f'Distribution: {col}')\n"
+        "    plt.show()"
+    ))
+
+    nb.cells.append(new_markdown_cell("### 4.3 Numeric Relationship"))
+    nb.cells.append(new_code_cell(
+        "if len(numeric_cols) >= 2:\n"
+        "    plt.figure(figsize=(6,4))\n"
+        "    sns.scatterplot(x=df_cleaned[numeric_cols[0]], y=df_cleaned[numeric_cols[1]])\n"
+        "    plt.title(f'{numeric_cols[0]} vs {numeric_cols[1]}')\n"
+        "    plt.show()"
+    ))
+
+
+def _add_target_cells(nb, target):
+    if target:
+        nb.cells.append(new_markdown_cell("## 6. Target-aware EDA"))
+        nb.cells.append(new_code_cell(
+            f"target_column = '{target}'\n"
+            "target_insights = target_eda(df_cleaned, target_column)\n"
+            "target_insights"
+        ))
+
+        nb.cells.append(new_markdown_cell("## 7. Feature Importance"))
+        nb.cells.append(new_code_cell(
+            "importance = feature_importance(df_features, target_column)\n"
+            "importance[:10]"
+        ))
 
 
 def export_notebook(target=None):
@@ -65,62 +121,187 @@ def export_notebook(target=None):
         "eda_report"
     ))
 
-    nb.cells.append(new_markdown_cell("### 4.1 Correlation Heatmap"))
+    _add_visual_cells(nb)
+
+    # ---------------- FEATURE ENGINEERING ----------------
+    nb.cells.append(new_markdown_cell("## 5. Feature Engineering"))
     nb.cells.append(new_code_cell(
-        "numeric_cols = df_cleaned.select_dtypes(include='number').columns.tolist()\n"
-        "if len(numeric_cols) >= 2:\n"
-        "    plt.figure(figsize=(7,5))\n"
-        "    corr = df_cleaned[numeric_cols].corr()\n"
-        "    sns.heatmap(corr, cmap='coolwarm')\n"
-        "    plt.title('Correlation Heatmap')\n"
-        "    plt.show()"
+        "df_features, feature_report = engineer_features(df_cleaned)\n"
+        "feature_report"
+    ))
+    nb.cells.append(new_code_cell("df_features.head()"))
+
+    # ---------------- TARGET LOGIC ----------------
+    _add_target_cells(nb, target)
+
+    # Save notebook
+    os.makedirs("notebooks", exist_ok=True)
+    path = "notebooks/eda_to_modeling.ipynb"
+    with open(path, "w", encoding="utf-8") as f:
+        nbformat.write(nb, f)
+
+    return path
+
+
+# ----------------------------- Handoff bundle -----------------------------
+
+def _json_default(obj):
+    # numpy scalars / timestamps inside the EDA report
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+def _parquet_bytes(df: pd.DataFrame) -> bytes:
+    if not all(isinstance(c, str) for c in df.columns):
+        # Parquet wants string column names (older pandas refuse the rest)
+        df = df.copy(deep=False)
+        df.columns = df.columns.astype(str)
+
+    buf = io.BytesIO()
+    try:
+        df.to_parquet(buf)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Mixed-type object columns have no Arrow type: store them as text
+        mixed = [i for i, dtype in enumerate(df.dtypes) if dtype == object]
+        df = df.copy(deep=False)
+        for i in mixed:
+            df.isetitem(i, df.iloc[:, i].astype(str))
+        buf = io.BytesIO()
+        df.to_parquet(buf)
+    return buf.getvalue()
+
+
+def _handoff_notebook(target=None, recompute=False, has_sample=False, sample_only=False):
+    nb = new_notebook(cells=[])
+
+    nb.cells.append(new_markdown_cell(
+        "# EDA → Modeling Handoff\n"
+        "This notebook was auto-generated by **AI Data Agent**.\n\n"
+        "The cleaned and engineered frames ship next to it as Parquet under `data/`, "
+        "together with the EDA results, so nothing is recomputed on open. "
+        "Set `RECOMPUTE = True` to rebuild everything from the raw CSV instead."
+        + ("\n\nOnly a row sample of both frames is included, to keep the download small; "
+           "the EDA results were computed on the full data." if sample_only else "")
     ))
 
-    nb.cells.append(new_markdown_cell("### 4.2 Numeric Distributions"))
     nb.cells.append(new_code_cell(
-        "for col in numeric_cols[:2]:\n"
-        "    plt.figure(figsize=(6,4))\n"
-        "    sns.histplot(df_cleaned[col], kde=True)\n"
-        "    plt.title(f'Distribution: {col}')\n"
-        "    plt.show()"
+        "import json\n"
+        "from pathlib import Path\n\n"
+        "import pandas as pd\n"
+        "import numpy as np\n"
+        "import matplotlib.pyplot as plt\n"
+        "import seaborn as sns\n\n"
+        "DATA = Path('data')\n"
+        f"RECOMPUTE = {bool(recompute)}\n"
+        f"USE_SAMPLE = {bool(has_sample)}  # smaller row sample for a quick look"
     ))
 
-    nb.cells.append(new_markdown_cell("### 4.3 Numeric Relationship"))
+    # ---------------- LOAD SNAPSHOT ----------------
+    nb.cells.append(new_markdown_cell("## 1. Load Snapshot"))
     nb.cells.append(new_code_cell(
-        "if len(numeric_cols) >= 2:\n"
-        "    plt.figure(figsize=(6,4))\n"
-        "    sns.scatterplot(x=df_cleaned[numeric_cols[0]], y=df_cleaned[numeric_cols[1]])\n"
-        "    plt.title(f'{numeric_cols[0]} vs {numeric_cols[1]}')\n"
-        "    plt.show()"
+        "has_full = (DATA / 'cleaned.parquet').exists()\n"
+        "suffix = '_sample' if (USE_SAMPLE or not has_full) and (DATA / 'cleaned_sample.parquet').exists() else ''\n"
+        "df_cleaned = pd.read_parquet(DATA / f'cleaned{suffix}.parquet')\n"
+        "df_features = pd.read_parquet(DATA / f'features{suffix}.parquet')\n\n"
+        "results = json.loads((DATA / 'results.json').read_text())\n"
+        "eda_report = results['eda_report']\n"
+        "cleaning_text = results['cleaning_text']\n"
+        "feature_report = results['feature_report']\n"
+        "eda_tables = {p.stem: pd.read_parquet(p) for p in sorted((DATA / 'eda_tables').glob('*.parquet'))}\n"
+        "df_cleaned.shape, df_features.shape"
     ))
 
-    # ---------------- FEATURE ENGINEERING ----------------
-    nb.cells.append(new_markdown_cell("## 5. Feature Engineering"))
+    nb.cells.append(new_markdown_cell("### Optional: recompute from the raw data"))
     nb.cells.append(new_code_cell(
-        "df_features, feature_report = engineer_features(df_cleaned)\n"
-        "feature_report"
+        "if RECOMPUTE:\n"
+        "    from agents.cleaning import clean_data\n"
+        "    from agents.eda import generate_eda\n"
+        "    from agents.feature_engineering import engineer_features\n\n"
+        "    df_raw = pd.read_csv('your_dataset.csv')\n"
+        "    df_cleaned, cleaning_stats, cleaning_text = clean_data(df_raw)\n"
+        "    eda_report, eda_tables = generate_eda(df_cleaned)\n"
+        "    df_features, feature_report = engineer_features(df_cleaned)"
     ))
+
+    # ---------------- RESULTS ----------------
+    nb.cells.append(new_markdown_cell("## 2. Cleaning Summary"))
+    nb.cells.append(new_code_cell("cleaning_text"))
+    nb.cells.append(new_code_cell("df_cleaned.head()"))
+
+    nb.cells.append(new_markdown_cell("## 3. Exploratory Data Analysis (EDA)"))
+    nb.cells.append(new_code_cell("eda_report['shape'], list(eda_tables)"))
+    nb.cells.append(new_code_cell("eda_tables.get('numeric_summary_table')"))
+    nb.cells.append(new_code_cell("eda_tables.get('top_correlations_table')"))
+
+    nb.cells.append(new_markdown_cell("## 4. Visual EDA"))
+    _add_visual_cells(nb)
+
+    nb.cells.append(new_markdown_cell("## 5. Feature Engineering"))
+    nb.cells.append(new_code_cell("feature_report"))
     nb.cells.append(new_code_cell("df_features.head()"))
 
-    # ---------------- TARGET LOGIC ----------------
     if target:
-        nb.cells.append(new_markdown_cell("## 6. Target-aware EDA"))
         nb.cells.append(new_code_cell(
-            f"target_column = '{target}'\n"
-            "target_insights = target_eda(df_cleaned, target_column)\n"
-            "target_insights"
+            "from agents.eda import target_eda\n"
+            "from agents.feature_importance import feature_importance"
         ))
+    _add_target_cells(nb, target)
 
-        nb.cells.append(new_markdown_cell("## 7. Feature Importance"))
-        nb.cells.append(new_code_cell(
-            "importance = feature_importance(df_features, target_column)\n"
-            "importance[:10]"
-        ))
+    return nb
 
-    # Save notebook
-    os.makedirs("notebooks", exist_ok=True)
-    path = "notebooks/eda_to_modeling.ipynb"
-    with open(path, "w", encoding="utf-8") as f:
-        nbformat.write(nb, f)
 
-    return path
+def export_bundle(
+    df_cleaned,
+    df_features,
+    eda_report,
+    eda_tables,
+    cleaning_text=(),
+    feature_report=(),
+    target=None,
+    sample_rows=None,
+    recompute=False,
+    sample_only=False,
+) -> bytes:
+    """
+    Zip (built in memory) holding the handoff notebook plus data/ with the
+    cleaned and engineered frames as Parquet, the EDA tables as Parquet and
+    the EDA report / text results as JSON. With `sample_rows`, a random row
+    sample of both frames is included too, and with `sample_only` instead
+    of the full frames. Returns the zip bytes.
+    """
+    has_sample = sample_rows is not None and len(df_cleaned) > sample_rows
+    sample_only = sample_only and has_sample
+
+    results = {
+        "eda_report": eda_report,
+        "cleaning_text": list(cleaning_text),
+        "feature_report": list(feature_report),
+    }
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        nb = _handoff_notebook(target, recompute=recompute, has_sample=has_sample, sample_only=sample_only)
+        zf.writestr("eda_to_modeling.ipynb", nbformat.writes(nb))
+
+        # Parquet is already compressed: store, don't deflate again
+        if not sample_only:
+            zf.writestr("data/cleaned.parquet", _parquet_bytes(df_cleaned))
+            zf.writestr("data/features.parquet", _parquet_bytes(df_features))
+        if has_sample:
+            # Same rows in both frames (feature engineering keeps the rows)
+            rng = np.random.default_rng(RANDOM_SEED)
+            rows = np.sort(rng.choice(len(df_cleaned), size=sample_rows, replace=False))
+            zf.writestr("data/cleaned_sample.parquet", _parquet_bytes(df_cleaned.iloc[rows]))
+            zf.writestr("data/features_sample.parquet", _parquet_bytes(df_features.iloc[rows[rows < len(df_features)]]))
+
+        for name, table in eda_tables.items():
+            zf.writestr(f"data/eda_tables/{name}.parquet", _parquet_bytes(table))
+
+        zf.writestr(
+            "data/results.json",
+            json.dumps(results, default=_json_default, indent=1),
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+
+    return buf.getvalue()